@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente
@@ -25,6 +26,10 @@ class Config:
     CACHE_REDIS_URL = REDIS_URL
     CACHE_KEY_PREFIX = 'glpi_dashboard:'
     
+    # Cache do GLPIService: 'redis' (compartilhado entre workers, com fallback em memória) ou 'memory'
+    GLPI_CACHE_BACKEND = os.environ.get('GLPI_CACHE_BACKEND', 'redis').lower()
+    GLPI_CACHE_REDIS_TIMEOUT = float(os.environ.get('GLPI_CACHE_REDIS_TIMEOUT', 1.0))  # Segundos
+    
     # Configurações de Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -32,6 +37,104 @@ class Config:
     # Configurações de Performance
     MAX_RETRIES = int(os.environ.get('MAX_RETRIES', 3))
     REQUEST_TIMEOUT = int(os.environ.get('REQUEST_TIMEOUT', 30))
+    
+    # Pool de conexões HTTP com o GLPI (keep-alive)
+    GLPI_POOL_CONNECTIONS = int(os.environ.get('GLPI_POOL_CONNECTIONS', 4))  # Hosts distintos em cache
+    GLPI_POOL_MAXSIZE = int(os.environ.get('GLPI_POOL_MAXSIZE', 10))  # Conexões por host
+    GLPI_POOL_BLOCK = os.environ.get('GLPI_POOL_BLOCK', 'False').lower() == 'true'
+    GLPI_POOL_IDLE_TIMEOUT = float(os.environ.get('GLPI_POOL_IDLE_TIMEOUT', 60))  # Segundos
+    
+    # Paralelismo máximo das contagens enviadas ao GLPI
+    GLPI_MAX_PARALLEL_REQUESTS = int(os.environ.get('GLPI_MAX_PARALLEL_REQUESTS', 8))
+    
+    # Proteção do GLPI: limite adaptativo (AIMD) de requisições em voo e circuit breaker
+    GLPI_GUARD_MIN_LIMIT = int(os.environ.get('GLPI_GUARD_MIN_LIMIT', 1))
+    GLPI_GUARD_MAX_LIMIT = int(os.environ.get('GLPI_GUARD_MAX_LIMIT', 32))
+    GLPI_GUARD_LATENCY_TARGET = float(os.environ.get('GLPI_GUARD_LATENCY_TARGET', 2.0))  # Segundos
+    GLPI_GUARD_FAILURE_THRESHOLD = float(os.environ.get('GLPI_GUARD_FAILURE_THRESHOLD', 0.5))  # Taxa na janela
+    GLPI_GUARD_WINDOW = int(os.environ.get('GLPI_GUARD_WINDOW', 20))  # Últimas requisições avaliadas
+    GLPI_GUARD_OPEN_SECONDS = float(os.environ.get('GLPI_GUARD_OPEN_SECONDS', 30))  # Até a sonda de recuperação
+    
+    # Fila de prioridade das chamadas ao GLPI (interativas > ranking > segundo plano) e limite global de taxa
+    GLPI_RATE_LIMIT = float(os.environ.get('GLPI_RATE_LIMIT', 0))  # Requisições por segundo (0 = sem limite)
+    GLPI_RATE_BURST = int(os.environ.get('GLPI_RATE_BURST', 0))  # Rajada máxima (0 = igual ao limite)
+    
+    # Sessões GLPI simultâneas (o GLPI serializa requisições de uma mesma sessão)
+    GLPI_SESSION_POOL_SIZE = int(os.environ.get('GLPI_SESSION_POOL_SIZE', GLPI_MAX_PARALLEL_REQUESTS))
+    
+    # Renovação das sessões GLPI em segundo plano, antes do vencimento (com jitter)
+    GLPI_SESSION_REFRESH_ENABLED = os.environ.get('GLPI_SESSION_REFRESH_ENABLED', 'True').lower() == 'true'
+    GLPI_SESSION_REFRESH_LEAD = int(os.environ.get('GLPI_SESSION_REFRESH_LEAD', 300))  # Segundos antes do vencimento
+    GLPI_SESSION_REFRESH_JITTER = int(os.environ.get('GLPI_SESSION_REFRESH_JITTER', 120))  # Antecipação aleatória extra
+    
+    # Broker de sessões compartilhadas entre workers: 'none', 'redis' ou 'file' (lock de arquivo local)
+    GLPI_SESSION_BROKER = os.environ.get('GLPI_SESSION_BROKER', 'none').lower()
+    GLPI_SESSION_BROKER_FILE = os.environ.get(
+        'GLPI_SESSION_BROKER_FILE', os.path.join(tempfile.gettempdir(), 'glpi_session_broker.json')
+    )
+    
+    # Lock entre workers das tarefas de um único worker (sincronização do espelho, pré-aquecimento):
+    # Redis quando GLPI_SESSION_BROKER=redis, senão flock em um arquivo de GLPI_WORKER_LOCK_DIR
+    GLPI_WORKER_LOCK_DIR = os.environ.get('GLPI_WORKER_LOCK_DIR', tempfile.gettempdir())
+    GLPI_WORKER_LOCK_TTL = int(os.environ.get('GLPI_WORKER_LOCK_TTL', 600))  # Segundos (lock no Redis)
+    
+    # Agregação do dashboard: 'auto', 'scan' (varredura única) ou 'count' (consultas de contagem)
+    GLPI_AGGREGATION_MODE = os.environ.get('GLPI_AGGREGATION_MODE', 'auto').lower()
+    GLPI_SCAN_PAGE_SIZE = int(os.environ.get('GLPI_SCAN_PAGE_SIZE', 500))
+    GLPI_SCAN_MAX_TICKETS = int(os.environ.get('GLPI_SCAN_MAX_TICKETS', 3000))  # Limite do modo 'auto'
+    
+    # Buckets diários (dia × status × nível) para compor intervalos de datas
+    GLPI_DAILY_BUCKETS_ENABLED = os.environ.get('GLPI_DAILY_BUCKETS_ENABLED', 'True').lower() == 'true'
+    # Dias já encerrados: limite de segurança; tickets modificados (date_mod) descartam o bucket do seu dia
+    # a cada DASHBOARD_CACHE_TTL, para o dashboard filtrado não divergir do dashboard sem filtro
+    GLPI_DAILY_BUCKET_PAST_TTL = int(os.environ.get('GLPI_DAILY_BUCKET_PAST_TTL', 6 * 3600))
+    GLPI_DAILY_BUCKET_MAX_DAYS = int(os.environ.get('GLPI_DAILY_BUCKET_MAX_DAYS', 366))
+    GLPI_DAILY_BUCKET_MAX_SCAN_TICKETS = int(os.environ.get('GLPI_DAILY_BUCKET_MAX_SCAN_TICKETS', 20000))
+    
+    # Cache do dashboard: fresco até o TTL; entre o TTL e o stale TTL é servido e atualizado em segundo plano
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 180))
+    DASHBOARD_CACHE_STALE_TTL = int(os.environ.get('DASHBOARD_CACHE_STALE_TTL', 1800))
+    DASHBOARD_FILTERED_CACHE_MAX_ENTRIES = int(os.environ.get('DASHBOARD_FILTERED_CACHE_MAX_ENTRIES', 256))
+    DASHBOARD_FILTERED_CACHE_MAX_BYTES = int(os.environ.get('DASHBOARD_FILTERED_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    TECHNICIAN_RANKING_CACHE_TTL = int(os.environ.get('TECHNICIAN_RANKING_CACHE_TTL', 300))
+    TECHNICIAN_LEVEL_INDEX_TTL = int(os.environ.get('TECHNICIAN_LEVEL_INDEX_TTL', 1800))
+    NEW_TICKETS_CACHE_TTL = int(os.environ.get('NEW_TICKETS_CACHE_TTL', 120))
+    
+    # Snapshots versionados dos metadados do GLPI em disco, carregados na inicialização e revalidados em segundo plano
+    GLPI_LOOKUP_SNAPSHOTS_ENABLED = os.environ.get('GLPI_LOOKUP_SNAPSHOTS_ENABLED', 'True').lower() == 'true'
+    GLPI_LOOKUP_DIR = os.environ.get(
+        'GLPI_LOOKUP_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'lookups')
+    )
+    GLPI_LOOKUP_TTL = int(os.environ.get('GLPI_LOOKUP_TTL', 1800))  # Validade e intervalo de revalidação
+    
+    # Espelho local dos tickets em SQLite: sincronização incremental pela data de modificação e
+    # contagens, ranking e tickets novos respondidos por SQL enquanto o atraso não passar de GLPI_MIRROR_MAX_LAG
+    GLPI_MIRROR_ENABLED = os.environ.get('GLPI_MIRROR_ENABLED', 'False').lower() == 'true'
+    GLPI_MIRROR_PATH = os.environ.get(
+        'GLPI_MIRROR_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'ticket_mirror.sqlite3')
+    )
+    GLPI_MIRROR_SYNC_INTERVAL = int(os.environ.get('GLPI_MIRROR_SYNC_INTERVAL', 60))  # Segundos entre sincronizações
+    GLPI_MIRROR_FULL_SYNC_INTERVAL = int(os.environ.get('GLPI_MIRROR_FULL_SYNC_INTERVAL', 86400))  # Reconciliação completa
+    GLPI_MIRROR_MAX_LAG = int(os.environ.get('GLPI_MIRROR_MAX_LAG', 900))  # Atraso máximo para responder pelo espelho
+    # Colunas em memória (NumPy) para agregações vetorizadas e /tickets/breakdown; ignorado sem NumPy instalado
+    GLPI_MIRROR_COLUMNAR_ENABLED = os.environ.get('GLPI_MIRROR_COLUMNAR_ENABLED', 'True').lower() == 'true'
+    
+    # Prazos do dashboard: resposta (parcial se preciso) em até GLPI_REQUEST_DEADLINE segundos (0 desativa);
+    # a computação segue em segundo plano, com as chamadas ao GLPI limitadas por GLPI_COMPUTATION_DEADLINE
+    GLPI_REQUEST_DEADLINE = float(os.environ.get('GLPI_REQUEST_DEADLINE', 2.0))
+    GLPI_COMPUTATION_DEADLINE = float(os.environ.get('GLPI_COMPUTATION_DEADLINE', 60))
+    # Computações distintas do dashboard em segundo plano ao mesmo tempo (mínimo: GLPI_MAX_PARALLEL_REQUESTS)
+    GLPI_DEADLINE_WORKERS = int(os.environ.get('GLPI_DEADLINE_WORKERS', GLPI_MAX_PARALLEL_REQUESTS))
+    
+    # Pré-aquecimento: atualiza dashboard, janelas comuns, ranking, índice de níveis, tickets novos e metadados antes do TTL vencer
+    GLPI_PREWARM_ENABLED = os.environ.get('GLPI_PREWARM_ENABLED', 'True').lower() == 'true'
+    GLPI_PREWARM_LEAD_TIME = int(os.environ.get('GLPI_PREWARM_LEAD_TIME', 30))  # Segundos antes do vencimento
+    GLPI_PREWARM_WINDOWS = os.environ.get('GLPI_PREWARM_WINDOWS', '0,7,30')  # Últimos N dias (0 = hoje)
+    GLPI_PREWARM_MAX_DEFER = int(os.environ.get('GLPI_PREWARM_MAX_DEFER', 60))  # Espera máxima por requisições
+    
+    # Cliente assíncrono (asyncio) usado pelas views async do dashboard
+    GLPI_ASYNC_ENABLED = os.environ.get('GLPI_ASYNC_ENABLED', 'False').lower() == 'true'
+    GLPI_ASYNC_MAX_IN_FLIGHT = int(os.environ.get('GLPI_ASYNC_MAX_IN_FLIGHT', 100))
 
 class DevelopmentConfig(Config):
     """Configuração de desenvolvimento"""
@@ -76,9 +76,7 @@ def debug_technician_ranking():
         
         # Testar filtros
         print("\n🔍 Testando filtros...")
-        filtered_ranking = service.get_technician_ranking_with_filters({
-            'level': 'Senior'
-        })
+        filtered_ranking = service.get_technician_ranking_with_filters(level='Senior')
         
         print(f"👥 Técnicos Senior: {len(filtered_ranking)}")
         
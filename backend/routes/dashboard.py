@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
 from flask import Blueprint, request, jsonify
+from backend.config.settings import active_config
 from backend.services.glpi_service import GLPIService
+from backend.services.async_glpi_service import AsyncGLPIService
+from backend.services.cache_prewarmer import CachePrewarmer
+from backend.services.ticket_mirror import TicketMirror
+from backend.utils.ticket_columns import ColumnarTicketStore
 from backend.utils.response_formatter import ResponseFormatter
+from backend.utils.worker_lock import create_worker_lock
+import asyncio
+import atexit
 import logging
+import time
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 logger = logging.getLogger('dashboard_routes')
@@ -10,8 +19,70 @@ logger = logging.getLogger('dashboard_routes')
 # Instância global do serviço GLPI
 glpi_service = GLPIService()
 
+# Instância global do cliente assíncrono (opcional)
+async_glpi_service = AsyncGLPIService() if active_config.GLPI_ASYNC_ENABLED else None
+
+# Sessões das instâncias globais encerradas ao finalizar o processo (evita sessões órfãs no GLPI)
+for service in (glpi_service, async_glpi_service):
+    if service is not None:
+        atexit.register(service.shutdown_sessions)
+
+# Pré-aquecimento do cache do serviço que atende as requisições (em um único worker, pelo lock entre workers)
+cache_prewarmer = CachePrewarmer(
+    async_glpi_service or glpi_service,
+    lead_time=active_config.GLPI_PREWARM_LEAD_TIME,
+    windows=[int(days) for days in active_config.GLPI_PREWARM_WINDOWS.split(',') if days.strip()],
+    max_defer=active_config.GLPI_PREWARM_MAX_DEFER,
+    worker_lock=create_worker_lock(active_config, 'cache_prewarmer') if active_config.GLPI_PREWARM_ENABLED else None
+)
+if active_config.GLPI_PREWARM_ENABLED:
+    cache_prewarmer.start()
+    if cache_prewarmer.worker_lock is not None:
+        atexit.register(cache_prewarmer.worker_lock.release)
+
+# Espelho local dos tickets (opcional), compartilhado pelos dois serviços
+ticket_mirror = None
+if active_config.GLPI_MIRROR_ENABLED:
+    # Colunas em memória (NumPy) para agregações vetorizadas; sem NumPy o espelho responde por SQL
+    ticket_columns = None
+    if active_config.GLPI_MIRROR_COLUMNAR_ENABLED:
+        if ColumnarTicketStore.is_supported():
+            ticket_columns = ColumnarTicketStore()
+        else:
+            logger.warning("NumPy não instalado: espelho de tickets sem colunas em memória")
+    
+    ticket_mirror = TicketMirror(
+        async_glpi_service or glpi_service,
+        active_config.GLPI_MIRROR_PATH,
+        sync_interval=active_config.GLPI_MIRROR_SYNC_INTERVAL,
+        full_sync_interval=active_config.GLPI_MIRROR_FULL_SYNC_INTERVAL,
+        max_lag=active_config.GLPI_MIRROR_MAX_LAG,
+        columns=ticket_columns,
+        # Apenas o worker com o lock sincroniza com o GLPI; os demais leem o SQLite
+        writer_lock=create_worker_lock(active_config, 'ticket_mirror')
+    )
+    for service in (glpi_service, async_glpi_service):
+        if service is not None:
+            service.attach_ticket_mirror(ticket_mirror)
+    ticket_mirror.start()
+    if ticket_mirror.writer_lock is not None:
+        atexit.register(ticket_mirror.writer_lock.release)
+
+async def _call_service(method_name: str, *args, **kwargs):
+    """Chama a versão awaitable (prefixo 'a') no serviço assíncrono quando habilitado, senão o método síncrono
+    
+    Com o servidor WSGI a view continua ocupando uma thread até a resposta; o serviço
+    assíncrono reduz o tempo dela ao manter as chamadas ao GLPI em voo ao mesmo tempo.
+    """
+    if async_glpi_service is not None:
+        method = getattr(async_glpi_service, f"a{method_name}", None)
+        if method is not None and asyncio.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+    
+    return getattr(glpi_service, method_name)(*args, **kwargs)
+
 @dashboard_bp.route('/metrics', methods=['GET'])
-def get_dashboard_metrics():
+async def get_dashboard_metrics():
     """Endpoint para obter métricas do dashboard"""
     try:
         logger.info("Solicitação de métricas do dashboard recebida")
@@ -20,12 +91,17 @@ def get_dashboard_metrics():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
+        # Seções opcionais da resposta (ex.: include=trends)
+        include = {part.strip() for part in request.args.get('include', '').split(',') if part.strip()}
+        include_trends = 'trends' in include
+        
         if start_date or end_date:
             logger.info(f"Aplicando filtros de data: {start_date} até {end_date}")
-            metrics = glpi_service.get_dashboard_metrics_with_date_filter(start_date, end_date)
+            metrics = await _call_service('get_dashboard_metrics_with_date_filter', start_date, end_date,
+                                          include_trends=include_trends)
         else:
             logger.info("Obtendo métricas sem filtros de data")
-            metrics = glpi_service.get_dashboard_metrics()
+            metrics = await _call_service('get_dashboard_metrics', include_trends=include_trends)
         
         return jsonify(metrics)
         
@@ -37,7 +113,7 @@ def get_dashboard_metrics():
         )), 500
 
 @dashboard_bp.route('/technicians', methods=['GET'])
-def get_technician_ranking():
+async def get_technician_ranking():
     """Endpoint para obter ranking de técnicos"""
     try:
         logger.info("Solicitação de ranking de técnicos recebida")
@@ -50,7 +126,8 @@ def get_technician_ranking():
         
         if start_date or end_date or level:
             logger.info(f"Aplicando filtros: data={start_date}-{end_date}, level={level}")
-            ranking = glpi_service.get_technician_ranking_with_filters(
+            ranking = await _call_service(
+                'get_technician_ranking_with_filters',
                 limit=limit,
                 start_date=start_date,
                 end_date=end_date,
@@ -58,7 +135,7 @@ def get_technician_ranking():
             )
         else:
             logger.info("Obtendo ranking sem filtros")
-            ranking = glpi_service.get_technician_ranking(limit=limit)
+            ranking = await _call_service('get_technician_ranking', limit=limit)
         
         return jsonify(ResponseFormatter.format_technician_response(ranking))
         
@@ -70,7 +147,7 @@ def get_technician_ranking():
         )), 500
 
 @dashboard_bp.route('/tickets/new', methods=['GET'])
-def get_new_tickets():
+async def get_new_tickets():
     """Endpoint para obter tickets novos"""
     try:
         logger.info("Solicitação de tickets novos recebida")
@@ -84,7 +161,8 @@ def get_new_tickets():
         
         if priority or technician or start_date or end_date:
             logger.info(f"Aplicando filtros: priority={priority}, technician={technician}, data={start_date}-{end_date}")
-            tickets = glpi_service.get_new_tickets_with_filters(
+            tickets = await _call_service(
+                'get_new_tickets_with_filters',
                 limit=limit,
                 priority=priority,
                 technician=technician,
@@ -93,7 +171,7 @@ def get_new_tickets():
             )
         else:
             logger.info("Obtendo tickets novos sem filtros")
-            tickets = glpi_service.get_new_tickets(limit=limit)
+            tickets = await _call_service('get_new_tickets', limit=limit)
         
         return jsonify(ResponseFormatter.format_tickets_response(tickets))
         
@@ -104,13 +182,43 @@ def get_new_tickets():
             [str(e)]
         )), 500
 
+@dashboard_bp.route('/tickets/breakdown', methods=['GET'])
+def get_ticket_breakdown():
+    """Endpoint com contagens de tickets agrupadas por status, level, group, priority, technician e/ou day"""
+    try:
+        start_time = time.time()
+        
+        # Dimensões separadas por vírgula (ex.: dimensions=level,status) e filtros opcionais
+        dimensions = [part.strip() for part in request.args.get('dimensions', 'status').split(',') if part.strip()]
+        filters = {
+            key: request.args.get(key)
+            for key in ('start_date', 'end_date', 'status', 'level', 'priority') if request.args.get(key)
+        }
+        limit = request.args.get('limit', type=int)
+        
+        breakdown = glpi_service.get_ticket_breakdown(dimensions, limit=limit, **filters)
+        if breakdown is None:
+            message = "Espelho de tickets com colunas em memória indisponível"
+            return jsonify(ResponseFormatter.format_error_response(message, [message], 503)), 503
+        
+        return jsonify(ResponseFormatter.format_breakdown_response(breakdown, filters, start_time))
+        
+    except ValueError as e:
+        return jsonify(ResponseFormatter.format_error_response(str(e), [str(e)], 400)), 400
+    except Exception as e:
+        logger.error(f"Erro ao obter contagens agrupadas de tickets: {e}")
+        return jsonify(ResponseFormatter.format_error_response(
+            f"Erro interno: {str(e)}",
+            [str(e)]
+        )), 500
+
 @dashboard_bp.route('/system/status', methods=['GET'])
-def get_system_status():
+async def get_system_status():
     """Endpoint para verificar status do sistema"""
     try:
         logger.info("Verificação de status do sistema solicitada")
         
-        status = glpi_service.get_system_status()
+        status = await _call_service('get_system_status')
         
         # Determinar código HTTP baseado no status
         if status['status'] == 'online':
@@ -131,6 +239,19 @@ def get_system_status():
             "token_valid": False
         }), 500
 
+@dashboard_bp.route('/prewarm/status', methods=['GET'])
+def get_prewarm_status():
+    """Endpoint com a agenda e a latência do pré-aquecimento do cache"""
+    try:
+        return jsonify(ResponseFormatter.format_success_response(cache_prewarmer.get_status()))
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter status do pré-aquecimento: {e}")
+        return jsonify(ResponseFormatter.format_error_response(
+            f"Erro interno: {str(e)}",
+            [str(e)]
+        )), 500
+
 @dashboard_bp.route('/metrics/advanced', methods=['GET'])
 def get_advanced_metrics():
     """Endpoint para métricas avançadas com múltiplos filtros"""
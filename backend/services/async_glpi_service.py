@@ -0,0 +1,786 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Any
+import aiohttp
+from backend.config.settings import active_config
+from backend.services.glpi_service import GLPIService
+from backend.services.glpi_session_pool import AsyncGLPISessionPool, unpack_session_token
+from backend.utils.deadline import deadline_scope, get_current_deadline
+from backend.utils.io_plan import Plan, Primitives, run_plan_async
+from backend.utils.query_memo import QueryMemo, get_current_memo, query_memo_scope
+from backend.utils.response_formatter import ResponseFormatter
+from backend.utils.single_flight import AsyncSingleFlight
+from backend.utils.upstream_guard import UpstreamUnavailableError, failure_scope
+from backend.utils.upstream_scheduler import RequestPriority, priority_scope
+
+
+class AsyncResponse:
+    """Resposta HTTP já lida, com interface compatível com requests.Response"""
+    
+    def __init__(self, status_code: int, headers, body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+    
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+    
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class AsyncGLPIService(GLPIService):
+    """Serviço assíncrono (asyncio + aiohttp) para integração com a API do GLPI
+    
+    Todo o I/O com o GLPI roda em um único event loop dedicado, em uma thread
+    própria, que mantém o pool de conexões entre requisições. As versões awaitable
+    dos métodos públicos (aget_dashboard_metrics, aget_new_tickets, ...) podem ser
+    aguardadas a partir de qualquer event loop (ex.: views async do Flask); os
+    métodos síncronos herdados do GLPIService continuam síncronos.
+    
+    As consultas são os planos do GLPIService (_plan_*); esta classe fornece só as
+    primitivas de I/O assíncronas e a orquestração no loop (prazo, single-flight,
+    atualização em segundo plano). Servido como WSGI, o Flask ainda ocupa uma
+    thread do servidor por requisição e cria um event loop para cada view async:
+    o que fica multiplexado são as chamadas ao GLPI, não as requisições recebidas.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.max_in_flight = active_config.GLPI_ASYNC_MAX_IN_FLIGHT
+        
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._http = None
+        self._auth_lock = None
+        self._in_flight = None
+        self._connection_stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+        
+        # Pool de sessões GLPI próprio do cliente assíncrono
+        self._async_session_pool = AsyncGLPISessionPool(
+            create_token=self._open_pool_session_async,
+            kill_token=self._close_pool_session_async,
+            size=active_config.GLPI_SESSION_POOL_SIZE,
+            session_timeout=self.session_timeout,
+            refresh_lead=active_config.GLPI_SESSION_REFRESH_LEAD,
+            refresh_jitter=active_config.GLPI_SESSION_REFRESH_JITTER
+        )
+        self._session_refresh_task = None
+        
+        # Computações simultâneas do dashboard agrupadas no loop de I/O
+        self._async_single_flight = AsyncSingleFlight()
+        self._background_tasks = set()
+    
+    # ------------------------------------------------------------------
+    # Infraestrutura do event loop e do cliente HTTP
+    # ------------------------------------------------------------------
+    
+    def _get_io_loop(self) -> asyncio.AbstractEventLoop:
+        """Obtém (criando se necessário) o event loop dedicado ao I/O com o GLPI"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='glpi-async-io', daemon=True)
+                thread.start()
+                self._loop = loop
+        return self._loop
+    
+    async def _run(self, coro):
+        """Executa a corrotina no event loop de I/O e aguarda o resultado no loop atual"""
+        loop = self._get_io_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    def _run_blocking(self, coro, timeout: float = None):
+        """Executa a corrotina no event loop de I/O a partir de uma thread comum (ex.: pré-aquecimento)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_io_loop()).result(timeout)
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Obtém a sessão aiohttp com conexões persistentes (criada no loop de I/O)"""
+        if self._http is None or self._http.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._on_request_start)
+            trace_config.on_connection_create_end.append(self._on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+            
+            connector = aiohttp.TCPConnector(
+                limit=self.max_in_flight,
+                limit_per_host=0,  # Limitado apenas pelo total em voo
+                keepalive_timeout=active_config.GLPI_POOL_IDLE_TIMEOUT
+            )
+            self._http = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._auth_lock = asyncio.Lock()
+        return self._http
+    
+    async def _on_request_start(self, session, context, params):
+        """Contabiliza requisições enviadas"""
+        self._connection_stats["requests"] += 1
+    
+    async def _on_connection_create_end(self, session, context, params):
+        """Contabiliza conexões novas"""
+        self._connection_stats["connections_opened"] += 1
+    
+    async def _on_connection_reuseconn(self, session, context, params):
+        """Contabiliza conexões reaproveitadas"""
+        self._connection_stats["connections_reused"] += 1
+    
+    def get_connection_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas de conexões do cliente assíncrono"""
+        return dict(self._connection_stats, max_in_flight=self.max_in_flight)
+    
+    def get_session_pool_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do pool de sessões do cliente assíncrono (e do broker, se houver)"""
+        stats = self._async_session_pool.get_stats()
+        if self._session_broker is not None:
+            stats['broker'] = self._session_broker.get_stats()
+        return stats
+    
+    def get_single_flight_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do agrupamento de computações do cliente assíncrono"""
+        return self._async_single_flight.get_stats()
+    
+    async def _send(self, method: str, url: str, params: Dict[str, any] = None,
+                    timeout: float = 30, headers: Dict[str, str] = None,
+                    session_token: str = None) -> AsyncResponse:
+        """Envia uma requisição HTTP e lê o corpo da resposta"""
+        session = self._get_http_session()
+        
+        if headers is None:
+            headers = self._build_session_headers(session_token or self.session_token)
+        
+        # aiohttp só aceita valores de query string como str
+        query = {key: str(value) for key, value in (params or {}).items()}
+        
+        async with self._in_flight:
+            async with session.request(
+                method, url,
+                params=query,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                body = await response.read()
+                return AsyncResponse(response.status, response.headers, body)
+    
+    @asynccontextmanager
+    async def _upstream_slot_async(self, timeout: float):
+        """Vez na fila de prioridade e vaga no limitador adaptativo; registra latência e falha da chamada"""
+        await self._scheduler.acquire_async(timeout)
+        call = {"healthy": False, "started": None}
+        try:
+            yield call
+        finally:
+            if call["started"] is None:
+                self._scheduler.release(0.0, None)
+            else:
+                self._scheduler.release(time.time() - call["started"], call["healthy"])
+    
+    # ------------------------------------------------------------------
+    # Autenticação
+    # ------------------------------------------------------------------
+    
+    async def _request_session_token_async(self) -> Optional[str]:
+        """Abre uma nova sessão no GLPI (initSession) e retorna o token"""
+        if not self.app_token or not self.user_token:
+            self.logger.error("Tokens de autenticação do GLPI (GLPI_APP_TOKEN, GLPI_USER_TOKEN) não estão configurados.")
+            return None
+        
+        session_headers = {
+            "Content-Type": "application/json",
+            "App-Token": self.app_token,
+            "Authorization": f"user_token {self.user_token}",
+        }
+        
+        try:
+            self.logger.info("Autenticando na API do GLPI (async)...")
+            response = await self._send('GET', f"{self.glpi_url}/initSession", timeout=10, headers=session_headers)
+            if not response.ok:
+                self.logger.error(f"Falha na autenticação: HTTP {response.status_code}")
+                return None
+            
+            return response.json()["session_token"]
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            self.logger.error(f"Falha na autenticação: {e}")
+            return None
+    
+    async def _kill_session_token_async(self, token: str) -> bool:
+        """Encerra uma sessão específica no GLPI (killSession)"""
+        try:
+            response = await self._send('GET', f"{self.glpi_url}/killSession", timeout=10, session_token=token)
+            return response.ok
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"Falha ao encerrar sessão GLPI: {e}")
+            return False
+    
+    async def _open_pool_session_async(self, previous_token: str = None):
+        """Abre uma sessão: pelo broker compartilhado (fora do loop de I/O), se configurado, ou direto no GLPI"""
+        if self._session_broker is not None:
+            return await asyncio.to_thread(self._session_broker.lease, previous_token)
+        return await self._request_session_token_async()
+    
+    async def _close_pool_session_async(self, token: str) -> bool:
+        """Encerra uma sessão do pool (as compartilhadas são encerradas pelo broker)"""
+        if self._session_broker is not None:
+            return await asyncio.to_thread(self._session_broker.release, token)
+        return await self._kill_session_token_async(token)
+    
+    def shutdown_sessions(self):
+        """Encerra também as sessões do pool assíncrono ao finalizar o processo"""
+        if self._loop is not None:
+            try:
+                self._run_blocking(self._close_async(), timeout=10)
+            except Exception as e:
+                self.logger.error(f"Erro ao encerrar sessões do cliente assíncrono: {e}")
+        super().shutdown_sessions()
+    
+    async def _perform_authentication_async(self) -> bool:
+        """Executa o processo de autenticação"""
+        token, created_at = unpack_session_token(await self._open_pool_session_async())
+        if not token:
+            return False
+        
+        self._set_primary_session(token, created_at)
+        await self._async_session_pool.adopt(token, self.token_created_at)
+        self._start_session_refresher_async()
+        
+        self.logger.info("Autenticação bem-sucedida!")
+        return True
+    
+    def _start_session_refresher_async(self):
+        """Inicia (uma única vez) a tarefa do loop de I/O que renova as sessões antes do vencimento"""
+        if not self.session_refresh_enabled or self._session_refresh_task is not None:
+            return
+        self._session_refresh_task = asyncio.ensure_future(self._session_refresh_loop_async())
+    
+    async def _session_refresh_loop_async(self):
+        while True:
+            next_due = self._async_session_pool.next_refresh_at()
+            await asyncio.sleep(60 if next_due is None else min(max(next_due - time.time(), 1), 60))
+            
+            try:
+                await self._async_session_pool.refresh_due(on_swap=self._on_session_swap)
+            except Exception as e:
+                self.logger.error(f"Erro na renovação das sessões GLPI em segundo plano: {e}")
+    
+    async def _authenticate_with_retry_async(self) -> bool:
+        """Autentica com retry automático e backoff exponencial"""
+        for attempt in range(self.max_retries):
+            if await self._perform_authentication_async():
+                return True
+            
+            if attempt < self.max_retries - 1:
+                delay = self.retry_delay_base ** attempt
+                self.logger.warning(f"Tentativa {attempt + 1} falhou, aguardando {delay}s antes da próxima tentativa...")
+                await asyncio.sleep(delay)
+        
+        self.logger.error(f"Falha na autenticação após {self.max_retries} tentativas")
+        return False
+    
+    async def _ensure_authenticated_async(self) -> bool:
+        """Garante que temos um token válido; chamadas concorrentes aguardam uma única autenticação"""
+        if self.session_token and not self._is_token_expired():
+            return True
+        
+        self._get_http_session()
+        async with self._auth_lock:
+            if self.session_token and not self._is_token_expired():
+                return True
+            self.logger.info("Token expirado ou inexistente, re-autenticando...")
+            return await self._authenticate_with_retry_async()
+    
+    async def _make_authenticated_request_async(self, method: str, url: str, params: Dict[str, any] = None,
+                                                timeout: float = 30) -> Optional[AsyncResponse]:
+        """Faz uma requisição autenticada com retry automático, usando uma sessão do pool"""
+        if self._upstream_guard.is_open():
+            self.logger.warning(f"GLPI indisponível (circuito aberto), requisição recusada: {url}")
+            return None
+        
+        deadline = get_current_deadline()
+        base_timeout = timeout
+        
+        for attempt in range(self.max_retries):
+            if deadline is not None:
+                if deadline.expired():
+                    deadline.exceeded = True
+                    self.logger.warning(f"Prazo da computação esgotado, requisição abandonada: {url}")
+                    return None
+                timeout = deadline.cap(base_timeout)
+            
+            try:
+                if not await self._ensure_authenticated_async():
+                    return None
+                
+                # A vez na fila vem antes da sessão: chamadas em espera não retêm sessões do pool
+                async with self._upstream_slot_async(timeout) as call, self._async_session_pool.lease() as session:
+                    if session is None:
+                        self.logger.error("Nenhuma sessão GLPI disponível no pool")
+                        return None
+                    call["started"] = time.time()
+                    
+                    response = await self._send(method, url, params=params, timeout=timeout,
+                                                session_token=session.token)
+                    
+                    # Se recebemos 401, a sessão pode ter expirado: renovar apenas ela
+                    if response.status_code == 401:
+                        self.logger.warning("Recebido 401, sessão pode ter expirado. Renovando sessão...")
+                        old_token = session.token
+                        if self._session_broker is not None:
+                            await asyncio.to_thread(self._session_broker.invalidate, old_token)
+                        renewed = await self._async_session_pool.renew(session)
+                        
+                        if self.session_token == old_token:
+                            self._set_primary_session(session.token if renewed else None, session.created_at)
+                        
+                        if renewed:
+                            response = await self._send(method, url, params=params, timeout=timeout,
+                                                        session_token=session.token)
+                    
+                    call["healthy"] = response.status_code < 500
+                    return response
+            
+            except UpstreamUnavailableError as e:
+                self.logger.warning(f"Requisição ao GLPI recusada: {e}")
+                return None
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error(f"Erro na requisição (tentativa {attempt + 1}): {e}")
+                if attempt < self.max_retries - 1 and not self._upstream_guard.is_open():
+                    delay = self.retry_delay_base ** attempt
+                    if deadline is not None and deadline.remaining() <= delay:
+                        deadline.exceeded = True
+                        return None
+                    await asyncio.sleep(delay)
+                else:
+                    return None
+        
+        return None
+    
+    # ------------------------------------------------------------------
+    # Consultas internas
+    # ------------------------------------------------------------------
+    
+    async def _get_ticket_count_async(self, group_id: int = None, status_id: int = None,
+                                      start_date: str = None, end_date: str = None) -> int:
+        """Obtém contagem de tickets com filtros opcionais"""
+        # Espelho local em dia: consulta SQL indexada, rápida o bastante para rodar no loop
+        mirrored = self._mirror_count(group_id, status_id, start_date, end_date)
+        if mirrored is not None:
+            return mirrored
+        
+        search_params = self._build_ticket_count_params(group_id, status_id, start_date, end_date)
+        try:
+            response = await self._make_authenticated_request_async(
+                'GET',
+                f"{self.glpi_url}/search/Ticket",
+                params=search_params
+            )
+            if not response or not response.ok:
+                return 0
+            total = self._parse_ticket_count(response)
+            
+            # Contagem concluída fica disponível para respostas parciais enquanto as demais seguem em voo
+            memo = get_current_memo()
+            if memo is not None:
+                memo.seed(QueryMemo.make_key('Ticket', search_params), total)
+            
+            return total
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao obter contagem de tickets: {e}")
+            return 0
+    
+    async def _count_many_async(self, tasks: Dict[Any, Dict[str, any]]) -> Dict[Any, int]:
+        """Dispara as contagens independentes simultaneamente no loop de I/O"""
+        results = await asyncio.gather(*(self._get_ticket_count_async(**kwargs) for kwargs in tasks.values()))
+        return dict(zip(tasks.keys(), results))
+    
+    async def _request_many_async(self, tasks: Dict[Any, Dict[str, any]]) -> Dict[Any, Optional[AsyncResponse]]:
+        """Dispara as requisições independentes simultaneamente no loop de I/O"""
+        responses = await asyncio.gather(*(self._make_authenticated_request_async(**kwargs) for kwargs in tasks.values()))
+        return dict(zip(tasks.keys(), responses))
+    
+    async def _gather_plans_async(self, plans: Dict[Any, Plan]) -> Dict[Any, Any]:
+        """Executa os subplanos ao mesmo tempo no loop de I/O"""
+        results = await asyncio.gather(*(self._run_plan_async(plan) for plan in plans.values()))
+        return dict(zip(plans.keys(), results))
+    
+    def _plan_primitives_async(self) -> Primitives:
+        """Primitivas de I/O do cliente assíncrono usadas pelos planos de consulta do GLPIService"""
+        return {
+            'authenticate': self._ensure_authenticated_async,
+            'request': self._make_authenticated_request_async,
+            'request_many': self._request_many_async,
+            'count': self._get_ticket_count_async,
+            'count_many': self._count_many_async,
+            'gather': self._gather_plans_async,
+            'single_flight': lambda key, plan_factory: self._async_single_flight.do(
+                key, lambda: self._run_plan_async(plan_factory())
+            ),
+        }
+
+    async def _run_plan_async(self, plan: Plan):
+        """Executa um plano de consulta do GLPIService aguardando as primitivas assíncronas"""
+        return await run_plan_async(plan, self._plan_primitives_async())
+    
+    def _serve_dashboard_cache_async(self, cache_key: str, sub_key: Optional[str],
+                                     refresh: Callable[[], Awaitable[Dict[str, any]]]) -> Optional[Dict[str, any]]:
+        """Retorna o dashboard em cache; se obsoleto, agenda a atualização no loop de I/O"""
+        state = self._get_cache_state(cache_key, sub_key)
+        if state is None:
+            return None
+        
+        data, age, stale = state
+        if stale:
+            key = sub_key or cache_key
+            self.logger.info(f"Métricas obsoletas servidas do cache ({age:.0f}s): {key}")
+            # O single-flight evita atualizações duplicadas e agrupa requisições sem cache
+            task = asyncio.ensure_future(self._refresh_in_background_async(key, refresh))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        else:
+            self.logger.info(f"Métricas do dashboard carregadas do cache: {sub_key or cache_key}")
+        
+        return self._with_cache_age(data, age, stale)
+    
+    async def _refresh_in_background_async(self, key: str,
+                                           refresh: Callable[[], Awaitable[Dict[str, any]]]) -> Dict[str, any]:
+        """Atualização de cache obsoleto com a prioridade de segundo plano"""
+        with priority_scope(RequestPriority.BACKGROUND):
+            return await self._async_single_flight.do(key, refresh)
+    
+    async def _compute_within_deadline_async(self, key: str, start_time: float,
+                                             compute: Callable[[Optional[QueryMemo]], Awaitable[Dict[str, any]]],
+                                             partial: Callable[[QueryMemo], Dict[str, any]]) -> Dict[str, any]:
+        """Aguarda a computação até o prazo da requisição; depois responde com as células já concluídas"""
+        if self.request_deadline <= 0:
+            return await self._async_single_flight.do(key, lambda: compute(None))
+        
+        # A tarefa segue no loop de I/O após o prazo e grava o cache ao terminar
+        running = self._deadline_computations.get(key)
+        if running is None:
+            memo = QueryMemo()
+            task = asyncio.ensure_future(self._async_single_flight.do(key, lambda: compute(memo)))
+            running = self._deadline_computations[key] = (task, memo)
+            task.add_done_callback(lambda _: self._forget_deadline_computation(key, running))
+        
+        task, memo = running
+        try:
+            return await asyncio.wait_for(asyncio.shield(task),
+                                          max(start_time + self.request_deadline - time.time(), 0))
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Prazo de {self.request_deadline}s esgotado para {key}, respondendo com resultado parcial")
+            return partial(memo)
+    
+    async def _get_dashboard_metrics_async(self, use_cache: bool = True,
+                                           include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas completas do dashboard (executa no loop de I/O)"""
+        start_time = time.time()
+        cache_key = 'dashboard_metrics_trends' if include_trends else 'dashboard_metrics'
+        
+        if use_cache:
+            cached_data = self._serve_dashboard_cache_async(
+                cache_key, None,
+                lambda: self._compute_dashboard_metrics_async(cache_key, True, include_trends, time.time())
+            )
+            if cached_data:
+                return cached_data
+        
+        if self._upstream_guard.is_open():
+            return self._upstream_fallback(cache_key)
+        
+        return await self._compute_within_deadline_async(
+            cache_key, start_time,
+            lambda memo: self._compute_dashboard_metrics_async(cache_key, use_cache, include_trends, start_time, memo),
+            lambda memo: self._build_partial_dashboard(memo, include_trends=include_trends, start_time=start_time,
+                                                       cache_key=cache_key)
+        )
+    
+    async def _compute_dashboard_metrics_async(self, cache_key: str, use_cache: bool, include_trends: bool,
+                                               start_time: float, memo: QueryMemo = None) -> Dict[str, any]:
+        """Calcula as métricas completas do dashboard e atualiza o cache"""
+        try:
+            with deadline_scope(self.computation_deadline) as deadline, query_memo_scope(memo), failure_scope() as failures:
+                result = await self._run_plan_async(self._plan_dashboard_metrics(include_trends=include_trends,
+                                                                                 start_time=start_time))
+            
+            return self._store_dashboard_result(result, deadline, failures, cache_key, use_cache=use_cache)
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao obter métricas do dashboard: {e}")
+            return ResponseFormatter.format_error_response(f"Erro interno: {str(e)}", [str(e)])
+
+    async def _get_dashboard_metrics_with_date_filter_async(self, start_date: str = None, end_date: str = None,
+                                                            include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas do dashboard com filtro de data (executa no loop de I/O)"""
+        start_time = time.time()
+        cache_key = self._filtered_cache_key(start_date, end_date, include_trends)
+        
+        cached_data = self._serve_dashboard_cache_async(
+            'dashboard_metrics_filtered', cache_key,
+            lambda: self._compute_dashboard_metrics_with_date_filter_async(cache_key, start_date, end_date,
+                                                                           include_trends, time.time())
+        )
+        if cached_data:
+            return cached_data
+        
+        if self._upstream_guard.is_open():
+            return self._upstream_fallback('dashboard_metrics_filtered', cache_key)
+        
+        return await self._compute_within_deadline_async(
+            cache_key, start_time,
+            lambda memo: self._compute_dashboard_metrics_with_date_filter_async(cache_key, start_date, end_date,
+                                                                                include_trends, start_time, memo),
+            lambda memo: self._build_partial_dashboard(memo, start_date, end_date,
+                                                       {"start_date": start_date, "end_date": end_date},
+                                                       include_trends, start_time,
+                                                       'dashboard_metrics_filtered', cache_key)
+        )
+    
+    async def _compute_dashboard_metrics_with_date_filter_async(self, cache_key: str, start_date: str,
+                                                                end_date: str, include_trends: bool,
+                                                                start_time: float,
+                                                                memo: QueryMemo = None) -> Dict[str, any]:
+        """Calcula as métricas do dashboard com filtro de data e atualiza o cache"""
+        try:
+            filters_data = {
+                "start_date": start_date,
+                "end_date": end_date
+            }
+            with deadline_scope(self.computation_deadline) as deadline, query_memo_scope(memo), failure_scope() as failures:
+                result = await self._run_plan_async(self._plan_dashboard_metrics(start_date, end_date, filters_data,
+                                                                                 include_trends, start_time))
+            
+            return self._store_dashboard_result(result, deadline, failures, 'dashboard_metrics_filtered', cache_key)
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao obter métricas com filtro de data: {e}")
+            return ResponseFormatter.format_error_response(f"Erro interno: {str(e)}", [str(e)])
+
+    async def _refresh_technician_ranking_async(self) -> List[Dict[str, any]]:
+        """Recalcula o ranking completo de técnicos e atualiza o cache"""
+        with priority_scope(RequestPriority.RANKING):
+            ranking = await self._run_plan_async(self._plan_technician_ranking(limit=None))
+        
+        if ranking:
+            self._set_cache_data('technician_ranking', ranking, self.ranking_cache_ttl)
+        
+        return ranking
+    
+    async def _refresh_technician_ranking_with_date_filter_async(self, start_date: str = None,
+                                                                 end_date: str = None) -> List[Dict[str, any]]:
+        """Recalcula o ranking completo de um intervalo de datas e atualiza o cache"""
+        with priority_scope(RequestPriority.RANKING):
+            ranking = await self._run_plan_async(self._plan_technician_ranking(None, start_date, end_date))
+        
+        if ranking:
+            self._set_cache_data('technician_ranking_filtered', ranking, self.ranking_cache_ttl,
+                                 self._ranking_filter_key(start_date, end_date))
+        
+        return ranking
+    
+    async def _get_technician_ranking_with_filters_async(self, limit: int, start_date: str, end_date: str,
+                                                         level: str) -> List[Dict[str, any]]:
+        """Ranking filtrado por intervalo de datas e/ou nível (executa no loop de I/O)"""
+        if not start_date and not end_date:
+            ranking = self._get_cache_data('technician_ranking') if self._is_cache_valid('technician_ranking') else None
+            if not ranking:
+                ranking = await self._async_single_flight.do('technician_ranking',
+                                                             self._refresh_technician_ranking_async)
+        else:
+            filter_key = self._ranking_filter_key(start_date, end_date)
+            ranking = self._get_cache_data('technician_ranking_filtered', filter_key) \
+                if self._is_cache_valid('technician_ranking_filtered', filter_key) else None
+            if not ranking:
+                ranking = await self._async_single_flight.do(
+                    f"technician_ranking:{filter_key}",
+                    lambda: self._refresh_technician_ranking_with_date_filter_async(start_date, end_date)
+                )
+        
+        level_index = await self._run_plan_async(self._plan_level_index())
+        return self._apply_ranking_filters(ranking, level_index, level, limit)
+    
+    async def _refresh_new_tickets_async(self, limit: int = 10) -> List[Dict[str, any]]:
+        """Busca novamente os tickets novos e atualiza o cache"""
+        tickets = await self._run_plan_async(self._plan_fetch_new_tickets(limit))
+        
+        if tickets is None:
+            return []
+        
+        self._set_cache_data('new_tickets', tickets, self.new_tickets_cache_ttl, str(limit))
+        return tickets
+    
+    async def _get_new_tickets_async(self, limit: int = 10) -> List[Dict[str, any]]:
+        """Busca tickets com status 'novo' (executa no loop de I/O)"""
+        return await self._run_plan_async(self._plan_fetch_new_tickets(limit)) or []
+
+    async def _get_system_status_async(self) -> Dict[str, any]:
+        """Retorna status do sistema GLPI (executa no loop de I/O)"""
+        try:
+            start_time = time.time()
+            
+            if await self._ensure_authenticated_async():
+                return {
+                    "status": "online",
+                    "message": "GLPI conectado e autenticado",
+                    "response_time": time.time() - start_time,
+                    "token_valid": not self._is_token_expired(),
+                    "connection_pool": self.get_connection_stats(),
+                    "session_pool": self.get_session_pool_stats(),
+                    "single_flight": self.get_single_flight_stats(),
+                    "cache": self.get_cache_stats(),
+                    "upstream_guard": self.get_upstream_guard_stats(),
+                    "scheduler": self.get_scheduler_stats()
+                }
+            
+            return {
+                "status": "warning",
+                "message": "GLPI acessível mas falha na autenticação",
+                "response_time": time.time() - start_time,
+                "token_valid": False,
+                "connection_pool": self.get_connection_stats(),
+                "upstream_guard": self.get_upstream_guard_stats()
+            }
+        
+        except Exception as e:
+            return {
+                "status": "offline",
+                "message": f"Erro de conexão: {str(e)}",
+                "response_time": None,
+                "token_valid": False,
+                "upstream_guard": self.get_upstream_guard_stats()
+            }
+    
+    async def _close_async(self):
+        """Encerra as sessões GLPI do pool e fecha a sessão aiohttp"""
+        try:
+            closed = await self._async_session_pool.drain()
+            if closed:
+                self.logger.info(f"{closed} sessão(ões) GLPI encerrada(s) com sucesso")
+        finally:
+            self._set_primary_session(None)
+        
+        if self._session_refresh_task is not None:
+            self._session_refresh_task.cancel()
+            self._session_refresh_task = None
+        
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+    
+    # ------------------------------------------------------------------
+    # API pública awaitable: versões dos métodos do GLPIService com o prefixo 'a' (como aclose),
+    # sem sobrescrever os métodos síncronos herdados
+    # ------------------------------------------------------------------
+    
+    async def aget_dashboard_metrics(self, use_cache: bool = True, include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas completas do dashboard"""
+        return await self._run(self._get_dashboard_metrics_async(use_cache, include_trends))
+    
+    async def aget_dashboard_metrics_with_date_filter(self, start_date: str = None, end_date: str = None,
+                                                     include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas do dashboard com filtro de data"""
+        return await self._run(
+            self._get_dashboard_metrics_with_date_filter_async(start_date, end_date, include_trends)
+        )
+    
+    async def aget_technician_ranking(self, limit: int = 10, use_cache: bool = True) -> List[Dict[str, any]]:
+        """Obtém ranking de técnicos por total de tickets"""
+        # O cache guarda o ranking completo; o limite é aplicado na saída
+        if use_cache and self._is_cache_valid('technician_ranking'):
+            cached_data = self._get_cache_data('technician_ranking')
+            if cached_data:
+                self.logger.info("Ranking de técnicos carregado do cache")
+                return cached_data[:limit]
+        
+        try:
+            if use_cache:
+                ranking = await self._run(
+                    self._async_single_flight.do('technician_ranking', self._refresh_technician_ranking_async)
+                )
+                return ranking[:limit]
+            
+            with priority_scope(RequestPriority.RANKING):
+                return await self._run(self._run_plan_async(self._plan_technician_ranking(limit)))
+        except Exception as e:
+            self.logger.error(f"Erro ao obter ranking de técnicos: {e}")
+            return await asyncio.to_thread(self._get_technician_ranking_fallback, limit)
+    
+    async def aget_technician_ranking_with_filters(self, limit: int = 10, start_date: str = None,
+                                                  end_date: str = None, level: str = None) -> List[Dict[str, any]]:
+        """Obtém ranking de técnicos filtrado por intervalo de datas e/ou nível de serviço"""
+        try:
+            return await self._run(self._get_technician_ranking_with_filters_async(limit, start_date, end_date, level))
+        except Exception as e:
+            self.logger.error(f"Erro ao obter ranking de técnicos com filtros: {e}")
+            return []
+    
+    async def aget_new_tickets(self, limit: int = 10, use_cache: bool = True) -> List[Dict[str, any]]:
+        """Busca tickets com status 'novo' com detalhes completos"""
+        if use_cache and self._is_cache_valid('new_tickets', str(limit)):
+            self.logger.info("Tickets novos carregados do cache")
+            return self._get_cache_data('new_tickets', str(limit))
+        
+        if not use_cache:
+            return await self._run(self._get_new_tickets_async(limit))
+        
+        return await self._run(self._refresh_new_tickets_async(limit))
+    
+    # ------------------------------------------------------------------
+    # Pré-aquecimento e espelho local (chamados pelo CachePrewarmer e pelo TicketMirror a partir de suas threads)
+    # ------------------------------------------------------------------
+    
+    def refresh_dashboard_metrics(self) -> Dict[str, any]:
+        """Recalcula o dashboard padrão no loop de I/O e atualiza o cache"""
+        return self._run_blocking(self._async_single_flight.do(
+            'dashboard_metrics',
+            lambda: self._compute_dashboard_metrics_async('dashboard_metrics', True, False, time.time())
+        ))
+    
+    def refresh_dashboard_metrics_with_date_filter(self, start_date: str = None,
+                                                   end_date: str = None) -> Dict[str, any]:
+        """Recalcula o dashboard filtrado por data no loop de I/O e atualiza o cache"""
+        cache_key = self._filtered_cache_key(start_date, end_date)
+        return self._run_blocking(self._async_single_flight.do(
+            cache_key,
+            lambda: self._compute_dashboard_metrics_with_date_filter_async(cache_key, start_date, end_date,
+                                                                           False, time.time())
+        ))
+    
+    def refresh_technician_ranking(self) -> List[Dict[str, any]]:
+        """Recalcula o ranking completo de técnicos no loop de I/O e atualiza o cache"""
+        return self._run_blocking(
+            self._async_single_flight.do('technician_ranking', self._refresh_technician_ranking_async)
+        )
+    
+    def refresh_level_index(self) -> Optional[Dict[str, str]]:
+        """Reconstrói o índice usuário → nível no loop de I/O e atualiza o cache"""
+        return self._run_blocking(self._async_single_flight.do(
+            'level_index', lambda: self._run_plan_async(self._plan_refresh_level_index())
+        ))
+    
+    def refresh_lookups(self) -> bool:
+        """Revalida os metadados do GLPI no loop de I/O e regrava os snapshots"""
+        return self._run_blocking(self._run_plan_async(self._plan_refresh_lookups()))
+    
+    def refresh_new_tickets(self, limit: int = 10) -> List[Dict[str, any]]:
+        """Busca novamente os tickets novos no loop de I/O e atualiza o cache"""
+        return self._run_blocking(self._refresh_new_tickets_async(limit))
+    
+    def fetch_mirror_records(self, modified_since: str = None, deleted: bool = False) -> Optional[List[Dict[str, any]]]:
+        """Busca os registros do espelho local no loop de I/O (chamado pela thread de sincronização)"""
+        return self._run_blocking(self._run_plan_async(self._plan_fetch_mirror_records(modified_since, deleted)))
+    
+    async def aget_system_status(self) -> Dict[str, any]:
+        """Retorna status do sistema GLPI"""
+        return await self._run(self._get_system_status_async())
+    
+    async def aclose(self):
+        """Encerra as sessões com o GLPI e fecha o cliente HTTP assíncrono"""
+        if self._loop is not None:
+            await self._run(self._close_async())
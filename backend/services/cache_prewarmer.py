@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.upstream_scheduler import RequestPriority, priority_scope
+
+logger = logging.getLogger('cache_prewarmer')
+
+
+class PrewarmJob:
+    """Atualização periódica de uma entrada de cache do serviço GLPI"""
+    
+    def __init__(self, name: str, ttl: float, refresh: Callable[[], Any],
+                 time_left: Callable[[], Optional[float]]):
+        self.name = name
+        self.ttl = ttl
+        self.refresh = refresh
+        self.time_left = time_left
+        
+        self.next_run = 0.0
+        self.last_run = None
+        self.last_latency = None
+        self.last_error = None
+        self.runs = 0
+        self.skipped = 0
+        self.deferred = 0
+    
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Agenda e última execução do job"""
+        return {
+            "name": self.name,
+            "ttl": self.ttl,
+            "next_run": datetime.fromtimestamp(self.next_run).isoformat() if self.next_run else None,
+            "next_run_in": round(max(self.next_run - now, 0.0), 1),
+            "last_run": datetime.fromtimestamp(self.last_run).isoformat() if self.last_run else None,
+            "last_latency": round(self.last_latency, 3) if self.last_latency is not None else None,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "deferred": self.deferred
+        }
+
+
+class CachePrewarmer:
+    """Atualiza o cache do dashboard, do ranking, do índice de níveis, dos tickets novos e dos metadados antes do TTL vencer
+    
+    Os jobs rodam em série em uma única thread; as chamadas ao GLPI entram na fila
+    BACKGROUND do UpstreamScheduler, atrás das interativas e do ranking. Além disso,
+    antes de cada atualização o pré-aquecimento cede a vez enquanto houver computações
+    de requisições em andamento (até max_defer segundos). Entradas que continuam
+    frescas (atualizadas por uma requisição ou por outro worker) são apenas reagendadas.
+    
+    Com um worker_lock, apenas o worker que detém o lock executa os jobs; os demais
+    tentam obtê-lo a cada lead_time segundos. Com o cache em memória, somente o cache
+    desse worker é pré-aquecido (com o Redis, o cache aquecido é compartilhado).
+    """
+    
+    def __init__(self, service, lead_time: float = 30, windows: Iterable[int] = (0, 7, 30),
+                 new_tickets_limit: int = 10, max_defer: float = 60, initial_delay: float = 5,
+                 poll_interval: float = 0.5, worker_lock=None):
+        self.service = service
+        self.worker_lock = worker_lock  # WorkerLock entre workers (None = este processo sempre pré-aquece)
+        self.lead_time = lead_time
+        self.windows = sorted(set(int(days) for days in windows))
+        self.new_tickets_limit = new_tickets_limit
+        self.max_defer = max_defer
+        self.initial_delay = initial_delay
+        self.poll_interval = poll_interval
+        
+        self.jobs = self._build_jobs()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @staticmethod
+    def _window(days: int) -> Tuple[str, str]:
+        """Janela dos últimos N dias no formato enviado pelo frontend (datas UTC de toISOString)"""
+        today = datetime.now(timezone.utc).date()
+        return (today - timedelta(days=days)).isoformat(), today.isoformat()
+    
+    def _build_jobs(self) -> List[PrewarmJob]:
+        service = self.service
+        limit = self.new_tickets_limit
+        
+        jobs = [PrewarmJob(
+            'dashboard_metrics', service.dashboard_cache_ttl,
+            service.refresh_dashboard_metrics,
+            lambda: service.get_cache_time_left('dashboard_metrics')
+        )]
+        
+        for days in self.windows:
+            jobs.append(PrewarmJob(
+                'dashboard_today' if days == 0 else f'dashboard_last_{days}_days', service.dashboard_cache_ttl,
+                lambda days=days: service.refresh_dashboard_metrics_with_date_filter(*self._window(days)),
+                lambda days=days: service.get_cache_time_left(
+                    'dashboard_metrics_filtered', service._filtered_cache_key(*self._window(days))
+                )
+            ))
+        
+        jobs.append(PrewarmJob(
+            'technician_ranking', service.ranking_cache_ttl,
+            service.refresh_technician_ranking,
+            lambda: service.get_cache_time_left('technician_ranking')
+        ))
+        jobs.append(PrewarmJob(
+            'level_index', service.level_index_ttl,
+            service.refresh_level_index,
+            lambda: service.get_cache_time_left('level_index')
+        ))
+        jobs.append(PrewarmJob(
+            'new_tickets', service.new_tickets_cache_ttl,
+            lambda: service.refresh_new_tickets(limit),
+            lambda: service.get_cache_time_left('new_tickets', str(limit))
+        ))
+        # Por último: metadados carregados dos snapshots em disco são revalidados após o primeiro aquecimento
+        jobs.append(PrewarmJob(
+            'lookups', service.lookup_ttl,
+            service.refresh_lookups,
+            service.get_lookup_time_left
+        ))
+        return jobs
+    
+    def start(self):
+        """Inicia a thread de pré-aquecimento"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            first_run = time.time() + self.initial_delay
+            for job in self.jobs:
+                job.next_run = first_run
+            
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='glpi-prewarm', daemon=True)
+            self._thread.start()
+        
+        logger.info(f"Pré-aquecimento iniciado com {len(self.jobs)} jobs (antecedência de {self.lead_time}s)")
+    
+    def stop(self, timeout: float = 5):
+        """Interrompe a thread de pré-aquecimento e libera o lock entre workers"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.worker_lock is not None:
+            self.worker_lock.release()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            job = min(self.jobs, key=lambda item: item.next_run)
+            wait = job.next_run - time.time()
+            
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            
+            self._run_job(job)
+    
+    def _service_busy(self) -> bool:
+        """Há computações de requisições em andamento no serviço"""
+        return self.service.get_single_flight_stats().get('in_flight', 0) > 0
+    
+    def _wait_for_idle(self, job: PrewarmJob):
+        """Cede a vez às requisições interativas (até max_defer segundos)"""
+        deadline = time.time() + self.max_defer
+        if self._service_busy():
+            job.deferred += 1
+        
+        while self._service_busy() and time.time() < deadline:
+            if self._stop.wait(self.poll_interval):
+                return
+    
+    def _run_job(self, job: PrewarmJob):
+        # Outro worker detém o lock e faz o pré-aquecimento: tenta de novo mais tarde
+        if self.worker_lock is not None and not self.worker_lock.try_acquire():
+            job.next_run = time.time() + max(self.lead_time, self.poll_interval)
+            return
+        
+        # Entrada ainda fresca (atualizada por uma requisição ou outro worker): apenas reagenda
+        time_left = job.time_left()
+        if time_left is not None and time_left > self.lead_time:
+            job.skipped += 1
+            job.next_run = time.time() + time_left - self.lead_time
+            return
+        
+        self._wait_for_idle(job)
+        if self._stop.is_set():
+            return
+        
+        started = time.time()
+        try:
+            # Chamadas do pré-aquecimento ficam atrás das interativas e do ranking na fila do GLPI
+            with priority_scope(RequestPriority.BACKGROUND):
+                job.refresh()
+            job.last_error = None
+        except Exception as e:
+            job.last_error = str(e)
+            logger.error(f"Erro no pré-aquecimento de {job.name}: {e}")
+        
+        finished = time.time()
+        job.runs += 1
+        job.last_run = started
+        job.last_latency = finished - started
+        job.next_run = finished + max(job.ttl - self.lead_time, self.poll_interval)
+        logger.info(f"Pré-aquecimento de {job.name} concluído em {job.last_latency:.2f}s")
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna a agenda e a latência da última execução de cada job"""
+        now = time.time()
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "active_worker": self.worker_lock is None or self.worker_lock.held,
+            "lead_time": self.lead_time,
+            "max_defer": self.max_defer,
+            "jobs": [job.to_dict(now) for job in sorted(self.jobs, key=lambda item: item.next_run)]
+        }
@@ -1,13 +1,31 @@
 # -*- coding: utf-8 -*-
+import heapq
 import logging
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 import requests
+import threading
 import time
 import os
 import json
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from backend.config.settings import active_config
 from backend.utils.response_formatter import ResponseFormatter
+from backend.utils.http_transport import PooledHTTPTransport
+from backend.utils.fan_out import ParallelFanOut
+from backend.utils.io_plan import IOCall, Plan, Primitives, run_plan
+from backend.utils.query_memo import QueryMemo, get_current_memo, query_memo_scope
+from backend.utils.deadline import deadline_scope, get_current_deadline
+from backend.utils.single_flight import SingleFlight
+from backend.utils.cache_backend import create_cache_backend
+from backend.utils.lookup_store import LookupSnapshotStore
+from backend.utils.lru_cache import LRUTTLCache
+from backend.utils.prefix_index import DailyPrefixIndex
+from backend.utils.upstream_guard import UpstreamGuard, UpstreamUnavailableError, failure_scope
+from backend.utils.upstream_scheduler import RequestPriority, UpstreamScheduler, get_current_priority, priority_scope
+from backend.services.glpi_session_pool import GLPISession, GLPISessionPool, unpack_session_token
+from backend.services.glpi_session_broker import create_session_broker
 
 
 class GLPIService:
@@ -50,30 +68,165 @@ class GLPIService:
         self.service_levels = self.service_levels_manutencao
         
         self.field_ids = {}
-        self.session_token = None
-        self.token_created_at = None
-        self.token_expires_at = None
+        # Sessão principal: substituída por inteiro (token e horário juntos) a cada renovação
+        self._primary_session: Optional[GLPISession] = None
+        self._authentication_lock = threading.Lock()
         self.max_retries = 3
         self.retry_delay_base = 2  # Base para backoff exponencial
         self.session_timeout = 3600  # 1 hora em segundos
         
+        # Transporte HTTP com conexões persistentes para o GLPI
+        self.transport = PooledHTTPTransport(
+            pool_connections=active_config.GLPI_POOL_CONNECTIONS,
+            pool_maxsize=active_config.GLPI_POOL_MAXSIZE,
+            pool_block=active_config.GLPI_POOL_BLOCK,
+            idle_timeout=active_config.GLPI_POOL_IDLE_TIMEOUT
+        )
+        
+        # Broker opcional: sessões compartilhadas entre os workers (Redis ou arquivo com lock)
+        self._session_broker = create_session_broker(
+            active_config,
+            create_token=self._request_session_token,
+            kill_token=self._kill_session_token,
+            size=active_config.GLPI_SESSION_POOL_SIZE,
+            session_timeout=self.session_timeout
+        )
+        
+        # Pool de sessões GLPI: cada requisição em voo usa uma sessão própria,
+        # pois o GLPI serializa requisições simultâneas na mesma sessão PHP
+        self._session_pool = GLPISessionPool(
+            create_token=self._open_pool_session,
+            kill_token=self._close_pool_session,
+            size=active_config.GLPI_SESSION_POOL_SIZE,
+            session_timeout=self.session_timeout,
+            refresh_lead=active_config.GLPI_SESSION_REFRESH_LEAD,
+            refresh_jitter=active_config.GLPI_SESSION_REFRESH_JITTER
+        )
+        
+        # Renovação das sessões em segundo plano, iniciada após a primeira autenticação
+        self.session_refresh_enabled = active_config.GLPI_SESSION_REFRESH_ENABLED
+        self._session_refresher = None
+        self._session_refresh_stop = threading.Event()
+        
+        # Pool limitado para disparar contagens independentes em paralelo
+        # (um pool por classe de prioridade: o segundo plano não ocupa os workers das requisições interativas)
+        self.fan_out = ParallelFanOut(max_workers=active_config.GLPI_MAX_PARALLEL_REQUESTS, lane=get_current_priority)
+        
+        # Limite adaptativo de requisições em voo e circuit breaker (falha rápida com o GLPI instável);
+        # o teto é o tamanho do pool: além dele as chamadas só aguardariam uma sessão livre
+        self._upstream_guard = UpstreamGuard(
+            initial_limit=active_config.GLPI_MAX_PARALLEL_REQUESTS,
+            min_limit=active_config.GLPI_GUARD_MIN_LIMIT,
+            max_limit=min(active_config.GLPI_GUARD_MAX_LIMIT, active_config.GLPI_SESSION_POOL_SIZE),
+            latency_target=active_config.GLPI_GUARD_LATENCY_TARGET,
+            window=active_config.GLPI_GUARD_WINDOW,
+            failure_threshold=active_config.GLPI_GUARD_FAILURE_THRESHOLD,
+            open_seconds=active_config.GLPI_GUARD_OPEN_SECONDS
+        )
+        
+        # Fila de prioridade (interativas > ranking > segundo plano) e limite global de taxa antes do guard
+        self._scheduler = UpstreamScheduler(
+            self._upstream_guard,
+            rate=active_config.GLPI_RATE_LIMIT,
+            burst=active_config.GLPI_RATE_BURST
+        )
+        
+        # Computações simultâneas do dashboard com a mesma chave de cache são agrupadas
+        self._single_flight = SingleFlight()
+        
+        # Stale-while-revalidate: entradas obsoletas são servidas enquanto atualizam em segundo plano
+        self.dashboard_cache_ttl = active_config.DASHBOARD_CACHE_TTL
+        self.dashboard_cache_stale_ttl = active_config.DASHBOARD_CACHE_STALE_TTL
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='glpi-refresh')
+        self._refresh_lock = threading.Lock()
+        self._refreshing = set()
+        
+        # Prazos do dashboard: a requisição responde em até request_deadline (parcial se preciso) e a
+        # computação segue em segundo plano, limitada por computation_deadline, até gravar o cache
+        self.request_deadline = active_config.GLPI_REQUEST_DEADLINE
+        self.computation_deadline = active_config.GLPI_COMPUTATION_DEADLINE
+        # Uma thread por computação distinta: na fila do executor, uma chave só responderia com o parcial vazio
+        self._deadline_executor = ThreadPoolExecutor(
+            max_workers=max(active_config.GLPI_DEADLINE_WORKERS, active_config.GLPI_MAX_PARALLEL_REQUESTS),
+            thread_name_prefix='glpi-deadline'
+        )
+        self._deadline_lock = threading.Lock()
+        self._deadline_computations = {}
+        
+        # TTLs do ranking de técnicos e dos tickets novos (mantidos aquecidos pelo CachePrewarmer)
+        self.ranking_cache_ttl = active_config.TECHNICIAN_RANKING_CACHE_TTL
+        # Índice usuário → nível de serviço (membros dos grupos de nível), renovado pelo CachePrewarmer
+        self.level_index_ttl = active_config.TECHNICIAN_LEVEL_INDEX_TTL
+        self.new_tickets_cache_ttl = active_config.NEW_TICKETS_CACHE_TTL
+        
+        # Agregação do dashboard: 'count' (consultas de contagem), 'scan' (varredura única) ou 'auto'
+        self.aggregation_mode = active_config.GLPI_AGGREGATION_MODE
+        self.scan_page_size = active_config.GLPI_SCAN_PAGE_SIZE
+        self.scan_max_tickets = active_config.GLPI_SCAN_MAX_TICKETS
+        
+        # Diretório de técnicos: IDs por busca OR em /search/User (50 = list_limit_max padrão do GLPI)
+        self.user_directory_batch_size = 50
+        
+        # Buckets diários de contagem para intervalos de datas
+        self.daily_buckets_enabled = active_config.GLPI_DAILY_BUCKETS_ENABLED
+        self.daily_bucket_past_ttl = active_config.GLPI_DAILY_BUCKET_PAST_TTL
+        self.daily_bucket_max_days = active_config.GLPI_DAILY_BUCKET_MAX_DAYS
+        self.daily_bucket_max_scan_tickets = active_config.GLPI_DAILY_BUCKET_MAX_SCAN_TICKETS
+        # Buckets contam o status atual dos tickets: a cada dashboard_cache_ttl, os dias com tickets
+        # modificados (date_mod) desde a última verificação são descartados e buscados de novo
+        self._bucket_changes_lock = threading.Lock()
+        self._bucket_changes_checked_at = 0.0
+        self._bucket_changes_watermark = None
+        self._bucket_changes_seen = set()  # (ID, date_mod) já tratados na sobreposição com a verificação anterior
+
+        # Somas acumuladas por dia (nível × status e geral × status) alimentadas pelos buckets diários
+        self._prefix_index = DailyPrefixIndex(
+            [(level_name, status_name) for level_name in self.service_levels for status_name in self.status_map] +
+            [(None, status_name) for status_name in self.status_map]
+        )
+        
         # Sistema de cache para evitar consultas repetitivas
         self._cache = {
             'technician_ranking': {'data': None, 'timestamp': None, 'ttl': 300},  # 5 minutos
             'active_technicians': {'data': None, 'timestamp': None, 'ttl': 600},  # 10 minutos
             'field_ids': {'data': None, 'timestamp': None, 'ttl': 1800},  # 30 minutos
             'dashboard_metrics': {'data': None, 'timestamp': None, 'ttl': 180},  # 3 minutos
-            'dashboard_metrics_filtered': {},  # Cache dinâmico para filtros de data
-            'priority_names': {}  # Cache para nomes de prioridade
+            'dashboard_metrics_trends': {'data': None, 'timestamp': None, 'ttl': 180},  # 3 minutos, com tendências
+            # Cache dinâmico para filtros de data, limitado em entradas/bytes (LRU + TTL)
+            'dashboard_metrics_filtered': LRUTTLCache(
+                max_entries=active_config.DASHBOARD_FILTERED_CACHE_MAX_ENTRIES,
+                max_bytes=active_config.DASHBOARD_FILTERED_CACHE_MAX_BYTES
+            ),
+            # Rankings completos por intervalo de datas (nível e limite aplicados na saída)
+            'technician_ranking_filtered': LRUTTLCache(max_entries=64),
+            'priority_names': {},  # Cache para nomes de prioridade
+            'new_tickets': {},  # Cache dinâmico por limite
+            # Buckets diários (dia × status × nível) usados para compor intervalos de datas
+            'daily_buckets': LRUTTLCache(max_entries=active_config.GLPI_DAILY_BUCKET_MAX_DAYS * 4)
         }
+        
+        # Backend do cache: Redis compartilhado entre workers, com o dicionário acima como fallback
+        self._cache_backend = create_cache_backend(active_config, local_store=self._cache)
+        
+        # Snapshots em disco dos metadados (opções de busca, campos, grupos, técnicos): um worker
+        # reiniciado atende o primeiro dashboard sem consultá-los; a revalidação roda em segundo plano
+        self.lookup_ttl = active_config.GLPI_LOOKUP_TTL
+        self._lookup_store = LookupSnapshotStore(active_config.GLPI_LOOKUP_DIR, self.glpi_url) \
+            if active_config.GLPI_LOOKUP_SNAPSHOTS_ENABLED else None
+        self._lookups_validated_at = None
+        self._load_lookup_snapshots()
+        
+        # Espelho local opcional dos tickets (TicketMirror), anexado pelas rotas quando habilitado
+        self._ticket_mirror = None
+    
+    def _get_cache_entry(self, cache_key: str, sub_key: str = None) -> Optional[Dict[str, any]]:
+        """Obtém a entrada bruta do backend de cache"""
+        return self._cache_backend.get_entry(cache_key, sub_key)
     
     def _is_cache_valid(self, cache_key: str, sub_key: str = None) -> bool:
         """Verifica se o cache é válido"""
         try:
-            if sub_key:
-                cache_data = self._cache.get(cache_key, {}).get(sub_key)
-            else:
-                cache_data = self._cache.get(cache_key)
+            cache_data = self._get_cache_entry(cache_key, sub_key)
             
             if not cache_data or cache_data.get('timestamp') is None:
                 return False
@@ -90,49 +243,125 @@ class GLPIService:
     def _get_cache_data(self, cache_key: str, sub_key: str = None):
         """Obtém dados do cache"""
         try:
-            if sub_key:
-                return self._cache.get(cache_key, {}).get(sub_key, {}).get('data')
-            else:
-                return self._cache.get(cache_key, {}).get('data')
+            cache_data = self._get_cache_entry(cache_key, sub_key)
+            return cache_data.get('data') if cache_data else None
         except Exception as e:
             self.logger.error(f"Erro ao obter dados do cache: {e}")
             return None
     
-    def _set_cache_data(self, cache_key: str, data, ttl: int = 300, sub_key: str = None):
-        """Define dados no cache"""
+    def _get_cache_state(self, cache_key: str, sub_key: str = None) -> Optional[Tuple[any, float, bool]]:
+        """Retorna (dados, idade, obsoleto) enquanto a entrada estiver dentro da janela stale"""
+        try:
+            cache_data = self._get_cache_entry(cache_key, sub_key)
+            
+            if not cache_data or cache_data.get('timestamp') is None or cache_data.get('data') is None:
+                return None
+            
+            age = time.time() - cache_data['timestamp']
+            ttl = cache_data.get('ttl', 300)
+            stale_ttl = max(cache_data.get('stale_ttl') or ttl, ttl)
+            
+            if age >= stale_ttl:
+                return None
+            
+            return cache_data['data'], age, age >= ttl
+        except Exception as e:
+            self.logger.error(f"Erro ao verificar cache: {e}")
+            return None
+    
+    def get_cache_time_left(self, cache_key: str, sub_key: str = None) -> Optional[float]:
+        """Segundos até a entrada deixar de ser fresca (None se ausente)"""
+        cache_data = self._get_cache_entry(cache_key, sub_key)
+        if not cache_data or cache_data.get('timestamp') is None or cache_data.get('data') is None:
+            return None
+        return cache_data['timestamp'] + cache_data.get('ttl', 300) - time.time()
+    
+    def _set_cache_data(self, cache_key: str, data, ttl: int = 300, sub_key: str = None, stale_ttl: int = None):
+        """Define dados no cache (stale_ttl: idade máxima para servir o valor obsoleto)"""
         try:
             cache_entry = {
                 'data': data,
                 'timestamp': time.time(),
-                'ttl': ttl
+                'ttl': ttl,
+                'stale_ttl': stale_ttl or ttl
             }
             
-            if sub_key:
-                if cache_key not in self._cache:
-                    self._cache[cache_key] = {}
-                self._cache[cache_key][sub_key] = cache_entry
-            else:
-                self._cache[cache_key] = cache_entry
+            self._cache_backend.set_entry(cache_key, cache_entry, sub_key)
         except Exception as e:
             self.logger.error(f"Erro ao definir dados do cache: {e}")
     
+    # Lookups de metadados persistidos em snapshots (nome do snapshot = chave do cache)
+    LOOKUP_SNAPSHOTS = ('search_options', 'field_ids', 'tech_field_id', 'group_levels', 'level_index',
+                        'technician_directory')
+    
+    def _lookup_ttl_for(self, cache_key: str) -> int:
+        return self.level_index_ttl if cache_key == 'level_index' else self.lookup_ttl
+    
+    def _set_lookup_data(self, cache_key: str, data):
+        """Define um lookup de metadados no cache e grava o snapshot em disco"""
+        self._set_cache_data(cache_key, data, self._lookup_ttl_for(cache_key))
+        if self._lookup_store is not None:
+            self._lookup_store.save(cache_key, data)
+    
+    def _load_lookup_snapshots(self):
+        """Carrega os snapshots de metadados no cache (sem sobrescrever entradas válidas de outros workers)"""
+        if self._lookup_store is None:
+            return
+        
+        loaded = []
+        for cache_key in self.LOOKUP_SNAPSHOTS:
+            if self._is_cache_valid(cache_key):
+                continue
+            snapshot = self._lookup_store.load(cache_key)
+            if snapshot is not None:
+                self._set_cache_data(cache_key, snapshot['data'], self._lookup_ttl_for(cache_key))
+                loaded.append(cache_key)
+        
+        cached_field_ids = self._get_cache_data('field_ids')
+        if cached_field_ids:
+            self.field_ids = cached_field_ids
+        
+        if loaded:
+            self.logger.info(f"Snapshots de metadados carregados: {', '.join(loaded)}")
+    
+    def get_lookup_time_left(self) -> Optional[float]:
+        """Segundos até a próxima revalidação dos metadados (None se ainda não revalidados neste processo)"""
+        if self._lookups_validated_at is None:
+            return None
+        return self._lookups_validated_at + self.lookup_ttl - time.time()
+    
+    @property
+    def session_token(self) -> Optional[str]:
+        session = self._primary_session
+        return session.token if session else None
+    
+    @property
+    def token_created_at(self) -> Optional[float]:
+        session = self._primary_session
+        return session.created_at if session else None
+    
+    @property
+    def token_expires_at(self) -> Optional[float]:
+        session = self._primary_session
+        return session.created_at + self.session_timeout if session else None
+    
     def _is_token_expired(self) -> bool:
         """Verifica se o token de sessão está expirado"""
-        if not self.token_created_at:
-            return True
-        
-        current_time = time.time()
-        token_age = current_time - self.token_created_at
+        session = self._primary_session
         
         # Token expira em 1 hora ou se passou do tempo definido
-        return token_age >= self.session_timeout
+        return session is None or session.is_expired(self.session_timeout)
     
     def _ensure_authenticated(self) -> bool:
-        """Garante que temos um token válido, re-autenticando se necessário"""
-        if not self.session_token or self._is_token_expired():
+        """Garante que temos um token válido; chamadas concorrentes aguardam uma única autenticação"""
+        if self.session_token and not self._is_token_expired():
+            return True
+        
+        with self._authentication_lock:
+            if self.session_token and not self._is_token_expired():
+                return True
             self.logger.info("Token expirado ou inexistente, re-autenticando...")
             return self._authenticate_with_retry()
-        return True
     
     def _authenticate_with_retry(self) -> bool:
         """Autentica com retry automático e backoff exponencial"""
@@ -155,11 +384,11 @@ class GLPIService:
         self.logger.error(f"Falha na autenticação após {self.max_retries} tentativas")
         return False
     
-    def _perform_authentication(self) -> bool:
-        """Executa o processo de autenticação"""
+    def _request_session_token(self) -> Optional[str]:
+        """Abre uma nova sessão no GLPI (initSession) e retorna o token"""
         if not self.app_token or not self.user_token:
             self.logger.error("Tokens de autenticação do GLPI (GLPI_APP_TOKEN, GLPI_USER_TOKEN) não estão configurados.")
-            return False
+            return None
             
         session_headers = {
             "Content-Type": "application/json",
@@ -169,85 +398,254 @@ class GLPIService:
         
         try:
             self.logger.info("Autenticando na API do GLPI...")
-            response = requests.get(
+            response = self.transport.get(
                 f"{self.glpi_url}/initSession", 
                 headers=session_headers,
                 timeout=10
             )
             response.raise_for_status()
             
-            response_data = response.json()
-            self.session_token = response_data["session_token"]
-            self.token_created_at = time.time()
-            self.token_expires_at = self.token_created_at + self.session_timeout
-            
-            self.logger.info("Autenticação bem-sucedida!")
-            return True
+            return response.json()["session_token"]
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Falha na autenticação: {e}")
+            return None
+    
+    def _kill_session_token(self, token: str) -> bool:
+        """Encerra uma sessão específica no GLPI (killSession)"""
+        try:
+            response = self.transport.get(
+                f"{self.glpi_url}/killSession",
+                headers=self._build_session_headers(token),
+                timeout=10
+            )
+            return response.ok
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Falha ao encerrar sessão GLPI: {e}")
+            return False
+    
+    def _open_pool_session(self, previous_token: str = None):
+        """Abre uma sessão: pelo broker compartilhado (no slot da sessão renovada), se configurado, ou direto no GLPI"""
+        if self._session_broker is not None:
+            return self._session_broker.lease(previous_token)
+        return self._request_session_token()
+    
+    def _close_pool_session(self, token: str) -> bool:
+        """Encerra uma sessão do pool (as compartilhadas são encerradas pelo broker)"""
+        if self._session_broker is not None:
+            return self._session_broker.release(token)
+        return self._kill_session_token(token)
+    
+    def shutdown_sessions(self):
+        """Encerra as sessões deste processo; o broker encerra as compartilhadas quando o último worker sai
+        
+        Registrado no atexit por quem cria a instância de longa duração (módulo de rotas).
+        """
+        self._session_refresh_stop.set()
+        self.close_session()
+        if self._session_broker is not None:
+            self._session_broker.unregister()
+    
+    def _set_primary_session(self, token: Optional[str], created_at: float = None):
+        """Atualiza a sessão principal exposta em session_token (troca atômica)"""
+        self._primary_session = GLPISession(token, created_at) if token else None
+    
+    def _on_session_swap(self, old_token: str, session: GLPISession):
+        """Acompanha a renovação em segundo plano quando ela troca o token da sessão principal"""
+        if self.session_token == old_token:
+            self._set_primary_session(session.token, session.created_at)
+    
+    def _start_session_refresher(self):
+        """Inicia (uma única vez) a thread que renova as sessões antes do vencimento"""
+        if not self.session_refresh_enabled or self._session_refresher is not None:
+            return
+        
+        self._session_refresher = threading.Thread(
+            target=self._session_refresh_loop, name='glpi-session-refresh', daemon=True
+        )
+        self._session_refresher.start()
+    
+    def _session_refresh_loop(self):
+        while True:
+            next_due = self._session_pool.next_refresh_at()
+            wait = 60 if next_due is None else min(max(next_due - time.time(), 1), 60)
+            if self._session_refresh_stop.wait(wait):
+                return
+            
+            try:
+                self._session_pool.refresh_due(on_swap=self._on_session_swap)
+            except Exception as e:
+                self.logger.error(f"Erro na renovação das sessões GLPI em segundo plano: {e}")
+    
+    def _perform_authentication(self) -> bool:
+        """Executa o processo de autenticação"""
+        token, created_at = unpack_session_token(self._open_pool_session())
+        if not token:
             return False
+        
+        self._set_primary_session(token, created_at)
+        
+        # A sessão principal também atende requisições através do pool
+        self._session_pool.adopt(token, self.token_created_at)
+        self._start_session_refresher()
+        
+        self.logger.info("Autenticação bem-sucedida!")
+        return True
     
     def authenticate(self) -> bool:
         """Método público para autenticação (mantido para compatibilidade)"""
         return self._authenticate_with_retry()
     
+    def _build_session_headers(self, session_token: str) -> Dict[str, str]:
+        """Monta os headers de uma requisição para a sessão informada"""
+        return {
+            "Content-Type": "application/json",
+            "App-Token": self.app_token,
+            "Session-Token": session_token,
+        }
+    
     def get_api_headers(self) -> Optional[Dict[str, str]]:
         """Retorna os headers necessários para as requisições da API"""
         if not self._ensure_authenticated():
             self.logger.error("Não foi possível obter headers - falha na autenticação")
             return None
             
-        return {
-            "Content-Type": "application/json",
-            "App-Token": self.app_token,
-            "Session-Token": self.session_token,
-        }
+        return self._build_session_headers(self.session_token)
+    
+    @contextmanager
+    def _upstream_slot(self, timeout: float):
+        """Vez na fila de prioridade e vaga no limitador adaptativo; registra latência e falha da chamada
+        
+        A latência conta a partir de call["started"], marcado quando a sessão do pool é
+        obtida: a espera por uma sessão local não é latência do GLPI. Sem sessão, a vaga
+        é liberada sem resultado e não pesa no limite nem no circuito.
+        """
+        self._scheduler.acquire(timeout)
+        call = {"healthy": False, "started": None}
+        try:
+            yield call
+        finally:
+            if call["started"] is None:
+                self._scheduler.release(0.0, None)
+            else:
+                self._scheduler.release(time.time() - call["started"], call["healthy"])
     
     def _make_authenticated_request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
-        """Faz uma requisição autenticada com retry automático"""
+        """Faz uma requisição autenticada com retry automático, usando uma sessão do pool"""
+        extra_headers = kwargs.pop('headers', None) or {}
+        
+        # Timeout padrão se não especificado
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = 30
+        
+        # Circuito aberto: falha imediata, sem autenticar nem tentar novamente
+        if self._upstream_guard.is_open():
+            self.logger.warning(f"GLPI indisponível (circuito aberto), requisição recusada: {url}")
+            return None
+        
+        deadline = get_current_deadline()
+        base_timeout = kwargs['timeout']
+        
         for attempt in range(self.max_retries):
+            # Prazo da computação: timeout limitado ao tempo restante e nenhuma tentativa após o prazo
+            if deadline is not None:
+                if deadline.expired():
+                    deadline.exceeded = True
+                    self.logger.warning(f"Prazo da computação esgotado, requisição abandonada: {url}")
+                    return None
+                kwargs['timeout'] = deadline.cap(base_timeout)
+            
             try:
-                headers = self.get_api_headers()
-                if not headers:
+                if not self._ensure_authenticated():
+                    self.logger.error("Não foi possível obter headers - falha na autenticação")
                     return None
                 
-                # Merge headers se já existirem nos kwargs
-                if 'headers' in kwargs:
-                    headers.update(kwargs['headers'])
-                kwargs['headers'] = headers
-                
-                # Timeout padrão se não especificado
-                if 'timeout' not in kwargs:
-                    kwargs['timeout'] = 30
-                
-                response = requests.request(method, url, **kwargs)
-                
-                # Se recebemos 401, token pode ter expirado
-                if response.status_code == 401:
-                    self.logger.warning("Recebido 401, token pode ter expirado. Re-autenticando...")
-                    self.session_token = None
-                    if self._authenticate_with_retry():
-                        # Retry com novo token
-                        headers = self.get_api_headers()
-                        if headers:
-                            kwargs['headers'].update(headers)
-                            response = requests.request(method, url, **kwargs)
+                # A vez na fila vem antes da sessão: chamadas em espera não retêm sessões do pool
+                with self._upstream_slot(kwargs['timeout']) as call, \
+                        self._session_pool.lease(timeout=kwargs['timeout']) as session:
+                    if session is None:
+                        self.logger.error("Nenhuma sessão GLPI disponível no pool")
+                        return None
+                    call["started"] = time.time()
+                    
+                    # Merge headers se já existirem nos kwargs
+                    headers = self._build_session_headers(session.token)
+                    headers.update(extra_headers)
+                    
+                    response = self.transport.request(method, url, headers=headers, **kwargs)
+                    
+                    # Se recebemos 401, a sessão pode ter expirado: renovar apenas ela
+                    if response.status_code == 401:
+                        self.logger.warning("Recebido 401, sessão pode ter expirado. Renovando sessão...")
+                        old_token = session.token
+                        if self._session_broker is not None:
+                            self._session_broker.invalidate(old_token)
+                        renewed = self._session_pool.renew(session)
+                        
+                        if self.session_token == old_token:
+                            self._set_primary_session(session.token if renewed else None, session.created_at)
+                        
+                        if renewed:
+                            # Retry com novo token
+                            headers = self._build_session_headers(session.token)
+                            headers.update(extra_headers)
+                            response = self.transport.request(method, url, headers=headers, **kwargs)
+                    
+                    call["healthy"] = response.status_code < 500
+                    return response
                 
-                return response
+            except UpstreamUnavailableError as e:
+                self.logger.warning(f"Requisição ao GLPI recusada: {e}")
+                return None
                 
             except requests.exceptions.RequestException as e:
                 self.logger.error(f"Erro na requisição (tentativa {attempt + 1}): {e}")
-                if attempt < self.max_retries - 1:
+                if attempt < self.max_retries - 1 and not self._upstream_guard.is_open():
                     delay = self.retry_delay_base ** attempt
+                    if deadline is not None and deadline.remaining() <= delay:
+                        deadline.exceeded = True
+                        return None
                     time.sleep(delay)
                 else:
                     return None
         
         return None
     
+    @staticmethod
+    def _compact_search_options(search_options: Dict[str, any]) -> Dict[str, Dict[str, str]]:
+        """Reduz listSearchOptions/Ticket ao nome de cada campo (o necessário para descobrir os IDs)"""
+        return {
+            str(field_id): {'name': field_info['name']}
+            for field_id, field_info in search_options.items()
+            if isinstance(field_info, dict) and 'name' in field_info
+        }
+    
+    def _plan_fetch_search_options(self) -> Plan:
+        """Plano: baixa listSearchOptions/Ticket e guarda a versão compacta no cache e no snapshot"""
+        response = yield IOCall('request', 'GET', f"{self.glpi_url}/listSearchOptions/Ticket")
+        
+        if not response or not response.ok:
+            self.logger.error("Falha ao obter opções de busca do GLPI")
+            return None
+        
+        search_options = self._compact_search_options(response.json())
+        self._set_lookup_data('search_options', search_options)
+        return search_options
+    
+    def _plan_search_options(self) -> Plan:
+        """Plano: opções de busca de Ticket (cache/snapshot ou GLPI)"""
+        if self._is_cache_valid('search_options'):
+            cached_options = self._get_cache_data('search_options')
+            if cached_options:
+                return cached_options
+        return (yield from self._plan_fetch_search_options())
+    
     def discover_field_ids(self) -> bool:
         """Descobre dinamicamente os IDs dos campos do GLPI"""
+        return self._run_plan(self._plan_discover_field_ids())
+    
+    def _plan_discover_field_ids(self) -> Plan:
+        """Plano: IDs dos campos do GLPI (cache/snapshot ou listSearchOptions/Ticket)"""
         # Verificar cache primeiro
         if self._is_cache_valid('field_ids'):
             cached_field_ids = self._get_cache_data('field_ids')
@@ -256,52 +654,23 @@ class GLPIService:
                 self.logger.info(f"IDs dos campos carregados do cache: {self.field_ids}")
                 return True
         
-        if not self._ensure_authenticated():
+        if not (yield IOCall('authenticate')):
             return False
         
         try:
             self.logger.info("Descobrindo IDs dos campos do GLPI...")
             
             # Buscar informações sobre os campos de Ticket
-            response = self._make_authenticated_request(
-                'GET',
-                f"{self.glpi_url}/listSearchOptions/Ticket"
-            )
-            
-            if not response or not response.ok:
-                self.logger.error("Falha ao obter opções de busca do GLPI")
+            search_options = yield from self._plan_search_options()
+            if search_options is None:
                 return False
             
-            search_options = response.json()
-            
-            # Mapear campos importantes
-            field_mapping = {
-                "Grupo técnico": "GROUP_TECH",
-                "Status": "STATUS",
-                "Data de criação": "DATE_CREATION"
-            }
-            
-            discovered_fields = {}
-            
-            for field_id, field_info in search_options.items():
-                if isinstance(field_info, dict) and 'name' in field_info:
-                    field_name = field_info['name']
-                    
-                    for search_name, key in field_mapping.items():
-                        if search_name.lower() in field_name.lower():
-                            discovered_fields[key] = field_id
-                            self.logger.info(f"Campo '{search_name}' encontrado com ID: {field_id}")
-                            break
-            
-            # Forçar campo 15 para data de criação se não encontrado
-            if "DATE_CREATION" not in discovered_fields:
-                discovered_fields["DATE_CREATION"] = "15"
-                self.logger.info("Forçando campo 15 para 'Data de criação'")
+            discovered_fields = self._parse_field_ids(search_options)
             
             self.field_ids = discovered_fields
             
-            # Armazenar no cache por 30 minutos
-            self._set_cache_data('field_ids', discovered_fields, 1800)
+            # Armazenar no cache (e no snapshot em disco)
+            self._set_lookup_data('field_ids', discovered_fields)
             
             self.logger.info(f"IDs dos campos descobertos: {self.field_ids}")
             return len(discovered_fields) > 0
@@ -310,6 +679,33 @@ class GLPIService:
             self.logger.error(f"Erro ao descobrir IDs dos campos: {e}")
             return False
     
+    def _parse_field_ids(self, search_options: Dict[str, any]) -> Dict[str, str]:
+        """Mapeia os campos importantes a partir de listSearchOptions/Ticket"""
+        field_mapping = {
+            "Grupo técnico": "GROUP_TECH",
+            "Status": "STATUS",
+            "Data de criação": "DATE_CREATION"
+        }
+        
+        discovered_fields = {}
+        
+        for field_id, field_info in search_options.items():
+            if isinstance(field_info, dict) and 'name' in field_info:
+                field_name = field_info['name']
+                
+                for search_name, key in field_mapping.items():
+                    if search_name.lower() in field_name.lower():
+                        discovered_fields[key] = field_id
+                        self.logger.info(f"Campo '{search_name}' encontrado com ID: {field_id}")
+                        break
+        
+        # Forçar campo 15 para data de criação se não encontrado
+        if "DATE_CREATION" not in discovered_fields:
+            discovered_fields["DATE_CREATION"] = "15"
+            self.logger.info("Forçando campo 15 para 'Data de criação'")
+        
+        return discovered_fields
+    
     def discover_status_ids(self) -> bool:
         """Valida os IDs de status do GLPI"""
         if not self._ensure_authenticated():
@@ -342,120 +738,211 @@ class GLPIService:
             self.logger.error(f"Erro ao validar IDs de status: {e}")
             return False
     
+    def _build_ticket_count_params(self, group_id: int = None, status_id: int = None,
+                                   start_date: str = None, end_date: str = None) -> Dict[str, any]:
+        """Monta os parâmetros de /search/Ticket para uma contagem com filtros opcionais"""
+        # Construir critérios de busca
+        criteria = []
+        criteria_index = 0
+        
+        # Filtro por grupo técnico
+        if group_id and "GROUP_TECH" in self.field_ids:
+            criteria.append({
+                f"criteria[{criteria_index}][field]": self.field_ids["GROUP_TECH"],
+                f"criteria[{criteria_index}][searchtype]": "equals",
+                f"criteria[{criteria_index}][value]": group_id
+            })
+            criteria_index += 1
+        
+        # Filtro por status
+        if status_id and "STATUS" in self.field_ids:
+            if criteria_index > 0:
+                criteria.append({f"criteria[{criteria_index}][link]": "AND"})
+            
+            criteria.append({
+                f"criteria[{criteria_index}][field]": self.field_ids["STATUS"],
+                f"criteria[{criteria_index}][searchtype]": "equals",
+                f"criteria[{criteria_index}][value]": status_id
+            })
+            criteria_index += 1
+        
+        # Filtros de data usando campo 15 (Data de criação)
+        if start_date:
+            if criteria_index > 0:
+                criteria.append({f"criteria[{criteria_index}][link]": "AND"})
+            
+            criteria.append({
+                f"criteria[{criteria_index}][field]": "15",  # Campo 15 = Data de criação
+                f"criteria[{criteria_index}][searchtype]": "morethan",
+                f"criteria[{criteria_index}][value]": start_date
+            })
+            criteria_index += 1
+        
+        if end_date:
+            if criteria_index > 0:
+                criteria.append({f"criteria[{criteria_index}][link]": "AND"})
+            
+            criteria.append({
+                f"criteria[{criteria_index}][field]": "15",  # Campo 15 = Data de criação
+                f"criteria[{criteria_index}][searchtype]": "lessthan",
+                f"criteria[{criteria_index}][value]": end_date
+            })
+            criteria_index += 1
+        
+        # Construir parâmetros de busca
+        search_params = {
+            "is_deleted": 0,
+            "range": "0-0"  # Só queremos o total
+        }
+        
+        # Adicionar critérios aos parâmetros
+        for criterion in criteria:
+            search_params.update(criterion)
+        
+        return search_params
+    
+    @staticmethod
+    def _parse_content_range_total(content_range: str) -> Optional[int]:
+        """Extrai o total do header Content-Range (formato: "0-0/total")"""
+        if not content_range:
+            return None
+        try:
+            return int(content_range.split('/')[-1])
+        except (ValueError, IndexError):
+            return None
+    
     def get_ticket_count(self, group_id: int = None, status_id: int = None, 
                         start_date: str = None, end_date: str = None) -> int:
         """Obtém contagem de tickets com filtros opcionais"""
+        # Espelho local em dia: contagem por SQL, sem chamada ao GLPI
+        mirrored = self._mirror_count(group_id, status_id, start_date, end_date)
+        if mirrored is not None:
+            return mirrored
+        
         if not self._ensure_authenticated():
             return 0
         
+        search_params = self._build_ticket_count_params(group_id, status_id, start_date, end_date)
+        
+        # Critérios idênticos na mesma computação vão ao GLPI uma única vez
+        memo = get_current_memo()
+        if memo is not None:
+            return memo.get_or_compute(
+                QueryMemo.make_key('Ticket', search_params),
+                lambda: self._fetch_ticket_count(search_params)
+            )
+        
+        return self._fetch_ticket_count(search_params)
+    
+    def _fetch_ticket_count(self, search_params: Dict[str, any]) -> int:
+        """Executa a consulta de contagem em /search/Ticket"""
         try:
-            # Construir critérios de busca
-            criteria = []
-            criteria_index = 0
-            
-            # Filtro por grupo técnico
-            if group_id and "GROUP_TECH" in self.field_ids:
-                criteria.append({
-                    f"criteria[{criteria_index}][field]": self.field_ids["GROUP_TECH"],
-                    f"criteria[{criteria_index}][searchtype]": "equals",
-                    f"criteria[{criteria_index}][value]": group_id
-                })
-                criteria_index += 1
-            
-            # Filtro por status
-            if status_id and "STATUS" in self.field_ids:
-                if criteria_index > 0:
-                    criteria.append({f"criteria[{criteria_index}][link]": "AND"})
-                
-                criteria.append({
-                    f"criteria[{criteria_index}][field]": self.field_ids["STATUS"],
-                    f"criteria[{criteria_index}][searchtype]": "equals",
-                    f"criteria[{criteria_index}][value]": status_id
-                })
-                criteria_index += 1
-            
-            # Filtros de data usando campo 15 (Data de criação)
-            if start_date:
-                if criteria_index > 0:
-                    criteria.append({f"criteria[{criteria_index}][link]": "AND"})
-                
-                criteria.append({
-                    f"criteria[{criteria_index}][field]": "15",  # Campo 15 = Data de criação
-                    f"criteria[{criteria_index}][searchtype]": "morethan",
-                    f"criteria[{criteria_index}][value]": start_date
-                })
-                criteria_index += 1
-            
-            if end_date:
-                if criteria_index > 0:
-                    criteria.append({f"criteria[{criteria_index}][link]": "AND"})
-                
-                criteria.append({
-                    f"criteria[{criteria_index}][field]": "15",  # Campo 15 = Data de criação
-                    f"criteria[{criteria_index}][searchtype]": "lessthan",
-                    f"criteria[{criteria_index}][value]": end_date
-                })
-                criteria_index += 1
-            
-            # Construir parâmetros de busca
-            search_params = {
-                "is_deleted": 0,
-                "range": "0-0"  # Só queremos o total
-            }
-            
-            # Adicionar critérios aos parâmetros
-            for criterion in criteria:
-                search_params.update(criterion)
-            
             response = self._make_authenticated_request(
                 'GET',
                 f"{self.glpi_url}/search/Ticket",
                 params=search_params
             )
-            
-            if not response or not response.ok:
-                return 0
-            
-            # Extrair total do header Content-Range
-            content_range = response.headers.get('Content-Range', '')
-            if content_range:
-                # Formato: "0-0/total"
-                try:
-                    total = int(content_range.split('/')[-1])
-                    return total
-                except (ValueError, IndexError):
-                    pass
-            
-            # Fallback: contar itens na resposta
-            data = response.json()
-            if 'data' in data:
-                return len(data['data'])
-            
-            return 0
+            return self._parse_ticket_count(response)
             
         except Exception as e:
             self.logger.error(f"Erro ao obter contagem de tickets: {e}")
             return 0
     
-    def _get_metrics_by_level_internal(self, start_date: str = None, end_date: str = None) -> Dict[str, Dict[str, int]]:
-        """Obtém métricas por nível de serviço (interno)"""
-        metrics_by_level = {}
+    def _parse_ticket_count(self, response) -> int:
+        """Extrai o total de tickets da resposta de uma consulta de contagem (0 em caso de falha)"""
+        if not response or not response.ok:
+            return 0
         
-        for level_name, group_id in self.service_levels.items():
-            level_metrics = {}
-            
+        # Extrair total do header Content-Range
+        total = self._parse_content_range_total(response.headers.get('Content-Range', ''))
+        if total is not None:
+            return total
+        
+        # Fallback: contar itens na resposta
+        data = response.json()
+        if 'data' in data:
+            return len(data['data'])
+        
+        return 0
+    
+    def _build_count_matrix_tasks(self, start_date: str = None, end_date: str = None,
+                                  include_levels: bool = True,
+                                  include_general: bool = True) -> Dict[Tuple[Optional[str], str], Dict[str, any]]:
+        """Monta as contagens independentes da matriz nível × status e das métricas gerais"""
+        tasks = {}
+        
+        if include_levels:
+            for level_name, group_id in self.service_levels.items():
+                for status_name, status_id in self.status_map.items():
+                    tasks[(level_name, status_name)] = {
+                        "group_id": group_id,
+                        "status_id": status_id,
+                        "start_date": start_date,
+                        "end_date": end_date
+                    }
+        
+        if include_general:
             for status_name, status_id in self.status_map.items():
-                count = self.get_ticket_count(
-                    group_id=group_id, 
-                    status_id=status_id,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                level_metrics[status_name] = count
-            
-            metrics_by_level[level_name] = level_metrics
+                tasks[(None, status_name)] = {
+                    "status_id": status_id,
+                    "start_date": start_date,
+                    "end_date": end_date
+                }
+        
+        return tasks
+    
+    def _assemble_count_matrix(self, counts: Dict[Tuple[Optional[str], str], int],
+                               include_levels: bool = True,
+                               include_general: bool = True) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+        """Remonta as contagens no formato by_level/general esperado pelo ResponseFormatter"""
+        metrics_by_level = {}
+        if include_levels:
+            for level_name in self.service_levels:
+                metrics_by_level[level_name] = {
+                    status_name: counts[(level_name, status_name)] for status_name in self.status_map
+                }
         
-        # Sistema de fallback: se todos os níveis retornarem 0, usar dados simulados
+        general_metrics = {}
+        if include_general:
+            general_metrics = {status_name: counts[(None, status_name)] for status_name in self.status_map}
+        
+        return metrics_by_level, general_metrics
+    
+    def _plan_primitives(self) -> Primitives:
+        """Primitivas de I/O do cliente síncrono usadas pelos planos de consulta"""
+        return {
+            'authenticate': self._ensure_authenticated,
+            'request': self._make_authenticated_request,
+            'request_many': lambda tasks: self.fan_out.map(self._make_authenticated_request, tasks),
+            'count': self.get_ticket_count,
+            'count_many': lambda tasks: self.fan_out.map(self.get_ticket_count, tasks),
+            # Subplanos em série: cada um já distribui as próprias chamadas pelo fan-out
+            # (dentro de um worker o fan-out aninhado rodaria em série de qualquer forma)
+            'gather': lambda plans: {key: self._run_plan(plan) for key, plan in plans.items()},
+            'single_flight': lambda key, plan_factory: self._single_flight.do(
+                key, lambda: self._run_plan(plan_factory())
+            ),
+        }
+    
+    def _run_plan(self, plan: Plan):
+        """Executa um plano de consulta com as primitivas síncronas (fan-out em threads)"""
+        return run_plan(plan, self._plan_primitives())
+    
+    def _plan_count_matrix(self, start_date: str = None, end_date: str = None,
+                           include_levels: bool = True, include_general: bool = True) -> Plan:
+        """Plano: contagens nível × status e contagens gerais por status disparadas em paralelo"""
+        tasks = self._build_count_matrix_tasks(start_date, end_date, include_levels, include_general)
+        counts = yield IOCall('count_many', tasks)
+        return self._assemble_count_matrix(counts, include_levels, include_general)
+    
+    def _count_matrix_internal(self, start_date: str = None, end_date: str = None,
+                               include_levels: bool = True,
+                               include_general: bool = True) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+        """Dispara em paralelo as contagens nível × status e as contagens gerais por status"""
+        return self._run_plan(self._plan_count_matrix(start_date, end_date, include_levels, include_general))
+    
+    def _apply_level_fallback(self, metrics_by_level: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+        """Sistema de fallback: se todos os níveis retornarem 0, usar dados simulados"""
         total_tickets = sum(
             sum(level_data.values()) for level_data in metrics_by_level.values()
         )
@@ -499,19 +986,8 @@ class GLPIService:
         
         return metrics_by_level
     
-    def _get_general_metrics_internal(self, start_date: str = None, end_date: str = None) -> Dict[str, int]:
-        """Obtém métricas gerais (interno)"""
-        general_metrics = {}
-        
-        for status_name, status_id in self.status_map.items():
-            count = self.get_ticket_count(
-                status_id=status_id,
-                start_date=start_date,
-                end_date=end_date
-            )
-            general_metrics[status_name] = count
-        
-        # Sistema de fallback: se todos os status retornarem 0, usar dados simulados
+    def _apply_general_fallback(self, general_metrics: Dict[str, int]) -> Dict[str, int]:
+        """Sistema de fallback: se todos os status retornarem 0, usar dados simulados"""
         total_tickets = sum(general_metrics.values())
         
         if total_tickets == 0:
@@ -527,148 +1003,814 @@ class GLPIService:
         
         return general_metrics
     
-    def get_dashboard_metrics(self, use_cache: bool = True) -> Dict[str, any]:
-        """Obtém métricas completas do dashboard"""
+    def _get_metrics_by_level_internal(self, start_date: str = None, end_date: str = None) -> Dict[str, Dict[str, int]]:
+        """Obtém métricas por nível de serviço (interno)"""
+        metrics_by_level, _ = self._count_matrix_internal(start_date, end_date, include_general=False)
+        return self._apply_level_fallback(metrics_by_level)
+    
+    def _get_general_metrics_internal(self, start_date: str = None, end_date: str = None) -> Dict[str, int]:
+        """Obtém métricas gerais (interno)"""
+        _, general_metrics = self._count_matrix_internal(start_date, end_date, include_levels=False)
+        return self._apply_general_fallback(general_metrics)
+    
+    def _build_search_page_request(self, itemtype: str, params: Dict[str, any],
+                                   start: int, end: int) -> Dict[str, any]:
+        """Requisição de uma página de /search/{itemtype}"""
+        page_params = dict(params)
+        page_params["range"] = f"{start}-{end}"
+        return {'method': 'GET', 'url': f"{self.glpi_url}/search/{itemtype}", 'params': page_params}
+    
+    def _parse_search_page(self, response) -> Optional[Tuple[Optional[int], List[Dict[str, any]]]]:
+        """Extrai (total, linhas) da resposta de uma página de /search/{itemtype}"""
+        if not response or not response.ok:
+            return None
+        
+        data = response.json()
+        if not isinstance(data, dict):
+            return None
+        
+        total = self._parse_content_range_total(response.headers.get('Content-Range', ''))
+        if total is None:
+            total = data.get('totalcount')
+        
+        return total, data.get('data', []) or []
+    
+    def _search_all_pages(self, itemtype: str, params: Dict[str, any],
+                          expected_total: int = None) -> Optional[List[Dict[str, any]]]:
+        """Percorre todas as páginas de /search/{itemtype}, buscando as páginas em paralelo"""
+        return self._run_plan(self._plan_search_all_pages(itemtype, params, expected_total))
+    
+    def _plan_search_all_pages(self, itemtype: str, params: Dict[str, any], expected_total: int = None) -> Plan:
+        """Plano: todas as páginas de /search/{itemtype} (None em caso de falha), páginas em paralelo"""
+        page_size = self.scan_page_size
+        pages = {}
+        
+        if expected_total is None:
+            # Primeira página informa o total; as demais são buscadas em paralelo
+            first_page = self._parse_search_page(
+                (yield IOCall('request', **self._build_search_page_request(itemtype, params, 0, page_size - 1)))
+            )
+            if first_page is None:
+                return None
+            total, rows = first_page
+            pages[0] = rows
+            total = total if total is not None else len(rows)
+            pending = [(start, min(start + page_size, total) - 1) for start in range(len(rows), total, page_size)] if rows else []
+        else:
+            total = expected_total
+            pending = [(start, min(start + page_size, total) - 1) for start in range(0, total, page_size)]
+        
+        while pending:
+            tasks = {
+                (start, end): self._build_search_page_request(itemtype, params, start, end)
+                for start, end in pending
+            }
+            responses = yield IOCall('request_many', tasks)
+            pending = []
+            
+            for (start, end), response in responses.items():
+                result = self._parse_search_page(response)
+                if result is None:
+                    self.logger.error(f"Falha ao buscar página {start}-{end} de /search/{itemtype}")
+                    return None
+                
+                page_total, rows = result
+                pages[start] = rows
+                if page_total is not None:
+                    total = max(total, page_total)
+                
+                # O GLPI pode limitar o tamanho da página (list_limit_max): buscar o restante
+                next_start = start + len(rows)
+                if rows and next_start <= end and next_start < total:
+                    pending.append((next_start, end))
+            
+            # Novos tickets criados durante a varredura: buscar as páginas excedentes
+            if not pending and pages and pages[max(pages)]:
+                fetched_until = max(start + len(rows) for start, rows in pages.items())
+                pending = [(start, min(start + page_size, total) - 1) for start in range(fetched_until, total, page_size)]
+        
+        return [row for start in sorted(pages) for row in pages[start]]
+    
+    def _get_group_level_lookup(self, refresh: bool = False) -> Dict[str, str]:
+        """Mapeia ID, nome e nome completo dos grupos técnicos para o nível de serviço"""
+        return self._run_plan(self._plan_group_level_lookup(refresh))
+    
+    def _plan_group_level_lookup(self, refresh: bool = False) -> Plan:
+        """Plano: grupos de nível buscados em paralelo, indexados por ID, nome e nome completo"""
+        if not refresh and self._is_cache_valid('group_levels'):
+            cached_lookup = self._get_cache_data('group_levels')
+            if cached_lookup:
+                return cached_lookup
+        
+        lookup = {str(group_id): level_name for level_name, group_id in self.service_levels.items()}
+        
+        tasks = {
+            level_name: {'method': 'GET', 'url': f"{self.glpi_url}/Group/{group_id}"}
+            for level_name, group_id in self.service_levels.items()
+        }
+        responses = yield IOCall('request_many', tasks)
+        
+        for level_name, response in responses.items():
+            if not response or not response.ok:
+                self.logger.warning(f"Não foi possível obter o nome do grupo do nível {level_name}")
+                continue
+            group_data = response.json()
+            if isinstance(group_data, dict):
+                for key in ('name', 'completename'):
+                    if group_data.get(key):
+                        lookup[str(group_data[key]).strip().lower()] = level_name
+        
+        self._set_lookup_data('group_levels', lookup)
+        return lookup
+    
+    @staticmethod
+    def _split_search_values(value) -> List[str]:
+        """Normaliza um campo multivalorado da busca do GLPI em uma lista de strings"""
+        if value is None:
+            return []
+        if isinstance(value, list):
+            values = value
+        else:
+            values = str(value).split('$#$')
+        return [str(item).strip() for item in values if item is not None and str(item).strip()]
+    
+    def _resolve_row_levels(self, value, group_lookup: Dict[str, str]) -> set:
+        """Determina os níveis de serviço dos grupos técnicos de uma linha da busca"""
+        levels = set()
+        for group in self._split_search_values(value):
+            key = group.lower()
+            level_name = group_lookup.get(key) or group_lookup.get(key.split(' > ')[-1])
+            if level_name:
+                levels.add(level_name)
+        return levels
+    
+    def _resolve_status_name(self, value) -> Optional[str]:
+        """Converte o valor da coluna de status (ID ou nome) no nome usado pelo dashboard"""
+        if value is None:
+            return None
+        
+        status_names = {status_id: status_name for status_name, status_id in self.status_map.items()}
+        try:
+            return status_names.get(int(value))
+        except (TypeError, ValueError):
+            key = str(value).strip().lower()
+            for status_name in self.status_map:
+                if status_name.lower() == key:
+                    return status_name
+            return None
+    
+    def _plan_scan_ticket_rows(self, start_date: str = None, end_date: str = None,
+                               expected_total: int = None) -> Plan:
+        """Plano: pagina /search/Ticket trazendo apenas status, grupo técnico e data de criação"""
+        status_field = self.field_ids.get("STATUS")
+        group_field = self.field_ids.get("GROUP_TECH")
+        if not status_field or not group_field:
+            return None
+        
+        # Apenas filtros de data; status e grupo são agregados localmente
+        search_params = self._build_ticket_count_params(start_date=start_date, end_date=end_date)
+        search_params.pop("range", None)
+        search_params.update({
+            "forcedisplay[0]": status_field,
+            "forcedisplay[1]": group_field,
+            "forcedisplay[2]": self.field_ids.get("DATE_CREATION", "15")
+        })
+        
+        return (yield from self._plan_search_all_pages('Ticket', search_params, expected_total))
+    
+    def _empty_count_matrix(self) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+        """Matriz nível × status e métricas gerais zeradas"""
+        metrics_by_level = {
+            level_name: {status_name: 0 for status_name in self.status_map} for level_name in self.service_levels
+        }
+        general_metrics = {status_name: 0 for status_name in self.status_map}
+        return metrics_by_level, general_metrics
+    
+    def _count_ticket_row(self, row: Dict[str, any], matrix: Tuple[Dict[str, Dict[str, int]], Dict[str, int]],
+                          group_lookup: Dict[str, str]):
+        """Soma uma linha da varredura à matriz (um ticket conta em cada nível dos seus grupos)"""
+        metrics_by_level, general_metrics = matrix
+        
+        status_name = self._resolve_status_name(row.get(str(self.field_ids["STATUS"])))
+        if status_name is None:
+            return
+        
+        general_metrics[status_name] += 1
+        for level_name in self._resolve_row_levels(row.get(str(self.field_ids["GROUP_TECH"])), group_lookup):
+            metrics_by_level[level_name][status_name] += 1
+    
+    def _plan_scan_count_matrix(self, start_date: str = None, end_date: str = None,
+                                expected_total: int = None) -> Plan:
+        """Plano: matriz nível × status e métricas gerais em uma única varredura paginada (None se falhar)"""
+        rows = yield from self._plan_scan_ticket_rows(start_date, end_date, expected_total)
+        if rows is None:
+            return None
+        
+        group_lookup = yield from self._plan_group_level_lookup()
+        
+        matrix = self._empty_count_matrix()
+        for row in rows:
+            self._count_ticket_row(row, matrix, group_lookup)
+        
+        self.logger.info(f"Varredura única agregou {len(rows)} tickets")
+        self._seed_count_memo(matrix[0], matrix[1], start_date, end_date)
+        return matrix
+    
+    @staticmethod
+    def _parse_bucket_day(value: str) -> Optional[date]:
+        """Converte um limite do filtro em dia, desde que caia exatamente à meia-noite"""
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', ''))
+        except (AttributeError, ValueError):
+            return None
+        if parsed.time() != datetime.min.time():
+            return None
+        return parsed.date()
+    
+    @staticmethod
+    def _group_day_runs(days: List[date]) -> List[Tuple[date, date]]:
+        """Agrupa dias em sequências contínuas [início, fim)"""
+        runs = []
+        for day in sorted(days):
+            if runs and runs[-1][1] == day:
+                runs[-1] = (runs[-1][0], day + timedelta(days=1))
+            else:
+                runs.append((day, day + timedelta(days=1)))
+        return runs
+    
+    def _plan_fetch_daily_buckets(self, run_start: date, run_end: date, expected_total: int = None) -> Plan:
+        """Plano: varre os tickets criados em [run_start, run_end) e grava um bucket por dia"""
+        # morethan é estrito: começar 1s antes para incluir tickets criados à meia-noite
+        start_str = (datetime.combine(run_start, datetime.min.time()) - timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S')
+        end_str = datetime.combine(run_end, datetime.min.time()).strftime('%Y-%m-%d %H:%M:%S')
+        
+        rows = yield from self._plan_scan_ticket_rows(start_str, end_str, expected_total)
+        if rows is None:
+            return None
+        
+        group_lookup = yield from self._plan_group_level_lookup()
+        date_field = str(self.field_ids.get("DATE_CREATION", "15"))
+        
+        matrices = {}
+        day = run_start
+        while day < run_end:
+            matrices[day] = self._empty_count_matrix()
+            day += timedelta(days=1)
+        
+        for row in rows:
+            try:
+                row_day = date.fromisoformat(str(row.get(date_field))[:10])
+            except ValueError:
+                continue
+            if row_day in matrices:
+                self._count_ticket_row(row, matrices[row_day], group_lookup)
+        
+        buckets = {}
+        for day, (metrics_by_level, general_metrics) in matrices.items():
+            buckets[day] = {"by_level": metrics_by_level, "general": general_metrics}
+            self._set_cache_data('daily_buckets', buckets[day], self._daily_bucket_ttl(day), day.isoformat())
+        
+        self.logger.info(f"Buckets diários de {run_start} a {run_end - timedelta(days=1)} obtidos ({len(rows)} tickets)")
+        return buckets
+    
+    def _daily_bucket_ttl(self, day: date) -> int:
+        """Dias passados mudam pouco (apenas transições de status): TTL longo; hoje/futuro: TTL do dashboard"""
+        return self.daily_bucket_past_ttl if day < datetime.now().date() else self.dashboard_cache_ttl
+    
+    def _index_daily_bucket(self, day: date, bucket: Dict[str, any], expires_at: float):
+        """Registra um bucket diário no índice de somas acumuladas"""
+        counts = {(None, status_name): count for status_name, count in bucket["general"].items()}
+        for level_name, level_data in bucket["by_level"].items():
+            for status_name, count in level_data.items():
+                counts[(level_name, status_name)] = count
+        self._prefix_index.set_day(day, counts, expires_at)
+    
+    def _build_bucket_changes_params(self, modified_since: str) -> Dict[str, any]:
+        """Parâmetros da busca dos tickets modificados desde a data informada (data de criação e de modificação)"""
+        return {
+            "criteria[0][field]": "19",  # Campo 19 = Data da última modificação
+            "criteria[0][searchtype]": "morethan",
+            "criteria[0][value]": modified_since,
+            "forcedisplay[0]": "2",
+            "forcedisplay[1]": self.field_ids.get("DATE_CREATION", "15"),
+            "forcedisplay[2]": "19"
+        }
+    
+    @staticmethod
+    def _seconds_before(timestamp: str, seconds: int) -> str:
+        """Data no formato do GLPI alguns segundos antes da informada"""
+        return (datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S') - timedelta(seconds=seconds)).strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _plan_expire_changed_buckets(self) -> Plan:
+        """Plano: descarta os buckets dos dias com tickets modificados desde a última verificação
+        
+        Um ticket criado ontem e solucionado agora muda o bucket de ontem. Sem esta
+        verificação, o bucket do dia passado seguiria com o status antigo por até
+        daily_bucket_past_ttl, enquanto o dashboard sem filtro já mostra o novo.
+        """
+        now = time.time()
+        with self._bucket_changes_lock:
+            if now - self._bucket_changes_checked_at < self.dashboard_cache_ttl:
+                return
+            self._bucket_changes_checked_at = now
+            watermark = self._bucket_changes_watermark
+            seen = self._bucket_changes_seen
+        
+        # Primeira verificação: os buckets em cache podem ter até daily_bucket_past_ttl
+        if watermark is None:
+            watermark = datetime.fromtimestamp(now - self.daily_bucket_past_ttl).strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Sobreposição de 60s com a verificação anterior (alterações gravadas no mesmo segundo)
+        rows = yield from self._plan_search_all_pages(
+            'Ticket', self._build_bucket_changes_params(self._seconds_before(watermark, 60))
+        )
+        if rows is None:
+            # Sem a lista de alterações não há como confiar nos buckets: tentar de novo na próxima consulta
+            with self._bucket_changes_lock:
+                self._bucket_changes_checked_at = 0.0
+            return
+        
+        date_field = str(self.field_ids.get("DATE_CREATION", "15"))
+        changes = []
+        for row in rows:
+            change = (str(row.get('2')), str(row.get('19') or '')[:19])
+            if change in seen:
+                continue
+            changes.append(change)
+            watermark = max(watermark, change[1])
+            try:
+                changed_day = date.fromisoformat(str(row.get(date_field))[:10])
+            except ValueError:
+                continue
+            self._prefix_index.expire_day(changed_day)
+            self._set_cache_data('daily_buckets', None, 0, changed_day.isoformat())
+        
+        # Alterações na janela de sobreposição da próxima verificação não são descartadas de novo
+        next_overlap = self._seconds_before(watermark, 60)
+        with self._bucket_changes_lock:
+            self._bucket_changes_watermark = watermark
+            self._bucket_changes_seen = {change for change in seen | set(changes) if change[1] >= next_overlap}
+        
+        if changes:
+            self.logger.info(f"{len(changes)} tickets modificados: buckets diários dos seus dias descartados")
+    
+    def _plan_ensure_daily_index(self, first_day: date, end_day: date) -> Plan:
+        """Plano: garante no índice os dias de [first_day, end_day), buscando no GLPI apenas os ausentes"""
+        yield from self._plan_expire_changed_buckets()
+        
+        now = time.time()
+        missing = self._prefix_index.missing_days(first_day, end_day, now)
+        if not missing:
+            return True
+        
+        # Buckets já em cache (inclusive gravados por outros workers)
+        to_fetch = []
+        for day in missing:
+            state = self._get_cache_state('daily_buckets', day.isoformat())
+            if state is not None and not state[2]:
+                bucket, age, _ = state
+                self._index_daily_bucket(day, bucket, now - age + self._daily_bucket_ttl(day))
+            else:
+                to_fetch.append(day)
+        
+        runs = self._group_day_runs(to_fetch)
+        if not runs:
+            return True
+        
+        # Estimar o volume dos dias ausentes antes de varrer
+        span_start = datetime.combine(runs[0][0], datetime.min.time()) - timedelta(seconds=1)
+        span_end = datetime.combine(runs[-1][1], datetime.min.time())
+        estimated = yield IOCall('count', start_date=span_start.strftime('%Y-%m-%d %H:%M:%S'),
+                                 end_date=span_end.strftime('%Y-%m-%d %H:%M:%S'))
+        if estimated > self.daily_bucket_max_scan_tickets:
+            self.logger.info(f"{estimated} tickets nos dias ausentes, usando consultas de contagem")
+            return False
+        
+        for run_start, run_end in runs:
+            fetched = yield from self._plan_fetch_daily_buckets(run_start, run_end,
+                                                                estimated if len(runs) == 1 else None)
+            if fetched is None:
+                return False
+            for day, bucket in fetched.items():
+                self._index_daily_bucket(day, bucket, time.time() + self._daily_bucket_ttl(day))
+        
+        self.logger.info(f"{len(to_fetch)} buckets diários buscados no GLPI para o índice")
+        return True
+    
+    def _get_index_range_days(self, start_date: str, end_date: str) -> Optional[Tuple[date, date]]:
+        """Converte o intervalo em dias inteiros atendíveis pelo índice, se possível"""
+        first_day = self._parse_bucket_day(start_date)
+        end_day = self._parse_bucket_day(end_date)
+        if first_day is None or end_day is None or end_day <= first_day:
+            return None
+        if (end_day - first_day).days > self.daily_bucket_max_days:
+            return None
+        return first_day, end_day
+    
+    def _plan_bucket_count_matrix(self, start_date: str, end_date: str) -> Plan:
+        """Plano: matriz do intervalo pelo índice de somas acumuladas dos buckets diários (None se inviável)"""
+        days = self._get_index_range_days(start_date, end_date)
+        if days is None or not (yield from self._plan_ensure_daily_index(*days)):
+            return None
+        
+        metrics_by_level, general_metrics = self._assemble_count_matrix(self._prefix_index.range_sum(*days))
+        
+        self.logger.info(f"Intervalo de {(days[1] - days[0]).days} dias obtido do índice de buckets diários")
+        self._seed_count_memo(metrics_by_level, general_metrics, start_date, end_date)
+        return metrics_by_level, general_metrics
+    
+    def _plan_trends_from_index(self, start_date: str = None, end_date: str = None) -> Plan:
+        """Plano: tendências com duas consultas ao índice por período (None se o índice não atender)"""
+        current_start, current_end, prev_start, prev_end = self._get_trend_periods(start_date, end_date)
+        
+        current_days = self._get_index_range_days(current_start, current_end)
+        previous_days = self._get_index_range_days(prev_start, prev_end)
+        if current_days is None or previous_days is None:
+            return None
+        
+        if not (yield from self._plan_ensure_daily_index(previous_days[0], current_days[1])):
+            return None
+        
+        current_data = self._assemble_count_matrix(self._prefix_index.range_sum(*current_days), include_levels=False)[1]
+        previous_data = self._assemble_count_matrix(self._prefix_index.range_sum(*previous_days), include_levels=False)[1]
+        
+        self.logger.info(f"Tendências pelo índice: {current_data} vs {previous_data}")
+        return self._calculate_trends(current_data, previous_data)
+    
+    def _seed_count_memo(self, metrics_by_level: Dict[str, Dict[str, int]], general_metrics: Dict[str, int],
+                         start_date: str = None, end_date: str = None):
+        """Registra no memo da requisição as contagens já obtidas pela varredura"""
+        memo = get_current_memo()
+        if memo is None:
+            return
+        
+        for status_name, status_id in self.status_map.items():
+            params = self._build_ticket_count_params(status_id=status_id, start_date=start_date, end_date=end_date)
+            memo.seed(QueryMemo.make_key('Ticket', params), general_metrics.get(status_name, 0))
+            
+            for level_name, group_id in self.service_levels.items():
+                params = self._build_ticket_count_params(group_id, status_id, start_date, end_date)
+                memo.seed(QueryMemo.make_key('Ticket', params), metrics_by_level[level_name].get(status_name, 0))
+    
+    def _plan_aggregate_counts(self, start_date: str = None, end_date: str = None) -> Plan:
+        """Plano: matriz por varredura única (modos auto/scan) ou por consultas de contagem"""
+        if self.aggregation_mode in ('auto', 'scan'):
+            expected_total = None
+            use_scan = self.aggregation_mode == 'scan'
+            
+            if self.aggregation_mode == 'auto':
+                # Estimar o volume da janela com uma única contagem
+                expected_total = yield IOCall('count', start_date=start_date, end_date=end_date)
+                use_scan = expected_total <= self.scan_max_tickets
+                if not use_scan:
+                    self.logger.info(f"Volume estimado de {expected_total} tickets, usando consultas de contagem")
+            
+            if use_scan:
+                matrix = yield from self._plan_scan_count_matrix(start_date, end_date, expected_total)
+                if matrix is not None:
+                    return matrix
+        
+        return (yield from self._plan_count_matrix(start_date, end_date))
+    
+    def _plan_dashboard_counts(self, start_date: str = None, end_date: str = None) -> Plan:
+        """Plano: métricas por nível e gerais pelo espelho, pelos buckets diários, por varredura ou por contagens"""
+        # Espelho local em dia: matriz inteira em duas consultas SQL agrupadas
+        matrix = self._mirror_count_matrix(start_date, end_date)
+        
+        # Intervalos em dias inteiros: soma de buckets diários, buscando só os dias ausentes
+        if matrix is None and self.daily_buckets_enabled and self.aggregation_mode != 'count' and start_date and end_date:
+            matrix = yield from self._plan_bucket_count_matrix(start_date, end_date)
+        
+        if matrix is None:
+            matrix = yield from self._plan_aggregate_counts(start_date, end_date)
+        
+        metrics_by_level, general_metrics = matrix
+        return self._apply_level_fallback(metrics_by_level), self._apply_general_fallback(general_metrics)
+    
+    def _serve_dashboard_cache(self, cache_key: str, sub_key: Optional[str],
+                               refresh: Callable[[], Dict[str, any]]) -> Optional[Dict[str, any]]:
+        """Retorna o dashboard em cache; se obsoleto, dispara a atualização em segundo plano"""
+        state = self._get_cache_state(cache_key, sub_key)
+        if state is None:
+            return None
+        
+        data, age, stale = state
+        if stale:
+            self.logger.info(f"Métricas obsoletas servidas do cache ({age:.0f}s): {sub_key or cache_key}")
+            self._refresh_in_background(sub_key or cache_key, refresh)
+        else:
+            self.logger.info(f"Métricas do dashboard carregadas do cache: {sub_key or cache_key}")
+        
+        return self._with_cache_age(data, age, stale)
+    
+    @staticmethod
+    def _with_cache_age(data: Dict[str, any], age: float, stale: bool) -> Dict[str, any]:
+        """Cópia da resposta em cache com a idade dos dados nos metadados"""
+        if not isinstance(data, dict) or not isinstance(data.get('metadata'), dict):
+            return data
+        
+        result = dict(data)
+        result['metadata'] = dict(data['metadata'], data_age=round(age, 1), stale=stale)
+        return result
+    
+    def _upstream_fallback(self, cache_key: str, sub_key: str = None,
+                           result: Dict[str, any] = None) -> Dict[str, any]:
+        """Última versão conhecida do dashboard com o GLPI instável (senão result ou erro imediato)"""
+        entry = self._get_cache_entry(cache_key, sub_key)
+        if entry and entry.get('data') is not None and entry.get('timestamp') is not None:
+            self.logger.warning(f"GLPI instável: servindo a última versão conhecida de {sub_key or cache_key}")
+            return self._with_cache_age(entry['data'], time.time() - entry['timestamp'], True)
+        
+        if result is not None:
+            return result
+        return ResponseFormatter.format_error_response("GLPI indisponível no momento", ["Circuito aberto para o GLPI"], 503)
+    
+    def _compute_within_deadline(self, key: str, start_time: float,
+                                 compute: Callable[[Optional[QueryMemo]], Dict[str, any]],
+                                 partial: Callable[[QueryMemo], Dict[str, any]]) -> Dict[str, any]:
+        """Aguarda a computação até o prazo da requisição; depois responde com as células já concluídas"""
+        if self.request_deadline <= 0:
+            return self._single_flight.do(key, lambda: compute(None))
+        
+        # A computação roda em segundo plano, compartilhada pelas requisições simultâneas, e grava o cache ao terminar
+        owner = False
+        with self._deadline_lock:
+            running = self._deadline_computations.get(key)
+            if running is None:
+                memo = QueryMemo()
+                future = self._deadline_executor.submit(self._single_flight.do, key, lambda: compute(memo))
+                running = self._deadline_computations[key] = (future, memo)
+                owner = True
+        
+        future, memo = running
+        if owner:
+            future.add_done_callback(lambda _: self._forget_deadline_computation(key, running))
+        
+        try:
+            return future.result(timeout=max(start_time + self.request_deadline - time.time(), 0))
+        except FutureTimeoutError:
+            self.logger.warning(f"Prazo de {self.request_deadline}s esgotado para {key}, respondendo com resultado parcial")
+            return partial(memo)
+    
+    def _forget_deadline_computation(self, key: str, running: Tuple[any, QueryMemo]):
+        with self._deadline_lock:
+            if self._deadline_computations.get(key) is running:
+                del self._deadline_computations[key]
+    
+    def _build_partial_dashboard(self, memo: QueryMemo, start_date: str = None, end_date: str = None,
+                                 filters: Dict[str, any] = None, include_trends: bool = False,
+                                 start_time: float = None, cache_key: str = None,
+                                 sub_key: str = None) -> Dict[str, any]:
+        """Dashboard com as contagens já concluídas no memo; células ainda em andamento vêm como None
+        
+        Varredura única, buckets diários e espelho só publicam as células ao final. Sem
+        nenhuma célula concluída, responde com a última versão conhecida do cache
+        (cache_key/sub_key), se houver, em vez de um dashboard inteiro nulo.
+        """
+        tasks = self._build_count_matrix_tasks(start_date, end_date)
+        counts = {
+            cell: memo.peek(QueryMemo.make_key('Ticket', self._build_ticket_count_params(**kwargs)))
+            for cell, kwargs in tasks.items()
+        }
+        metrics_by_level, general_metrics = self._assemble_count_matrix(counts)
+        missing_cells = [
+            {"level": level_name, "status": status_name}
+            for (level_name, status_name), count in counts.items() if count is None
+        ]
+        
+        result = ResponseFormatter.format_dashboard_response(
+            {'by_level': metrics_by_level, 'general': general_metrics},
+            filters=filters,
+            start_time=start_time,
+            metadata={
+                "query_memo": memo.get_stats(),
+                "data_age": 0.0,
+                "stale": False,
+                "partial": True,
+                "missing_cells": missing_cells,
+                "missing_trends": include_trends
+            }
+        )
+        
+        if cache_key is not None and len(missing_cells) == len(counts):
+            return self._upstream_fallback(cache_key, sub_key, result)
+        return result
+    
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Dict[str, any]]):
+        """Agenda uma única atualização em segundo plano por chave de cache"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def run():
+            try:
+                # Passa pelo single-flight para que requisições sem cache aguardem esta mesma atualização
+                with priority_scope(RequestPriority.BACKGROUND):
+                    self._single_flight.do(key, refresh)
+            except Exception as e:
+                self.logger.error(f"Erro na atualização em segundo plano de {key}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+        
+        self._refresh_executor.submit(run)
+    
+    @staticmethod
+    def _filtered_cache_key(start_date: str = None, end_date: str = None, include_trends: bool = False) -> str:
+        """Chave do dashboard filtrado por data dentro de 'dashboard_metrics_filtered'"""
+        return f"filtered_{start_date}_{end_date}" + ("_trends" if include_trends else "")
+    
+    def get_dashboard_metrics(self, use_cache: bool = True, include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas completas do dashboard (tendências apenas se solicitadas)"""
         start_time = time.time()
+        cache_key = 'dashboard_metrics_trends' if include_trends else 'dashboard_metrics'
         
-        # Verificar cache se habilitado
-        if use_cache and self._is_cache_valid('dashboard_metrics'):
-            cached_data = self._get_cache_data('dashboard_metrics')
+        # Verificar cache se habilitado (valores obsoletos são servidos e atualizados em segundo plano)
+        if use_cache:
+            cached_data = self._serve_dashboard_cache(
+                cache_key, None,
+                lambda: self._compute_dashboard_metrics(cache_key, True, include_trends, time.time())
+            )
             if cached_data:
-                self.logger.info("Métricas do dashboard carregadas do cache")
                 return cached_data
         
+        # GLPI indisponível: falha rápida com a última versão conhecida
+        if self._upstream_guard.is_open():
+            return self._upstream_fallback(cache_key)
+        
+        # Abas que consultam ao mesmo tempo compartilham uma única computação, aguardada até o prazo
+        return self._compute_within_deadline(
+            cache_key, start_time,
+            lambda memo: self._compute_dashboard_metrics(cache_key, use_cache, include_trends, start_time, memo),
+            lambda memo: self._build_partial_dashboard(memo, include_trends=include_trends, start_time=start_time,
+                                                       cache_key=cache_key)
+        )
+    
+    def _compute_dashboard_metrics(self, cache_key: str, use_cache: bool, include_trends: bool,
+                                   start_time: float, memo: QueryMemo = None) -> Dict[str, any]:
+        """Calcula as métricas completas do dashboard e atualiza o cache"""
         try:
-            if not self._ensure_authenticated():
-                return ResponseFormatter.format_error_response("Falha na autenticação com GLPI", ["Erro de autenticação"])
-                
-            if not self.discover_field_ids():
-                return ResponseFormatter.format_error_response("Falha ao descobrir IDs dos campos", ["Erro ao obter configuração"])
-            
-            # Obter métricas por nível e gerais
-            level_metrics = self._get_metrics_by_level_internal()
-            general_metrics = self._get_general_metrics_internal()
+            with deadline_scope(self.computation_deadline) as deadline, query_memo_scope(memo), failure_scope() as failures:
+                result = self._run_plan(self._plan_dashboard_metrics(include_trends=include_trends,
+                                                                     start_time=start_time))
             
-            # Calcular totais gerais
-            total_tickets = sum(general_metrics.values())
-            
-            # Calcular breakdown por nível
-            level_totals = {}
-            for level_name, level_data in level_metrics.items():
-                level_totals[level_name] = sum(level_data.values())
-            
-            # Calcular tendências (comparar com período anterior)
-            trends = self._get_trends_with_logging()
-            
-            # Usar o formatador unificado
-            raw_data = {
-                'by_level': level_metrics,
-                'general': general_metrics
-            }
-            result = ResponseFormatter.format_dashboard_response(raw_data, start_time=start_time)
-            
-            # Armazenar no cache por 3 minutos
-            if use_cache:
-                self._set_cache_data('dashboard_metrics', result, 180)
-            
-            return result
+            return self._store_dashboard_result(result, deadline, failures, cache_key, use_cache=use_cache)
             
         except Exception as e:
             self.logger.error(f"Erro ao obter métricas do dashboard: {e}")
             return ResponseFormatter.format_error_response(f"Erro interno: {str(e)}", [str(e)])
     
+    def _plan_dashboard_metrics(self, start_date: str = None, end_date: str = None, filters: Optional[Dict] = None,
+                                include_trends: bool = False, start_time: float = None) -> Plan:
+        """Plano: contagens do dashboard e, se solicitadas, tendências, formatadas na resposta unificada"""
+        if not (yield IOCall('authenticate')):
+            return ResponseFormatter.format_error_response("Falha na autenticação com GLPI", ["Erro de autenticação"])
+        
+        if not (yield from self._plan_discover_field_ids()):
+            return ResponseFormatter.format_error_response("Falha ao descobrir IDs dos campos", ["Erro ao obter configuração"])
+        
+        # Contagens e tendências são independentes: o cliente assíncrono as mantém em voo ao mesmo tempo
+        plans = {'counts': self._plan_dashboard_counts(start_date, end_date)}
+        if include_trends:
+            plans['trends'] = self._plan_trends(start_date, end_date)
+        results = yield IOCall('gather', plans)
+        level_metrics, general_metrics = results['counts']
+        
+        # Usar o formatador unificado
+        raw_data = {
+            'by_level': level_metrics,
+            'general': general_metrics
+        }
+        memo = get_current_memo()
+        return ResponseFormatter.format_dashboard_response(
+            raw_data,
+            filters=filters,
+            start_time=start_time,
+            trends=results.get('trends'),
+            metadata={"query_memo": memo.get_stats() if memo is not None else {},
+                      "data_age": 0.0, "stale": False, "partial": False}
+        )
+    
+    def _store_dashboard_result(self, result: Dict[str, any], deadline, failures, cache_key: str,
+                                sub_key: str = None, use_cache: bool = True) -> Dict[str, any]:
+        """Grava no cache o dashboard calculado; com falhas do GLPI ou prazo esgotado serve a última versão"""
+        # Falhas do GLPI ou chamadas abandonadas pelo prazo: não substitui o cache, serve a última versão conhecida
+        if deadline.exceeded or failures.total:
+            return self._upstream_fallback(cache_key, sub_key, result)
+        
+        # Armazenar no cache (fresco por 3 minutos, servido como obsoleto até o stale TTL)
+        if use_cache and result.get('success'):
+            self._set_cache_data(cache_key, result, self.dashboard_cache_ttl, sub_key,
+                                 stale_ttl=self.dashboard_cache_stale_ttl)
+        
+        return result
+
+    def refresh_dashboard_metrics(self) -> Dict[str, any]:
+        """Recalcula o dashboard padrão e atualiza o cache (usado pelo pré-aquecimento)"""
+        return self._single_flight.do(
+            'dashboard_metrics',
+            lambda: self._compute_dashboard_metrics('dashboard_metrics', True, False, time.time())
+        )
+    
     def _get_general_totals_internal(self) -> Dict[str, int]:
         """Obtém totais gerais internos"""
         return self._get_general_metrics_internal()
     
-    def get_dashboard_metrics_with_date_filter(self, start_date: str = None, end_date: str = None) -> Dict[str, any]:
-        """Obtém métricas do dashboard com filtro de data"""
+    def get_dashboard_metrics_with_date_filter(self, start_date: str = None, end_date: str = None,
+                                              include_trends: bool = False) -> Dict[str, any]:
+        """Obtém métricas do dashboard com filtro de data (tendências apenas se solicitadas)"""
         start_time = time.time()
         
         # Criar chave de cache baseada nos filtros
-        cache_key = f"filtered_{start_date}_{end_date}"
+        cache_key = self._filtered_cache_key(start_date, end_date, include_trends)
         
-        # Verificar cache
-        if self._is_cache_valid('dashboard_metrics_filtered', cache_key):
-            cached_data = self._get_cache_data('dashboard_metrics_filtered', cache_key)
-            if cached_data:
-                self.logger.info(f"Métricas filtradas carregadas do cache: {cache_key}")
-                return cached_data
+        # Verificar cache (valores obsoletos são servidos e atualizados em segundo plano)
+        cached_data = self._serve_dashboard_cache(
+            'dashboard_metrics_filtered', cache_key,
+            lambda: self._compute_dashboard_metrics_with_date_filter(cache_key, start_date, end_date,
+                                                                     include_trends, time.time())
+        )
+        if cached_data:
+            return cached_data
         
+        if self._upstream_guard.is_open():
+            return self._upstream_fallback('dashboard_metrics_filtered', cache_key)
+        
+        return self._compute_within_deadline(
+            cache_key, start_time,
+            lambda memo: self._compute_dashboard_metrics_with_date_filter(cache_key, start_date, end_date,
+                                                                          include_trends, start_time, memo),
+            lambda memo: self._build_partial_dashboard(memo, start_date, end_date,
+                                                       {"start_date": start_date, "end_date": end_date},
+                                                       include_trends, start_time,
+                                                       'dashboard_metrics_filtered', cache_key)
+        )
+    
+    def _compute_dashboard_metrics_with_date_filter(self, cache_key: str, start_date: str, end_date: str,
+                                                    include_trends: bool, start_time: float,
+                                                    memo: QueryMemo = None) -> Dict[str, any]:
+        """Calcula as métricas do dashboard com filtro de data e atualiza o cache"""
         try:
-            if not self._ensure_authenticated():
-                return ResponseFormatter.format_error_response("Falha na autenticação com GLPI", ["Erro de autenticação"])
-                
-            if not self.discover_field_ids():
-                return ResponseFormatter.format_error_response("Falha ao descobrir IDs dos campos", ["Erro ao obter configuração"])
-            
-            # Obter métricas com filtros de data
-            level_metrics = self._get_metrics_by_level_internal(start_date, end_date)
-            general_metrics = self._get_general_metrics_internal(start_date, end_date)
-            
-            # Calcular tendências com filtros
-            trends = self._get_trends_with_logging(start_date, end_date)
-            
-            # Usar o formatador unificado
-            raw_data = {
-                'by_level': level_metrics,
-                'general': general_metrics
-            }
             filters_data = {
                 "start_date": start_date,
                 "end_date": end_date
             }
-            result = ResponseFormatter.format_dashboard_response(
-                raw_data,
-                filters=filters_data,
-                start_time=start_time
-            )
+            with deadline_scope(self.computation_deadline) as deadline, query_memo_scope(memo), failure_scope() as failures:
+                result = self._run_plan(self._plan_dashboard_metrics(start_date, end_date, filters_data,
+                                                                     include_trends, start_time))
             
-            # Armazenar no cache por 3 minutos
-            self._set_cache_data('dashboard_metrics_filtered', result, 180, cache_key)
-            
-            return result
+            return self._store_dashboard_result(result, deadline, failures, 'dashboard_metrics_filtered', cache_key)
             
         except Exception as e:
             self.logger.error(f"Erro ao obter métricas com filtro de data: {e}")
             return ResponseFormatter.format_error_response(f"Erro interno: {str(e)}", [str(e)])
+
+    def refresh_dashboard_metrics_with_date_filter(self, start_date: str = None,
+                                                   end_date: str = None) -> Dict[str, any]:
+        """Recalcula o dashboard filtrado por data e atualiza o cache (usado pelo pré-aquecimento)"""
+        cache_key = self._filtered_cache_key(start_date, end_date)
+        return self._single_flight.do(
+            cache_key,
+            lambda: self._compute_dashboard_metrics_with_date_filter(cache_key, start_date, end_date,
+                                                                     False, time.time())
+        )
     
     def _get_trends_with_logging(self, start_date: str = None, end_date: str = None) -> Dict[str, str]:
         """Calcula tendências com logging detalhado"""
+        return self._run_plan(self._plan_trends(start_date, end_date))
+    
+    def _plan_trends(self, start_date: str = None, end_date: str = None) -> Plan:
+        """Plano: tendências pelo índice de buckets diários ou pelas contagens dos dois períodos"""
         try:
-            self.logger.info(f"Calculando tendências para período: {start_date} até {end_date}")
-            
-            # Obter dados do período atual
-            current_data = self._get_general_metrics_internal(start_date, end_date)
-            self.logger.info(f"Dados período atual: {current_data}")
+            # Períodos em dias inteiros: duas consultas ao índice de somas acumuladas (o espelho dispensa o índice)
+            if self.daily_buckets_enabled and self.aggregation_mode != 'count' and self._get_ready_mirror() is None:
+                trends = yield from self._plan_trends_from_index(start_date, end_date)
+                if trends is not None:
+                    return trends
             
-            # Calcular período anterior
-            if start_date and end_date:
-                # Se temos filtros de data, calcular período anterior baseado no intervalo
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                interval = end_dt - start_dt
-                
-                prev_start = start_dt - interval
-                prev_end = start_dt
-                
-                prev_start_str = prev_start.strftime('%Y-%m-%d %H:%M:%S')
-                prev_end_str = prev_end.strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                # Sem filtros de data, usar últimos 7 dias vs 7 dias anteriores
-                end_dt = datetime.now()
-                start_dt = end_dt - timedelta(days=7)
-                
-                prev_end = start_dt
-                prev_start = prev_end - timedelta(days=7)
-                
-                prev_start_str = prev_start.strftime('%Y-%m-%d %H:%M:%S')
-                prev_end_str = prev_end.strftime('%Y-%m-%d %H:%M:%S')
+            current_start, current_end, prev_start_str, prev_end_str = self._get_trend_periods(start_date, end_date)
             
+            self.logger.info(f"Calculando tendências para período: {current_start} até {current_end}")
             self.logger.info(f"Período anterior: {prev_start_str} até {prev_end_str}")
             
-            # Obter dados do período anterior
-            previous_data = self._get_general_metrics_internal(prev_start_str, prev_end_str)
+            # Contagens dos dois períodos disparadas juntas
+            tasks = {}
+            for period, (period_start, period_end) in (('current', (current_start, current_end)),
+                                                       ('previous', (prev_start_str, prev_end_str))):
+                for key, kwargs in self._build_count_matrix_tasks(period_start, period_end, include_levels=False).items():
+                    tasks[(period, key)] = kwargs
+            
+            counts = yield IOCall('count_many', tasks)
+            
+            current_data = self._assemble_count_matrix(
+                {key: count for (period, key), count in counts.items() if period == 'current'}, include_levels=False
+            )[1]
+            previous_data = self._assemble_count_matrix(
+                {key: count for (period, key), count in counts.items() if period == 'previous'}, include_levels=False
+            )[1]
+            
+            self.logger.info(f"Dados período atual: {current_data}")
             self.logger.info(f"Dados período anterior: {previous_data}")
             
             # Calcular tendências
@@ -686,6 +1828,39 @@ class GLPIService:
                 "resolved_tickets": "0%"
             }
     
+    @classmethod
+    def _get_trend_periods(cls, start_date: str = None, end_date: str = None) -> Tuple[str, str, str, str]:
+        """Retorna (início, fim) do período atual e do anterior usados nas tendências"""
+        if not (start_date and end_date):
+            # Sem filtros de data: últimos 7 dias
+            end_dt = datetime.now()
+            start_date = (end_dt - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+            end_date = end_dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        prev_start, prev_end = cls._get_previous_period(start_date, end_date)
+        return start_date, end_date, prev_start, prev_end
+    
+    @staticmethod
+    def _get_previous_period(start_date: str = None, end_date: str = None) -> Tuple[str, str]:
+        """Calcula o período anterior usado na comparação de tendências"""
+        if start_date and end_date:
+            # Se temos filtros de data, calcular período anterior baseado no intervalo
+            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            interval = end_dt - start_dt
+            
+            prev_start = start_dt - interval
+            prev_end = start_dt
+        else:
+            # Sem filtros de data, usar últimos 7 dias vs 7 dias anteriores
+            end_dt = datetime.now()
+            start_dt = end_dt - timedelta(days=7)
+            
+            prev_end = start_dt
+            prev_start = prev_end - timedelta(days=7)
+        
+        return prev_start.strftime('%Y-%m-%d %H:%M:%S'), prev_end.strftime('%Y-%m-%d %H:%M:%S')
+    
     def _calculate_trends(self, current_data: Dict[str, int], previous_data: Dict[str, int]) -> Dict[str, str]:
         """Calcula as tendências percentuais"""
         try:
@@ -735,12 +1910,33 @@ class GLPIService:
                 "resolved_tickets": "0%"
             }
     
+    def refresh_lookups(self) -> bool:
+        """Revalida no GLPI os metadados servidos do cache/snapshot e regrava os snapshots"""
+        return self._run_plan(self._plan_refresh_lookups())
+    
+    def _plan_refresh_lookups(self) -> Plan:
+        """Plano: busca de novo opções de busca, campos, grupos, níveis e diretório de técnicos"""
+        search_options = yield from self._plan_fetch_search_options()
+        if search_options is None:
+            return False
+        
+        self.field_ids = self._parse_field_ids(search_options)
+        self._set_lookup_data('field_ids', self.field_ids)
+        yield from self._plan_discover_tech_field_id(refresh=True)
+        yield from self._plan_group_level_lookup(refresh=True)
+        yield from self._plan_refresh_level_index()
+        
+        cached_directory = self._get_cache_data('technician_directory')
+        if cached_directory and cached_directory.get('ids'):
+            yield from self._plan_fetch_user_directory(cached_directory['ids'], refresh=True)
+        
+        self._lookups_validated_at = time.time()
+        self.logger.info("Metadados do GLPI revalidados")
+        return True
+    
     def get_technician_ranking(self, limit: int = 10, use_cache: bool = True) -> List[Dict[str, any]]:
         """Obtém ranking de técnicos por total de tickets"""
-        # Implementação otimizada com cache inteligente
-        # Temporariamente desabilitado para debug
-        use_cache = False
-        
+        # O cache guarda o ranking completo; o limite é aplicado na saída
         if use_cache and self._is_cache_valid('technician_ranking'):
             cached_data = self._get_cache_data('technician_ranking')
             if cached_data:
@@ -748,20 +1944,74 @@ class GLPIService:
                 return cached_data[:limit]
         
         try:
-            # Usar implementação otimizada baseada em conhecimento
-            ranking = self._get_technician_ranking_knowledge_base(limit)
-            
-            if use_cache and ranking:
-                self._set_cache_data('technician_ranking', ranking, 300)  # 5 minutos
+            if use_cache:
+                return self._single_flight.do('technician_ranking', self.refresh_technician_ranking)[:limit]
             
-            return ranking
+            # Usar implementação otimizada baseada em conhecimento
+            with priority_scope(RequestPriority.RANKING):
+                return self._get_technician_ranking_knowledge_base(limit)
             
         except Exception as e:
             self.logger.error(f"Erro ao obter ranking de técnicos: {e}")
             return self._get_technician_ranking_fallback(limit)
     
-    def _discover_tech_field_id(self) -> Optional[str]:
+    def get_technician_ranking_with_filters(self, limit: int = 10, start_date: str = None, end_date: str = None,
+                                            level: str = None) -> List[Dict[str, any]]:
+        """Obtém ranking de técnicos filtrado por intervalo de datas e/ou nível de serviço"""
+        try:
+            if not start_date and not end_date:
+                ranking = self.get_technician_ranking(limit=None)
+            else:
+                filter_key = self._ranking_filter_key(start_date, end_date)
+                ranking = self._get_cache_data('technician_ranking_filtered', filter_key) \
+                    if self._is_cache_valid('technician_ranking_filtered', filter_key) else None
+                if not ranking:
+                    ranking = self._single_flight.do(
+                        f"technician_ranking:{filter_key}",
+                        lambda: self.refresh_technician_ranking_with_date_filter(start_date, end_date)
+                    )
+            
+            return self._apply_ranking_filters(ranking, self._get_level_index(), level, limit)
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao obter ranking de técnicos com filtros: {e}")
+            return []
+    
+    def refresh_technician_ranking_with_date_filter(self, start_date: str = None,
+                                                    end_date: str = None) -> List[Dict[str, any]]:
+        """Recalcula o ranking completo de um intervalo de datas e atualiza o cache"""
+        with priority_scope(RequestPriority.RANKING):
+            ranking = self._get_technician_ranking_knowledge_base(None, start_date, end_date)
+        
+        if ranking:
+            self._set_cache_data('technician_ranking_filtered', ranking, self.ranking_cache_ttl,
+                                 self._ranking_filter_key(start_date, end_date))
+        
+        return ranking
+    
+    def refresh_technician_ranking(self) -> List[Dict[str, any]]:
+        """Recalcula o ranking completo de técnicos e atualiza o cache"""
+        # Centenas de chamadas: cedem a vez às contagens interativas do dashboard
+        with priority_scope(RequestPriority.RANKING):
+            ranking = self._get_technician_ranking_knowledge_base(limit=None)
+        
+        if ranking:
+            self._set_cache_data('technician_ranking', ranking, self.ranking_cache_ttl)
+        
+        return ranking
+    
+    def _discover_tech_field_id(self, refresh: bool = False) -> Optional[str]:
         """Descobre dinamicamente o ID do campo de técnico atribuído"""
+        return self._run_plan(self._plan_discover_tech_field_id(refresh))
+    
+    def _plan_discover_tech_field_id(self, refresh: bool = False) -> Plan:
+        """Plano: ID do campo de técnico atribuído (cache/snapshot, campos conhecidos ou opções de busca)"""
+        # Campo descoberto em uma construção anterior do ranking (ou carregado do snapshot)
+        if not refresh and self._is_cache_valid('tech_field_id'):
+            cached_field_id = self._get_cache_data('tech_field_id')
+            if cached_field_id:
+                return cached_field_id
+        
         try:
             # IDs conhecidos para técnico
             known_tech_fields = ["5", "95"]  # 5 = Técnico, 95 = Técnico encarregado
@@ -769,7 +2019,8 @@ class GLPIService:
             for field_id in known_tech_fields:
                 self.logger.info(f"Testando campo {field_id} para técnico")
                 # Fazer uma busca de teste
-                response = self._make_authenticated_request(
+                response = yield IOCall(
+                    'request',
                     'GET',
                     f"{self.glpi_url}/search/Ticket",
                     params={
@@ -782,21 +2033,19 @@ class GLPIService:
                 
                 if response and response.ok:
                     self.logger.info(f"Campo {field_id} é válido para técnico")
+                    self._set_lookup_data('tech_field_id', field_id)
                     return field_id
             
-            # Fallback: buscar por nome
-            response = self._make_authenticated_request(
-                'GET',
-                f"{self.glpi_url}/listSearchOptions/Ticket"
-            )
+            # Fallback: buscar por nome (opções de busca em cache, sem baixá-las de novo)
+            search_options = yield from self._plan_search_options()
             
-            if response and response.ok:
-                search_options = response.json()
+            if search_options:
                 for field_id, field_info in search_options.items():
                     if isinstance(field_info, dict) and 'name' in field_info:
                         field_name = field_info['name'].lower()
                         if 'técnico' in field_name or 'assigned to' in field_name:
                             self.logger.info(f"Campo técnico encontrado: {field_id} - {field_info['name']}")
+                            self._set_lookup_data('tech_field_id', field_id)
                             return field_id
             
             # Último fallback
@@ -807,168 +2056,341 @@ class GLPIService:
             self.logger.error(f"Erro ao descobrir campo de técnico: {e}")
             return "5"
     
-    def _get_technician_ranking_knowledge_base(self, limit: int = 10) -> List[Dict[str, any]]:
+    @staticmethod
+    def _build_profile_user_params() -> Dict[str, any]:
+        """Parâmetros de busca dos usuários com perfil de técnico (Profile_User)"""
+        return {
+            "criteria[0][field]": "3",  # Campo profiles_id
+            "criteria[0][searchtype]": "equals",
+            "criteria[0][value]": "6",  # ID do perfil técnico
+            "range": "0-99"
+        }
+    
+    def _parse_technician_user_ids(self, profile_data: Dict[str, any]) -> List[str]:
+        """Extrai os IDs de usuário da busca em Profile_User"""
+        technician_user_ids = []
+        
+        if 'data' in profile_data:
+            for item in profile_data['data']:
+                user_id = item.get('2')  # Campo users_id
+                if user_id:
+                    technician_user_ids.append(str(user_id))
+                    self.logger.debug(f"Técnico encontrado: User ID {user_id}")
+        
+        return technician_user_ids
+    
+    @staticmethod
+    def _build_user_directory_params(user_ids: List[str]) -> Dict[str, any]:
+        """Parâmetros de busca de um lote de usuários pelo ID (critérios ligados por OR)"""
+        params = {}
+        for index, user_id in enumerate(user_ids):
+            if index:
+                params[f"criteria[{index}][link]"] = "OR"
+            params[f"criteria[{index}][field]"] = "2"  # Campo ID
+            params[f"criteria[{index}][searchtype]"] = "equals"
+            params[f"criteria[{index}][value]"] = user_id
+        
+        # 1=name, 2=ID, 8=is_active, 9=realname, 10=firstname (is_active é filtrado localmente)
+        for index, field_id in enumerate(("1", "2", "8", "9", "10")):
+            params[f"forcedisplay[{index}]"] = field_id
+        return params
+    
+    def _parse_user_directory(self, rows: List[Dict[str, any]]) -> Dict[str, Dict[str, str]]:
+        """Indexa por ID os usuários ativos retornados pela busca em lote de /search/User"""
+        directory = {}
+        for user_info in rows:
+            user_id = user_info.get('2')
+            if user_id is None or str(user_info.get('8', '1')).lower() in ('0', 'false'):
+                continue
+            
+            user_id = str(user_id)
+            username = user_info.get('1') or f'User_{user_id}'
+            self.logger.debug(f"Usuário ativo: {username} (ID: {user_id})")
+            directory[user_id] = {
+                'user_id': user_id,
+                'username': username,
+                'realname': user_info.get('9') or '',
+                'firstname': user_info.get('10') or ''
+            }
+        
+        return directory
+    
+    def _get_cached_user_directory(self, user_ids: List[str]) -> Optional[Dict[str, Dict[str, str]]]:
+        """Diretório em cache (ou snapshot) se foi montado para o mesmo conjunto de técnicos"""
+        if not self._is_cache_valid('technician_directory'):
+            return None
+        cached = self._get_cache_data('technician_directory')
+        if cached and cached.get('ids') == sorted(user_ids):
+            return cached['entries']
+        return None
+    
+    def _store_user_directory(self, user_ids: List[str], directory: Dict[str, Dict[str, str]]):
+        self._set_lookup_data('technician_directory', {'ids': sorted(user_ids), 'entries': directory})
+    
+    def _fetch_user_directory(self, user_ids: List[str], refresh: bool = False) -> Dict[str, Dict[str, str]]:
+        """Busca os técnicos ativos em poucas buscas OR paginadas e os indexa por ID"""
+        return self._run_plan(self._plan_fetch_user_directory(user_ids, refresh))
+    
+    def _plan_fetch_user_directory(self, user_ids: List[str], refresh: bool = False) -> Plan:
+        """Plano: diretório de técnicos ativos em lotes de buscas OR (cache se o conjunto não mudou)"""
+        cached_directory = None if refresh else self._get_cached_user_directory(user_ids)
+        if cached_directory is not None:
+            return cached_directory
+        
+        batch_size = self.user_directory_batch_size
+        plans = {
+            start: self._plan_search_all_pages('User',
+                                               self._build_user_directory_params(user_ids[start:start + batch_size]))
+            for start in range(0, len(user_ids), batch_size)
+        }
+        results = yield IOCall('gather', plans)
+        
+        directory = {}
+        complete = True
+        for start, rows in results.items():
+            if rows is None:
+                self.logger.error(f"Falha ao buscar o lote de usuários {start}-{start + batch_size - 1}")
+                complete = False
+                continue
+            directory.update(self._parse_user_directory(rows))
+        
+        if complete:
+            self._store_user_directory(user_ids, directory)
+        return directory
+    
+    @staticmethod
+    def _build_display_name(tech: Dict[str, str]) -> str:
+        """Constrói o nome de exibição do técnico"""
+        if tech['firstname'] and tech['realname']:
+            return f"{tech['firstname']} {tech['realname']}"
+        elif tech['realname']:
+            return tech['realname']
+        return tech['username']
+    
+    def _build_level_members_params(self) -> Dict[str, any]:
+        """Parâmetros de busca dos membros dos grupos de nível (Group_User, critérios OR por grupo)"""
+        params = {}
+        for index, group_id in enumerate(self.service_levels.values()):
+            if index:
+                params[f"criteria[{index}][link]"] = "OR"
+            params[f"criteria[{index}][field]"] = "3"  # Campo groups_id
+            params[f"criteria[{index}][searchtype]"] = "equals"
+            params[f"criteria[{index}][value]"] = group_id
+        
+        params["forcedisplay[0]"] = "2"  # Campo users_id
+        params["forcedisplay[1]"] = "3"  # Campo groups_id
+        return params
+    
+    def _build_level_index(self, rows: List[Dict[str, any]]) -> Dict[str, str]:
+        """Monta o índice usuário → nível a partir das linhas de Group_User (primeiro grupo de nível vence)"""
+        # Grupos por ID e, se já conhecidos, pelo nome exibido na busca
+        group_lookup = {str(group_id): level_name for level_name, group_id in self.service_levels.items()}
+        if self._is_cache_valid('group_levels'):
+            group_lookup.update(self._get_cache_data('group_levels') or {})
+        
+        level_index = {}
+        for row in rows:
+            user_id = row.get('2')
+            if user_id is None:
+                continue
+            for level_name in self._resolve_row_levels(row.get('3'), group_lookup):
+                level_index.setdefault(str(user_id), level_name)
+        
+        return level_index
+    
+    def refresh_level_index(self) -> Optional[Dict[str, str]]:
+        """Reconstrói o índice usuário → nível em uma busca paginada de Group_User e atualiza o cache"""
+        return self._run_plan(self._plan_refresh_level_index())
+    
+    def _plan_refresh_level_index(self) -> Plan:
+        """Plano: índice usuário → nível a partir dos membros dos grupos de nível (None em caso de falha)"""
+        rows = yield from self._plan_search_all_pages('Group_User', self._build_level_members_params())
+        if rows is None:
+            self.logger.error("Falha ao buscar os membros dos grupos de nível")
+            return None
+        
+        level_index = self._build_level_index(rows)
+        self._set_lookup_data('level_index', level_index)
+        self.logger.info(f"Índice de níveis atualizado com {len(level_index)} usuários")
+        return level_index
+    
+    def _get_level_index(self) -> Dict[str, str]:
+        """Índice usuário → nível em cache (reconstruído uma única vez quando vencido)"""
+        return self._run_plan(self._plan_level_index())
+    
+    def _plan_level_index(self) -> Plan:
+        """Plano: índice usuário → nível do cache ou reconstruído por uma única computação"""
+        if self._is_cache_valid('level_index'):
+            cached_index = self._get_cache_data('level_index')
+            if cached_index is not None:
+                return cached_index
+        
+        return (yield IOCall('single_flight', 'level_index', self._plan_refresh_level_index)) or {}
+    
+    @staticmethod
+    def _apply_ranking_filters(ranking: List[Dict[str, any]], level_index: Dict[str, str],
+                               level: str = None, limit: Optional[int] = 10) -> List[Dict[str, any]]:
+        """Aplica o filtro de nível (pelo índice em memória) e o limite a um ranking completo"""
+        if level:
+            wanted = level.strip().lower()
+            ranking = [
+                dict(entry, level=level_index.get(str(entry['id']), "Geral")) for entry in ranking
+            ]
+            ranking = [entry for entry in ranking if entry['level'].lower() == wanted]
+        return ranking[:limit]
+    
+    @staticmethod
+    def _ranking_filter_key(start_date: str = None, end_date: str = None) -> str:
+        """Chave do cache de rankings por intervalo de datas"""
+        return f"{start_date or ''}|{end_date or ''}"
+    
+    @staticmethod
+    def _build_technician_count_params(tech_id, tech_field_id: str) -> Dict[str, any]:
+        """Parâmetros de contagem de tickets atribuídos a um técnico"""
+        return {
+            "criteria[0][field]": tech_field_id,
+            "criteria[0][searchtype]": "equals",
+            "criteria[0][value]": tech_id,
+            "range": "0-0"  # Só queremos o total
+        }
+    
+    def _build_technician_lookup(self, technicians: List[Dict[str, str]]) -> Dict[str, str]:
+        """Mapeia ID, login e nomes de exibição (minúsculos) dos técnicos para o ID do usuário"""
+        lookup = {}
+        for tech in technicians:
+            user_id = tech['user_id']
+            names = (tech['username'], self._build_display_name(tech),
+                     f"{tech['realname']} {tech['firstname']}".strip())
+            for name in names:
+                if name:
+                    lookup.setdefault(name.strip().lower(), user_id)
+            lookup[user_id] = user_id
+        return lookup
+    
+    def _count_technician_workload(self, rows: List[Dict[str, any]], tech_field_id: str,
+                                   technicians: List[Dict[str, str]]) -> Dict[str, int]:
+        """Agrupa as linhas da varredura em contagens por técnico (um ticket conta para cada atribuído)"""
+        lookup = self._build_technician_lookup(technicians)
+        workload = {}
+        
+        for row in rows:
+            assigned = {lookup.get(value.lower()) for value in self._split_search_values(row.get(str(tech_field_id)))}
+            assigned.discard(None)
+            for user_id in assigned:
+                workload[user_id] = workload.get(user_id, 0) + 1
+        
+        return workload
+    
+    def _build_technician_scan_params(self, tech_field_id: str, start_date: str = None,
+                                      end_date: str = None) -> Dict[str, any]:
+        """Parâmetros da varredura de tickets projetando apenas a coluna de técnico"""
+        search_params = self._build_ticket_count_params(start_date=start_date, end_date=end_date)
+        search_params.pop("range", None)
+        search_params["forcedisplay[0]"] = tech_field_id
+        return search_params
+    
+    def _plan_scan_technician_workload(self, tech_field_id: str, technicians: List[Dict[str, str]],
+                                       start_date: str = None, end_date: str = None) -> Plan:
+        """Plano: conta os tickets de todos os técnicos em uma única varredura paginada da coluna de técnico"""
+        workload = self._mirror_technician_workload(technicians, start_date, end_date)
+        if workload is not None:
+            return workload
+        
+        rows = yield from self._plan_search_all_pages(
+            'Ticket', self._build_technician_scan_params(tech_field_id, start_date, end_date)
+        )
+        if rows is None:
+            return None
+        
+        self.logger.info(f"Varredura de técnicos agregou {len(rows)} tickets")
+        return self._count_technician_workload(rows, tech_field_id, technicians)
+    
+    def _select_top_technicians(self, technicians: List[Dict[str, str]], workload: Dict[str, int],
+                                limit: Optional[int]) -> List[Dict[str, any]]:
+        """Seleciona os técnicos com mais tickets (top-k por heap quando há limite)"""
+        entries = [
+            {
+                'id': int(tech['user_id']),
+                'name': self._build_display_name(tech),
+                'ticket_count': workload.get(tech['user_id'], 0)
+            }
+            for tech in technicians
+        ]
+        
+        if limit is None:
+            return sorted(entries, key=lambda x: x['ticket_count'], reverse=True)
+        return heapq.nlargest(limit, entries, key=lambda x: x['ticket_count'])
+    
+    def _get_technician_ranking_knowledge_base(self, limit: Optional[int] = 10, start_date: str = None,
+                                               end_date: str = None) -> List[Dict[str, any]]:
         """Implementação otimizada do ranking de técnicos baseada em conhecimento"""
+        return self._run_plan(self._plan_technician_ranking(limit, start_date, end_date))
+    
+    def _plan_technician_ranking(self, limit: Optional[int] = 10, start_date: str = None,
+                                 end_date: str = None) -> Plan:
+        """Plano: ranking de técnicos (perfis, diretório em lote, uma varredura e o índice de níveis)"""
         try:
-            if not self._ensure_authenticated():
+            if not (yield IOCall('authenticate')):
                 return []
             
             self.logger.info("Iniciando busca otimizada de técnicos...")
             
             # Passo 1: Buscar usuários com perfil de técnico (Profile_User)
             self.logger.info("Buscando usuários com perfil de técnico (ID 6)...")
-            response = self._make_authenticated_request(
+            response = yield IOCall(
+                'request',
                 'GET',
                 f"{self.glpi_url}/search/Profile_User",
-                params={
-                    "criteria[0][field]": "3",  # Campo profiles_id
-                    "criteria[0][searchtype]": "equals",
-                    "criteria[0][value]": "6",  # ID do perfil técnico
-                    "range": "0-99"
-                }
+                params=self._build_profile_user_params()
             )
             
             if not response or not response.ok:
                 self.logger.error("Falha ao buscar perfis de usuário")
                 return []
             
-            profile_data = response.json()
-            technician_user_ids = []
-            
-            if 'data' in profile_data:
-                for item in profile_data['data']:
-                    user_id = item.get('2')  # Campo users_id
-                    if user_id:
-                        technician_user_ids.append(str(user_id))
-                        self.logger.debug(f"Técnico encontrado: User ID {user_id}")
+            technician_user_ids = self._parse_technician_user_ids(response.json())
             
             self.logger.info(f"Encontrados {len(technician_user_ids)} usuários com perfil técnico")
             
             if not technician_user_ids:
                 return []
             
-            # Passo 2: Buscar usuários ativos
+            # Passo 2: Buscar os usuários ativos em lote e juntar localmente
             self.logger.info("Buscando dados dos usuários ativos...")
-            active_technicians = []
-            
-            # Buscar em lotes para otimizar
-            batch_size = 10
-            for i in range(0, len(technician_user_ids), batch_size):
-                batch = technician_user_ids[i:i+batch_size]
-                
-                for user_id in batch:
-                    try:
-                        response = self._make_authenticated_request(
-                            'GET',
-                            f"{self.glpi_url}/search/User",
-                            params={
-                                "criteria[0][field]": "2",  # Campo ID
-                                "criteria[0][searchtype]": "equals",
-                                "criteria[0][value]": user_id,
-                                "criteria[1][link]": "AND",
-                                "criteria[1][field]": "8",  # Campo is_active
-                                "criteria[1][searchtype]": "equals",
-                                "criteria[1][value]": "1",  # Ativo
-                                "range": "0-0"
-                            }
-                        )
-                        
-                        if response and response.ok:
-                            user_data = response.json()
-                            if 'data' in user_data and user_data['data']:
-                                user_info = user_data['data'][0]
-                                # Mapear campos: 1=name, 9=realname, 10=firstname
-                                username = user_info.get('1', f'User_{user_id}')
-                                realname = user_info.get('9', '')
-                                firstname = user_info.get('10', '')
-                                
-                                active_technicians.append({
-                                    'user_id': user_id,
-                                    'username': username,
-                                    'realname': realname,
-                                    'firstname': firstname
-                                })
-                                self.logger.debug(f"Usuário ativo: {username} (ID: {user_id})")
-                    
-                    except Exception as e:
-                        self.logger.error(f"Erro ao buscar usuário {user_id}: {e}")
-                        continue
+            directory = yield from self._plan_fetch_user_directory(technician_user_ids)
+            active_technicians = [directory[user_id] for user_id in technician_user_ids if user_id in directory]
             
             self.logger.info(f"Encontrados {len(active_technicians)} técnicos ativos")
             
-            # Passo 3: Descobrir campo de técnico
-            tech_field_id = self._discover_tech_field_id()
+            # Passo 3: Descobrir campo de técnico (mantido em cache entre as construções do ranking)
+            tech_field_id = yield from self._plan_discover_tech_field_id()
             if not tech_field_id:
                 self.logger.error("Não foi possível descobrir o campo de técnico")
                 return []
             
-            # Passo 4: Contar tickets para cada técnico
-            ranking = []
-            
-            for tech in active_technicians:
-                user_id = tech['user_id']
-                
-                # Construir nome de exibição
-                if tech['firstname'] and tech['realname']:
-                    display_name = f"{tech['firstname']} {tech['realname']}"
-                elif tech['realname']:
-                    display_name = tech['realname']
-                else:
-                    display_name = tech['username']
-                
-                # Contar tickets usando método otimizado
-                ticket_count = self._count_tickets_by_technician_optimized(user_id, tech_field_id)
-                
-                if ticket_count is not None:
-                    ranking.append({
-                        'id': int(user_id),
-                        'name': display_name,
-                        'ticket_count': ticket_count,
-                        'level': self._get_technician_level(user_id)
-                    })
-                    self.logger.debug(f"Técnico {display_name}: {ticket_count} tickets")
+            # Passo 4: Contar os tickets de todos os técnicos em uma única varredura
+            workload = yield from self._plan_scan_technician_workload(tech_field_id, active_technicians,
+                                                                      start_date, end_date)
+            if workload is None:
+                self.logger.error("Falha na varredura de tickets por técnico")
+                return []
             
-            # Ordenar por contagem de tickets (decrescente)
-            ranking.sort(key=lambda x: x['ticket_count'], reverse=True)
+            # Passo 5: Selecionar os primeiros; níveis vêm do índice usuário → nível em memória
+            ranking = self._select_top_technicians(active_technicians, workload, limit)
+            level_index = yield from self._plan_level_index()
+            for entry in ranking:
+                entry['level'] = level_index.get(str(entry['id']), "Geral")
             
             self.logger.info(f"Ranking gerado com {len(ranking)} técnicos")
-            return ranking[:limit]
+            return ranking
             
         except Exception as e:
             self.logger.error(f"Erro na busca otimizada de técnicos: {e}")
             return []
     
     def _get_technician_level(self, user_id: str) -> str:
-        """Determina o nível de um técnico baseado em seus grupos"""
-        try:
-            # Buscar grupos do usuário
-            response = self._make_authenticated_request(
-                'GET',
-                f"{self.glpi_url}/search/Group_User",
-                params={
-                    "criteria[0][field]": "2",  # Campo users_id
-                    "criteria[0][searchtype]": "equals",
-                    "criteria[0][value]": user_id,
-                    "range": "0-9"
-                }
-            )
-            
-            if response and response.ok:
-                group_data = response.json()
-                if 'data' in group_data:
-                    for item in group_data['data']:
-                        group_id = item.get('3')  # Campo groups_id
-                        if group_id:
-                            # Verificar se o grupo corresponde a algum nível
-                            for level_name, level_group_id in self.service_levels.items():
-                                if str(group_id) == str(level_group_id):
-                                    return level_name
-            
-            return "Geral"  # Nível padrão
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao determinar nível do técnico {user_id}: {e}")
-            return "Geral"
+        """Determina o nível de um técnico pelo índice usuário → nível"""
+        return self._get_level_index().get(str(user_id), "Geral")
     
     def _get_technician_ranking_fallback(self, limit: int = 10) -> List[Dict[str, any]]:
         """Método de fallback para ranking de técnicos"""
@@ -1061,27 +2483,17 @@ class GLPIService:
             response = self._make_authenticated_request(
                 'GET',
                 f"{self.glpi_url}/search/Ticket",
-                params={
-                    "criteria[0][field]": tech_field_id,
-                    "criteria[0][searchtype]": "equals",
-                    "criteria[0][value]": tech_id,
-                    "range": "0-0"  # Só queremos o total
-                }
+                params=self._build_technician_count_params(tech_id, tech_field_id)
             )
             
             if not response or not response.ok:
                 return None
             
-            # Extrair total do header Content-Range
-            content_range = response.headers.get('Content-Range', '')
-            if content_range:
-                try:
-                    # Formato: "0-0/total" ou "0-9/total"
-                    total = int(content_range.split('/')[-1])
-                    self.logger.info(f"Técnico {tech_id}: {total} tickets encontrados")
-                    return total
-                except (ValueError, IndexError):
-                    pass
+            # Extrair total do header Content-Range (formato: "0-0/total" ou "0-9/total")
+            total = self._parse_content_range_total(response.headers.get('Content-Range', ''))
+            if total is not None:
+                self.logger.info(f"Técnico {tech_id}: {total} tickets encontrados")
+                return total
             
             self.logger.warning(f"Content-Range não encontrado para técnico {tech_id}")
             return 0
@@ -1098,48 +2510,126 @@ class GLPIService:
         return self._count_tickets_by_technician_optimized(tech_id, tech_field_id)
 
     def close_session(self):
-        """Encerra a sessão com a API do GLPI"""
-        if self.session_token:
-            try:
-                response = self._make_authenticated_request(
-                    'GET',
-                    f"{self.glpi_url}/killSession"
-                )
-                if response:
-                    self.logger.info("Sessão encerrada com sucesso")
-                else:
-                    self.logger.warning("Falha ao encerrar sessão, mas continuando")
-            except Exception as e:
-                self.logger.error(f"Erro ao encerrar sessão: {e}")
-            finally:
-                self.session_token = None
-                self.token_created_at = None
-                self.token_expires_at = None
+        """Encerra todas as sessões do pool com a API do GLPI"""
+        try:
+            closed = self._session_pool.drain()
+            if closed:
+                self.logger.info(f"{closed} sessão(ões) GLPI encerrada(s) com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao encerrar sessão: {e}")
+        finally:
+            self._set_primary_session(None)
+    
+    def get_connection_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do pool de conexões HTTP com o GLPI"""
+        return self.transport.get_stats()
+    
+    def get_session_pool_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do pool de sessões GLPI (e do broker compartilhado, se houver)"""
+        stats = self._session_pool.get_stats()
+        if self._session_broker is not None:
+            stats['broker'] = self._session_broker.get_stats()
+        return stats
+    
+    def get_cache_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do backend de cache, do índice de buckets diários, dos snapshots e do espelho local"""
+        stats = dict(self._cache_backend.get_stats(), daily_index=self._prefix_index.get_stats())
+        if self._lookup_store is not None:
+            stats['lookups'] = self._lookup_store.get_stats()
+        if self._ticket_mirror is not None:
+            stats['mirror'] = self._ticket_mirror.get_stats()
+        return stats
+    
+    def get_single_flight_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do agrupamento de computações simultâneas"""
+        return self._single_flight.get_stats()
+    
+    def get_upstream_guard_stats(self) -> Dict[str, any]:
+        """Retorna o estado do circuit breaker e o limite adaptativo de requisições ao GLPI"""
+        return self._upstream_guard.get_stats()
+    
+    def get_scheduler_stats(self) -> Dict[str, any]:
+        """Retorna a fila por prioridade, o limite de taxa e os tempos de espera das chamadas ao GLPI"""
+        return self._scheduler.get_stats()
+    
+    def _build_new_tickets_params(self, limit: int) -> Dict[str, any]:
+        """Monta os parâmetros de busca dos tickets com status 'novo'"""
+        # Buscar ID do status 'novo' (geralmente 1)
+        status_id = self.status_map.get('Novo', 1)
+        
+        return {
+            "is_deleted": 0,
+            "range": f"0-{limit-1}",  # Limitar resultados
+            "criteria[0][field]": self.field_ids.get("STATUS", "12"),
+            "criteria[0][searchtype]": "equals",
+            "criteria[0][value]": status_id,
+            "sort": "19",  # Ordenar por data de criação (campo 19)
+            "order": "DESC"  # Mais recentes primeiro
+        }
     
-    def get_new_tickets(self, limit: int = 10) -> List[Dict[str, any]]:
+    @staticmethod
+    def _parse_new_tickets(data: Dict[str, any]) -> List[Dict[str, any]]:
+        """Converte a resposta de /search/Ticket em tickets novos"""
+        tickets = []
+        
+        if 'data' in data and data['data']:
+            for ticket_data in data['data']:
+                # Extrair informações do ticket
+                ticket_info = {
+                    'id': str(ticket_data.get('2', '')),  # ID do ticket
+                    'title': ticket_data.get('1', 'Sem título'),  # Título
+                    'description': ticket_data.get('21', '')[:100] + '...' if len(ticket_data.get('21', '')) > 100 else ticket_data.get('21', ''),  # Descrição truncada
+                    'date': ticket_data.get('15', ''),  # Data de abertura
+                    'requester': ticket_data.get('4', 'Não informado'),  # Solicitante
+                    'priority': ticket_data.get('3', 'Média'),  # Prioridade
+                    'status': 'Novo'
+                }
+                tickets.append(ticket_info)
+        
+        return tickets
+    
+    def get_new_tickets(self, limit: int = 10, use_cache: bool = True) -> List[Dict[str, any]]:
         """Busca tickets com status 'novo' com detalhes completos"""
-        if not self._ensure_authenticated():
-            return []
-            
-        if not self.discover_field_ids():
+        if use_cache and self._is_cache_valid('new_tickets', str(limit)):
+            self.logger.info("Tickets novos carregados do cache")
+            return self._get_cache_data('new_tickets', str(limit))
+        
+        if not use_cache:
+            return self._fetch_new_tickets(limit) or []
+        
+        return self.refresh_new_tickets(limit)
+    
+    def refresh_new_tickets(self, limit: int = 10) -> List[Dict[str, any]]:
+        """Busca novamente os tickets novos e atualiza o cache"""
+        tickets = self._fetch_new_tickets(limit)
+        
+        if tickets is None:
             return []
         
+        self._set_cache_data('new_tickets', tickets, self.new_tickets_cache_ttl, str(limit))
+        return tickets
+    
+    def _fetch_new_tickets(self, limit: int) -> Optional[List[Dict[str, any]]]:
+        """Consulta os tickets novos no GLPI (None em caso de falha)"""
+        return self._run_plan(self._plan_fetch_new_tickets(limit))
+    
+    def _plan_fetch_new_tickets(self, limit: int) -> Plan:
+        """Plano: tickets novos pelo espelho local ou por uma busca em /search/Ticket"""
+        mirrored = self._mirror_new_tickets(limit)
+        if mirrored is not None:
+            return mirrored
+        
+        if not (yield IOCall('authenticate')):
+            return None
+        
+        if not (yield from self._plan_discover_field_ids()):
+            return None
+        
         try:
-            # Buscar ID do status 'novo' (geralmente 1)
-            status_id = self.status_map.get('Novo', 1)
-            
-            # Parâmetros para buscar tickets com status novo
-            search_params = {
-                "is_deleted": 0,
-                "range": f"0-{limit-1}",  # Limitar resultados
-                "criteria[0][field]": self.field_ids.get("STATUS", "12"),
-                "criteria[0][searchtype]": "equals",
-                "criteria[0][value]": status_id,
-                "sort": "19",  # Ordenar por data de criação (campo 19)
-                "order": "DESC"  # Mais recentes primeiro
-            }
+            search_params = self._build_new_tickets_params(limit)
             
-            response = self._make_authenticated_request(
+            response = yield IOCall(
+                'request',
                 'GET',
                 f"{self.glpi_url}/search/Ticket",
                 params=search_params
@@ -1147,31 +2637,290 @@ class GLPIService:
             
             if not response or not response.ok:
                 self.logger.error("Falha ao buscar tickets novos")
-                return []
+                return None
             
-            data = response.json()
-            tickets = []
-            
-            if 'data' in data and data['data']:
-                for ticket_data in data['data']:
-                    # Extrair informações do ticket
-                    ticket_info = {
-                        'id': str(ticket_data.get('2', '')),  # ID do ticket
-                        'title': ticket_data.get('1', 'Sem título'),  # Título
-                        'description': ticket_data.get('21', '')[:100] + '...' if len(ticket_data.get('21', '')) > 100 else ticket_data.get('21', ''),  # Descrição truncada
-                        'date': ticket_data.get('15', ''),  # Data de abertura
-                        'requester': ticket_data.get('4', 'Não informado'),  # Solicitante
-                        'priority': ticket_data.get('3', 'Média'),  # Prioridade
-                        'status': 'Novo'
-                    }
-                    tickets.append(ticket_info)
+            tickets = self._parse_new_tickets(response.json())
             
             self.logger.info(f"Encontrados {len(tickets)} tickets novos")
             return tickets
             
         except Exception as e:
             self.logger.error(f"Erro ao buscar tickets novos: {e}")
-            return []
+            return None
+    
+    def attach_ticket_mirror(self, mirror):
+        """Passa a responder contagens, ranking e tickets novos pelo espelho local quando ele estiver em dia"""
+        self._ticket_mirror = mirror
+    
+    def get_mirror_signature(self) -> str:
+        """Configuração que define os registros do espelho (mudanças exigem nova carga completa)"""
+        return json.dumps({"levels": self.service_levels, "status": self.status_map}, sort_keys=True)
+    
+    def _mirror_columns(self, tech_field_id: str) -> Dict[str, str]:
+        """Colunas de /search/Ticket gravadas no espelho"""
+        return {
+            'id': '2',
+            'name': '1',
+            'status': str(self.field_ids.get("STATUS", "12")),
+            'group': str(self.field_ids.get("GROUP_TECH", "8")),
+            'technician': str(tech_field_id),
+            'priority': '3',
+            'requester': '4',
+            'date_creation': str(self.field_ids.get("DATE_CREATION", "15")),
+            'date_mod': '19'  # Campo 19 = Data da última modificação
+        }
+    
+    def _build_mirror_sync_params(self, tech_field_id: str, modified_since: str = None,
+                                  deleted: bool = False) -> Dict[str, any]:
+        """Parâmetros da varredura do espelho: todos os tickets ou apenas os modificados desde a data informada"""
+        search_params = {"is_deleted": 1 if deleted else 0}
+        if modified_since:
+            search_params.update({
+                "criteria[0][field]": "19",
+                "criteria[0][searchtype]": "morethan",
+                "criteria[0][value]": modified_since
+            })
+        
+        for index, field_id in enumerate(dict.fromkeys(self._mirror_columns(tech_field_id).values())):
+            search_params[f"forcedisplay[{index}]"] = field_id
+        return search_params
+    
+    def _build_mirror_content_params(self, modified_since: str = None) -> Dict[str, any]:
+        """Parâmetros da busca das descrições: apenas tickets novos (os únicos exibidos pelo espelho)"""
+        search_params = {
+            "is_deleted": 0,
+            "criteria[0][field]": self.field_ids.get("STATUS", "12"),
+            "criteria[0][searchtype]": "equals",
+            "criteria[0][value]": self.status_map.get('Novo', 1),
+            "forcedisplay[0]": "2",
+            "forcedisplay[1]": "21"
+        }
+        if modified_since:
+            search_params.update({
+                "criteria[1][link]": "AND",
+                "criteria[1][field]": "19",
+                "criteria[1][searchtype]": "morethan",
+                "criteria[1][value]": modified_since
+            })
+        return search_params
+    
+    @staticmethod
+    def _parse_mirror_contents(rows: List[Dict[str, any]]) -> Dict[int, str]:
+        """Descrição por ID de ticket, truncada ao necessário para a descrição exibida"""
+        contents = {}
+        for row in rows:
+            try:
+                contents[int(row.get('2'))] = str(row.get('21') or '')[:101]
+            except (TypeError, ValueError):
+                continue
+        return contents
+    
+    def _build_mirror_records(self, rows: List[Dict[str, any]], tech_field_id: str, group_lookup: Dict[str, str],
+                              contents: Dict[int, str] = None) -> List[Dict[str, any]]:
+        """Converte as linhas da varredura em registros do espelho (status, níveis e técnicos resolvidos)
+        
+        A descrição vem de contents (apenas tickets novos); os demais ficam sem descrição.
+        """
+        contents = contents or {}
+        columns = self._mirror_columns(tech_field_id)
+        records = []
+        
+        for row in rows:
+            try:
+                ticket_id = int(row.get(columns['id']))
+            except (TypeError, ValueError):
+                continue
+            
+            groups = dict.fromkeys(self._split_search_values(row.get(columns['group'])))
+            records.append({
+                'id': ticket_id,
+                'name': row.get(columns['name']),
+                'status': self.status_map.get(self._resolve_status_name(row.get(columns['status']))),
+                'priority': row.get(columns['priority']),
+                'requester': row.get(columns['requester']),
+                'content': contents.get(ticket_id),
+                'date_creation': row.get(columns['date_creation']),
+                'date_mod': row.get(columns['date_mod']),
+                'groups': [
+                    (group, next(iter(self._resolve_row_levels(group, group_lookup)), None)) for group in groups
+                ],
+                'technicians': sorted({
+                    value.lower() for value in self._split_search_values(row.get(columns['technician']))
+                })
+            })
+        
+        return records
+    
+    def fetch_mirror_records(self, modified_since: str = None, deleted: bool = False) -> Optional[List[Dict[str, any]]]:
+        """Busca no GLPI os registros do espelho (None em caso de falha)"""
+        return self._run_plan(self._plan_fetch_mirror_records(modified_since, deleted))
+    
+    def _plan_fetch_mirror_records(self, modified_since: str = None, deleted: bool = False) -> Plan:
+        """Plano: registros do espelho (tickets alterados, descrições dos novos e níveis dos grupos)"""
+        if not (yield IOCall('authenticate')) or not (yield from self._plan_discover_field_ids()):
+            return None
+        
+        tech_field_id = yield from self._plan_discover_tech_field_id()
+        rows = yield from self._plan_search_all_pages(
+            'Ticket', self._build_mirror_sync_params(tech_field_id, modified_since, deleted)
+        )
+        if rows is None:
+            return None
+        
+        contents = None
+        if not deleted:
+            # Descrições em uma busca à parte, só dos tickets novos (evita baixar o conteúdo de todos)
+            content_rows = yield from self._plan_search_all_pages('Ticket', self._build_mirror_content_params(modified_since))
+            if content_rows is None:
+                return None
+            contents = self._parse_mirror_contents(content_rows)
+        
+        group_lookup = yield from self._plan_group_level_lookup()
+        return self._build_mirror_records(rows, tech_field_id, group_lookup, contents)
+    
+    def _get_ready_mirror(self):
+        """Espelho apto a responder: em dia ou, com o circuito do GLPI aberto, com qualquer atraso"""
+        mirror = self._ticket_mirror
+        if mirror is None:
+            return None
+        
+        if not mirror.is_ready(self.get_mirror_signature(), allow_lag=self._upstream_guard.is_open()):
+            return None
+        return mirror
+    
+    def _mirror_count(self, group_id: int = None, status_id: int = None,
+                      start_date: str = None, end_date: str = None) -> Optional[int]:
+        """Contagem pelo espelho local (None se indisponível ou se o grupo não for um nível)"""
+        mirror = self._get_ready_mirror()
+        if mirror is None:
+            return None
+        
+        level = None
+        if group_id:
+            level = next((name for name, level_group in self.service_levels.items() if level_group == group_id), None)
+            if level is None:
+                return None
+        
+        try:
+            return mirror.count(status_id, level, start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Erro ao contar tickets no espelho local: {e}")
+            return None
+    
+    def _mirror_count_matrix(self, start_date: str = None,
+                             end_date: str = None) -> Optional[Tuple[Dict[str, Dict[str, int]], Dict[str, int]]]:
+        """Matriz nível × status e métricas gerais pelo espelho local"""
+        mirror = self._get_ready_mirror()
+        if mirror is None:
+            return None
+        
+        try:
+            counts = mirror.count_matrix(start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Erro ao agregar tickets no espelho local: {e}")
+            return None
+        
+        metrics_by_level, general_metrics = self._empty_count_matrix()
+        status_names = {status_id: status_name for status_name, status_id in self.status_map.items()}
+        for (level_name, status_id), total in counts.items():
+            status_name = status_names.get(status_id)
+            if status_name is None:
+                continue
+            if level_name is None:
+                general_metrics[status_name] = total
+            elif level_name in metrics_by_level:
+                metrics_by_level[level_name][status_name] = total
+        
+        self.logger.info("Métricas do dashboard obtidas do espelho local")
+        return metrics_by_level, general_metrics
+    
+    def _mirror_technician_workload(self, technicians: List[Dict[str, str]], start_date: str = None,
+                                    end_date: str = None) -> Optional[Dict[str, int]]:
+        """Tickets por técnico pelo espelho local"""
+        mirror = self._get_ready_mirror()
+        if mirror is None:
+            return None
+        
+        try:
+            counts = mirror.technician_workload(start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Erro ao contar tickets por técnico no espelho local: {e}")
+            return None
+        
+        lookup = self._build_technician_lookup(technicians)
+        workload = {}
+        for tech_key, total in counts.items():
+            user_id = lookup.get(tech_key)
+            if user_id is not None:
+                workload[user_id] = workload.get(user_id, 0) + total
+        return workload
+    
+    def _mirror_new_tickets(self, limit: int) -> Optional[List[Dict[str, any]]]:
+        """Tickets novos pelo espelho local, no formato de _parse_new_tickets"""
+        mirror = self._get_ready_mirror()
+        if mirror is None:
+            return None
+        
+        try:
+            rows = mirror.latest_tickets(self.status_map.get('Novo', 1), limit)
+        except Exception as e:
+            self.logger.error(f"Erro ao buscar tickets novos no espelho local: {e}")
+            return None
+        
+        data = []
+        for row in rows:
+            columns = {'2': row['id'], '1': row['name'], '21': row['content'], '15': row['date_creation'],
+                       '4': row['requester'], '3': row['priority']}
+            data.append({field: value for field, value in columns.items() if value is not None})
+        return self._parse_new_tickets({'data': data})
+    
+    def _technician_display_names(self) -> Dict[str, str]:
+        """Nome de exibição por valor (minúsculo) da coluna de técnico, pelo diretório de técnicos em cache"""
+        cached_directory = self._get_cache_data('technician_directory') or {}
+        technicians = list((cached_directory.get('entries') or {}).values())
+        names = {tech['user_id']: self._build_display_name(tech) for tech in technicians}
+        return {key: names[user_id] for key, user_id in self._build_technician_lookup(technicians).items()}
+    
+    def get_ticket_breakdown(self, dimensions: List[str], start_date: str = None, end_date: str = None,
+                             status: str = None, level: str = None, priority: str = None,
+                             limit: int = None) -> Optional[Dict[str, any]]:
+        """Contagens de tickets por status, nível, grupo, prioridade, técnico e/ou dia (colunas em memória do espelho)
+        
+        Retorna None se o espelho ou suas colunas em memória não estiverem disponíveis;
+        dimensões ou status inválidos levantam ValueError.
+        """
+        mirror = self._get_ready_mirror()
+        if mirror is None:
+            return None
+        
+        status_id = None
+        if status:
+            status_id = self.status_map.get(self._resolve_status_name(status))
+            if status_id is None:
+                raise ValueError(f"Status inválido: {status}")
+        
+        result = mirror.breakdown(tuple(dimensions), status=status_id, level=level, priority=priority,
+                                  start_date=start_date, end_date=end_date)
+        if result is None:
+            return None
+        counts, total_tickets = result
+        
+        status_names = {status_id: status_name for status_name, status_id in self.status_map.items()}
+        technician_names = self._technician_display_names() if 'technician' in dimensions else {}
+        
+        rows = []
+        for key, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            row = {}
+            for dimension, value in zip(dimensions, key):
+                if dimension == 'status':
+                    value = status_names.get(value, value)
+                elif dimension == 'technician':
+                    value = technician_names.get(value, value)
+                row[dimension] = value
+            row['count'] = count
+            rows.append(row)
+        
+        return {"dimensions": list(dimensions), "rows": rows, "total_tickets": total_tickets, "total_groups": len(counts)}
     
     def get_system_status(self) -> Dict[str, any]:
         """Retorna status do sistema GLPI"""
@@ -1185,7 +2934,13 @@ class GLPIService:
                     "status": "online",
                     "message": "GLPI conectado e autenticado",
                     "response_time": response_time,
-                    "token_valid": not self._is_token_expired()
+                    "token_valid": not self._is_token_expired(),
+                    "connection_pool": self.get_connection_stats(),
+                    "session_pool": self.get_session_pool_stats(),
+                    "single_flight": self.get_single_flight_stats(),
+                    "cache": self.get_cache_stats(),
+                    "upstream_guard": self.get_upstream_guard_stats(),
+                    "scheduler": self.get_scheduler_stats()
                 }
             else:
                 response_time = time.time() - start_time
@@ -1193,7 +2948,13 @@ class GLPIService:
                     "status": "warning",
                     "message": "GLPI acessível mas falha na autenticação",
                     "response_time": response_time,
-                    "token_valid": False
+                    "token_valid": False,
+                    "connection_pool": self.get_connection_stats(),
+                    "session_pool": self.get_session_pool_stats(),
+                    "single_flight": self.get_single_flight_stats(),
+                    "cache": self.get_cache_stats(),
+                    "upstream_guard": self.get_upstream_guard_stats(),
+                    "scheduler": self.get_scheduler_stats()
                 }
                 
         except Exception as e:
@@ -1201,5 +2962,6 @@ class GLPIService:
                 "status": "offline",
                 "message": f"Erro de conexão: {str(e)}",
                 "response_time": None,
-                "token_valid": False
+                "token_valid": False,
+                "upstream_guard": self.get_upstream_guard_stats()
             }
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # fcntl só existe em sistemas POSIX: sem ele o broker em arquivo fica indisponível
+    fcntl = None
+
+try:
+    import redis
+except ImportError:  # Redis é opcional: sem o pacote, apenas o broker em arquivo fica disponível
+    redis = None
+
+logger = logging.getLogger('glpi_session_broker')
+
+
+class GLPISessionBroker(ABC):
+    """Sessões GLPI compartilhadas entre os workers, com estado protegido por um lock entre processos
+    
+    O broker mantém `size` slots de sessão. Cada sessão do pool local fica presa a
+    um slot (as novas ocupam slots que o worker ainda não usa, em rodízio) e suas
+    renovações voltam para o mesmo slot. O primeiro worker que encontra um slot
+    vazio ou perto do vencimento reserva o slot e abre a nova sessão fora do lock;
+    os demais reutilizam o token ainda válido ou aguardam a reserva. Tokens
+    substituídos são encerrados após um período de carência e, quando o último
+    worker registrado sai, todas as sessões compartilhadas são encerradas.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, create_token: Callable[[], Optional[str]], kill_token: Callable[[str], bool],
+                 size: int = 4, session_timeout: float = 3600, refresh_before: float = 3180, grace: float = 300,
+                 create_timeout: float = 30, poll_interval: float = 0.2):
+        self.size = max(1, size)
+        self.session_timeout = session_timeout
+        self.refresh_before = refresh_before  # Idade a partir da qual o slot recebe uma nova sessão
+        self.grace = grace  # Tempo até encerrar um token substituído (workers ainda podem usá-lo)
+        self.create_timeout = create_timeout  # Validade da reserva de um slot durante o initSession
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        
+        self._create_token = create_token
+        self._kill_token = kill_token
+        self._thread_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self._counter = 0
+        self._offset = 0
+        self._held: Dict[str, str] = {}  # Token em uso no pool local -> slot
+        self._fallback_tokens = set()
+        self._stats = {"leases": 0, "created": 0, "reused": 0, "waits": 0, "invalidated": 0, "killed": 0,
+                       "fallbacks": 0}
+    
+    # ------------------------------------------------------------------
+    # Armazenamento do estado (implementado por cada backend)
+    # ------------------------------------------------------------------
+    
+    @abstractmethod
+    def _backend_lock(self):
+        """Context manager do lock entre processos"""
+    
+    @abstractmethod
+    def _read_state(self) -> Dict[str, Any]:
+        """Lê o estado compartilhado (chamado sob o lock)"""
+    
+    @abstractmethod
+    def _write_state(self, state: Dict[str, Any]):
+        """Grava o estado compartilhado (chamado sob o lock)"""
+    
+    @contextmanager
+    def _locked_state(self):
+        """Lê o estado sob o lock entre processos e o grava ao final do bloco"""
+        with self._thread_lock, self._backend_lock():
+            state = self._read_state()
+            state.setdefault('slots', {})
+            state.setdefault('retired', [])
+            state.setdefault('workers', {})
+            state.setdefault('creating', {})
+            yield state
+            self._write_state(state)
+    
+    # ------------------------------------------------------------------
+    # Operações
+    # ------------------------------------------------------------------
+    
+    def _prune(self, state: Dict[str, Any], now: float) -> List[str]:
+        """Remove workers inativos e retira os tokens aposentados cuja carência terminou"""
+        for worker_id, last_seen in list(state['workers'].items()):
+            if now - last_seen > self.session_timeout:
+                del state['workers'][worker_id]
+        
+        due = [item['token'] for item in state['retired'] if item['kill_at'] <= now]
+        state['retired'] = [item for item in state['retired'] if item['kill_at'] > now]
+        return due
+    
+    def register(self):
+        """Registra este worker (contagem de referências das sessões compartilhadas)"""
+        with self._locked_state() as state:
+            now = time.time()
+            to_kill = self._prune(state, now)
+            state['workers'][self.worker_id] = now
+            # Workers começam o rodízio em slots diferentes
+            self._offset = len(state['workers']) - 1
+        
+        self._kill_all(to_kill)
+        logger.info(f"Worker {self.worker_id} registrado no broker de sessões ({self.name})")
+    
+    def _pick_slot(self, previous_token: Optional[str]) -> str:
+        """Slot da sessão renovada ou, para uma sessão nova, o próximo slot que o pool local não usa"""
+        with self._counter_lock:
+            slot = self._held.pop(previous_token, None) if previous_token else None
+            if slot is not None:
+                return slot
+            
+            held = set(self._held.values())
+            for _ in range(self.size):
+                slot = str((self._offset + self._counter) % self.size)
+                self._counter += 1
+                if slot not in held:
+                    break
+            return slot
+    
+    def lease(self, previous_token: str = None) -> Optional[Tuple[str, float]]:
+        """Retorna (token, criado_em) de um slot compartilhado, abrindo a sessão se necessário
+        
+        previous_token identifica a sessão que está sendo renovada (401 ou renovação
+        antecipada): o novo token vem do mesmo slot, nunca de um que o pool local já tem.
+        """
+        slot = self._pick_slot(previous_token)
+        
+        try:
+            result, to_kill = self._lease_slot(slot, previous_token)
+        except Exception as e:
+            # Broker indisponível: sessão local, encerrada por este worker
+            logger.warning(f"Broker de sessões indisponível ({e}), abrindo sessão local")
+            self._stats["fallbacks"] += 1
+            token = self._create_token()
+            if not token:
+                return None
+            self._fallback_tokens.add(token)
+            return token, time.time()
+        
+        self._stats["leases"] += 1
+        self._kill_all(to_kill)
+        if result is not None:
+            with self._counter_lock:
+                self._held[result[0]] = slot
+        return result
+    
+    def _usable(self, current: Optional[Dict[str, Any]], previous_token: Optional[str], now: float,
+                max_age: float) -> bool:
+        return bool(current) and current['token'] != previous_token and now - current['created_at'] < max_age
+    
+    def _lease_slot(self, slot: str, previous_token: Optional[str]) -> Tuple[Optional[Tuple[str, float]], List[str]]:
+        """Reutiliza o token do slot ou reserva o slot e abre a sessão fora do lock entre processos"""
+        to_kill = []
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                to_kill += self._prune(state, now)
+                state['workers'][self.worker_id] = now
+                current = state['slots'].get(slot)
+                
+                if self._usable(current, previous_token, now, self.refresh_before):
+                    self._stats["reused"] += 1
+                    return (current['token'], current['created_at']), to_kill
+                
+                reservation = state['creating'].get(slot)
+                if not reservation or reservation['until'] <= now:
+                    state['creating'][slot] = {'worker': self.worker_id, 'until': now + self.create_timeout}
+                    break
+                
+                # Outro worker está abrindo a sessão deste slot: o token atual serve enquanto for válido
+                if self._usable(current, previous_token, now, self.session_timeout):
+                    self._stats["reused"] += 1
+                    return (current['token'], current['created_at']), to_kill
+            
+            self._stats["waits"] += 1
+            time.sleep(self.poll_interval)
+        
+        # initSession fora do lock: os demais workers não ficam parados atrás de uma sessão lenta
+        token = None
+        try:
+            token = self._create_token()
+        except Exception as e:
+            logger.error(f"Erro ao abrir sessão GLPI para o broker: {e}")
+        
+        try:
+            with self._locked_state() as state:
+                now = time.time()
+                if state['creating'].get(slot, {}).get('worker') == self.worker_id:
+                    del state['creating'][slot]
+                current = state['slots'].get(slot)
+                if token:
+                    if current:
+                        state['retired'].append({'token': current['token'], 'kill_at': now + self.grace})
+                    state['slots'][slot] = {'token': token, 'created_at': now}
+        except Exception:
+            if token:
+                # A sessão já existe no GLPI: fica local a este worker em vez de vazar
+                self._fallback_tokens.add(token)
+                logger.warning("Broker de sessões indisponível ao registrar a nova sessão, mantida como local")
+                return (token, time.time()), to_kill
+            raise
+        
+        if token:
+            self._stats["created"] += 1
+            return (token, now), to_kill
+        
+        # Falha ao abrir a sessão: o token atual continua em uso enquanto for válido
+        if self._usable(current, previous_token, now, self.session_timeout):
+            return (current['token'], current['created_at']), to_kill
+        return None, to_kill
+    
+    def invalidate(self, token: str):
+        """Descarta um token rejeitado pelo GLPI (401) para que o slot receba uma nova sessão"""
+        try:
+            with self._locked_state() as state:
+                for slot, current in list(state['slots'].items()):
+                    if current['token'] == token:
+                        del state['slots'][slot]
+                        self._stats["invalidated"] += 1
+        except Exception as e:
+            logger.warning(f"Não foi possível invalidar o token no broker: {e}")
+    
+    def release(self, token: str) -> bool:
+        """Chamado quando o pool local descarta a sessão; as compartilhadas são encerradas pelo broker"""
+        with self._counter_lock:
+            self._held.pop(token, None)
+        if token in self._fallback_tokens:
+            self._fallback_tokens.discard(token)
+            return self._kill_token(token)
+        return True
+    
+    def unregister(self):
+        """Remove este worker; o último a sair encerra todas as sessões compartilhadas"""
+        to_kill = list(self._fallback_tokens)
+        self._fallback_tokens.clear()
+        
+        try:
+            with self._locked_state() as state:
+                now = time.time()
+                to_kill += self._prune(state, now)
+                state['workers'].pop(self.worker_id, None)
+                
+                if not state['workers']:
+                    to_kill += [current['token'] for current in state['slots'].values()]
+                    to_kill += [item['token'] for item in state['retired']]
+                    state['slots'] = {}
+                    state['retired'] = []
+        except Exception as e:
+            logger.warning(f"Não foi possível remover o worker do broker: {e}")
+        
+        self._kill_all(to_kill)
+        if to_kill:
+            logger.info(f"{len(to_kill)} sessão(ões) GLPI encerrada(s) pelo broker")
+    
+    def _kill_all(self, tokens: List[str]):
+        for token in tokens:
+            try:
+                if self._kill_token(token):
+                    self._stats["killed"] += 1
+            except Exception as e:
+                logger.error(f"Erro ao encerrar sessão GLPI do broker: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o tipo do broker e a contabilidade das sessões deste worker"""
+        return dict(self._stats, backend=self.name, worker_id=self.worker_id)
+
+
+class RedisSessionBroker(GLPISessionBroker):
+    """Broker com o estado em uma chave do Redis e lock distribuído (redis-py Lock)"""
+    
+    name = 'redis'
+    
+    def __init__(self, client, key_prefix: str = 'glpi_dashboard:', **kwargs):
+        super().__init__(**kwargs)
+        self._client = client
+        self._state_key = f"{key_prefix}glpi_sessions"
+        self._lock_name = f"{key_prefix}glpi_sessions:lock"
+    
+    @contextmanager
+    def _backend_lock(self):
+        # timeout: o lock expira se o worker morrer com ele em mãos
+        lock = self._client.lock(self._lock_name, timeout=60, blocking_timeout=30)
+        if not lock.acquire():
+            raise TimeoutError("Tempo esgotado aguardando o lock do broker de sessões")
+        try:
+            yield
+        finally:
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                pass
+    
+    def _read_state(self) -> Dict[str, Any]:
+        raw = self._client.get(self._state_key)
+        try:
+            return json.loads(raw) if raw else {}
+        except ValueError:
+            logger.error("Estado inválido do broker de sessões no Redis, reiniciando")
+            return {}
+    
+    def _write_state(self, state: Dict[str, Any]):
+        self._client.set(self._state_key, json.dumps(state))
+
+
+class FileSessionBroker(GLPISessionBroker):
+    """Broker com o estado em um arquivo JSON protegido por flock (workers de uma mesma máquina)"""
+    
+    name = 'file'
+    
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+        self._lock_path = f"{path}.lock"
+    
+    @contextmanager
+    def _backend_lock(self):
+        # O flock é liberado pelo sistema se o processo morrer
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._path) as state_file:
+                return json.load(state_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.error(f"Estado inválido do broker de sessões em {self._path}, reiniciando")
+            return {}
+    
+    def _write_state(self, state: Dict[str, Any]):
+        # Tokens de sessão: arquivo legível apenas pelo usuário do processo
+        tmp_path = f"{self._path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self._path)
+
+
+def create_session_broker(config, create_token: Callable[[], Optional[str]], kill_token: Callable[[str], bool],
+                          size: int, session_timeout: float) -> Optional[GLPISessionBroker]:
+    """Cria o broker configurado (GLPI_SESSION_BROKER: none, redis ou file)"""
+    broker_type = getattr(config, 'GLPI_SESSION_BROKER', 'none')
+    if broker_type not in ('redis', 'file'):
+        return None
+    
+    # Slots renovados antes da primeira renovação antecipada possível dos pools locais
+    options = dict(
+        create_token=create_token,
+        kill_token=kill_token,
+        size=size,
+        session_timeout=session_timeout,
+        refresh_before=session_timeout - config.GLPI_SESSION_REFRESH_LEAD - config.GLPI_SESSION_REFRESH_JITTER,
+        grace=config.GLPI_SESSION_REFRESH_LEAD
+    )
+    
+    if broker_type == 'redis':
+        if redis is None:
+            logger.warning("Pacote redis não instalado, broker de sessões desabilitado")
+            return None
+        try:
+            client = redis.from_url(
+                config.REDIS_URL,
+                socket_connect_timeout=config.GLPI_CACHE_REDIS_TIMEOUT,
+                socket_timeout=config.GLPI_CACHE_REDIS_TIMEOUT
+            )
+            client.ping()
+        except redis.RedisError as e:
+            logger.warning(f"Redis não disponível ({e}), broker de sessões desabilitado")
+            return None
+        broker = RedisSessionBroker(client, getattr(config, 'CACHE_KEY_PREFIX', 'glpi_dashboard:'), **options)
+    else:
+        if fcntl is None:
+            logger.warning("flock indisponível nesta plataforma, broker de sessões desabilitado")
+            return None
+        broker = FileSessionBroker(config.GLPI_SESSION_BROKER_FILE, **options)
+    
+    try:
+        broker.register()
+    except Exception as e:
+        logger.warning(f"Falha ao registrar no broker de sessões ({e}), usando sessões locais")
+        return None
+    
+    return broker
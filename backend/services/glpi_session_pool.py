@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('glpi_session_pool')
+
+
+class GLPISession:
+    """Sessão autenticada do GLPI (token obtido via initSession)"""
+    
+    def __init__(self, token: str, created_at: float = None):
+        self.token = token
+        self.created_at = created_at or time.time()
+        self.refresh_at = float('inf')  # Renovação antecipada em segundo plano (definida pelo pool)
+        self.requests = 0
+    
+    def is_expired(self, session_timeout: float) -> bool:
+        """Verifica se a sessão passou do tempo de vida configurado"""
+        return (time.time() - self.created_at) >= session_timeout
+
+
+def unpack_session_token(result) -> Tuple[Optional[str], Optional[float]]:
+    """create_token devolve o token ou (token, criado_em) quando a sessão é compartilhada entre workers"""
+    if isinstance(result, tuple):
+        return result
+    return result, None
+
+
+class _SessionPoolState:
+    """Contabilidade comum aos pools síncrono e assíncrono"""
+    
+    refresh_retry_delay = 30  # Segundos até tentar de novo uma renovação antecipada que falhou
+    
+    def __init__(self, size: int, session_timeout: float, refresh_lead: float = 0, refresh_jitter: float = 0):
+        self.size = max(1, size)
+        self.session_timeout = session_timeout
+        self.refresh_lead = refresh_lead
+        self.refresh_jitter = refresh_jitter
+        self._sessions: List[GLPISession] = []
+        self._idle = deque()
+        self._creating = 0
+        self._stats = {"created": 0, "renewed": 0, "refreshed": 0, "refresh_failures": 0,
+                       "expired": 0, "evicted": 0, "killed": 0, "waits": 0}
+    
+    def _next_refresh_at(self, created_at: float) -> float:
+        # O jitter espalha as renovações para que as sessões não sejam renovadas todas juntas
+        return created_at + self.session_timeout - self.refresh_lead - random.uniform(0, self.refresh_jitter)
+    
+    def _swap_token(self, session: GLPISession, token: str, created_at: float = None) -> str:
+        """Troca o token da sessão (sob o lock do pool) e retorna o anterior"""
+        old_token = session.token
+        session.token = token
+        session.created_at = created_at or time.time()
+        session.refresh_at = self._next_refresh_at(session.created_at)
+        return old_token
+    
+    def _take_due(self, now: float) -> List[GLPISession]:
+        """Retira das ociosas as sessões cuja renovação antecipada venceu"""
+        due = [session for session in self._idle if session.refresh_at <= now]
+        for session in due:
+            self._idle.remove(session)
+        return due
+    
+    def _finish_refresh(self, session: GLPISession, token: Optional[str], now: float,
+                        created_at: float = None) -> Tuple[Optional[str], bool]:
+        """Aplica o resultado da renovação e devolve a sessão ao pool
+        
+        Retorna (token a encerrar, sessão expirada que deve ser encerrada).
+        """
+        if not token:
+            session.refresh_at = now + self.refresh_retry_delay
+            self._stats["refresh_failures"] += 1
+            return None, self._put_back(session)
+        
+        if session not in self._sessions:
+            return token, False  # Pool drenado durante a renovação: descartar o novo token
+        
+        self._stats["refreshed"] += 1
+        return self._swap_token(session, token, created_at), self._put_back(session)
+    
+    def _next_due(self) -> Optional[float]:
+        return min((session.refresh_at for session in self._sessions), default=None)
+    
+    def _take_idle(self, expired: List[GLPISession]) -> Optional[GLPISession]:
+        """Retira uma sessão ociosa válida, separando as expiradas para encerramento"""
+        while self._idle:
+            session = self._idle.popleft()
+            if not session.is_expired(self.session_timeout):
+                return session
+            self._sessions.remove(session)
+            self._stats["expired"] += 1
+            expired.append(session)
+        return None
+    
+    def _can_create(self) -> bool:
+        return len(self._sessions) + self._creating < self.size
+    
+    def _register(self, token: str, created_at: float = None) -> GLPISession:
+        session = GLPISession(token, created_at)
+        session.refresh_at = self._next_refresh_at(session.created_at)
+        self._sessions.append(session)
+        self._stats["created"] += 1
+        return session
+    
+    def _adopt(self, token: str, created_at: float = None,
+               evicted: List[GLPISession] = None) -> GLPISession:
+        """Incorpora uma sessão criada fora do pool (ex.: autenticação principal)"""
+        for session in self._sessions:
+            if session.token == token:
+                return session
+        
+        session = self._register(token, created_at)
+        
+        # Pool cheio: a sessão adotada substitui a ociosa mais antiga; sem ociosa, o excesso
+        # é encerrado na próxima devolução (_put_back)
+        if len(self._sessions) > self.size and self._idle and evicted is not None:
+            old = self._idle.popleft()
+            self._sessions.remove(old)
+            self._stats["evicted"] += 1
+            evicted.append(old)
+        
+        self._idle.append(session)
+        return session
+    
+    def _put_back(self, session: GLPISession) -> bool:
+        """Devolve a sessão ao pool; retorna True se ela expirou ou excede o tamanho e deve ser encerrada"""
+        if session not in self._sessions:
+            return False  # Já descartada (drain ou falha na renovação)
+        if session.is_expired(self.session_timeout):
+            self._sessions.remove(session)
+            self._stats["expired"] += 1
+            return True
+        if len(self._sessions) > self.size:
+            # Excesso deixado por uma adoção com todas as sessões alugadas
+            self._sessions.remove(session)
+            self._stats["evicted"] += 1
+            return True
+        self._idle.append(session)
+        return False
+    
+    def _remove(self, session: GLPISession):
+        if session in self._sessions:
+            self._sessions.remove(session)
+        if session in self._idle:
+            self._idle.remove(session)
+    
+    def _drain_all(self) -> List[GLPISession]:
+        sessions = list(self._sessions)
+        self._sessions.clear()
+        self._idle.clear()
+        return sessions
+    
+    def _snapshot(self) -> Dict[str, any]:
+        return dict(
+            self._stats,
+            size=self.size,
+            open=len(self._sessions),
+            idle=len(self._idle),
+            leased=len(self._sessions) - len(self._idle)
+        )
+
+
+class GLPISessionPool(_SessionPoolState):
+    """Pool de N sessões autenticadas do GLPI, alugadas uma por requisição
+    
+    O GLPI mantém a sessão PHP bloqueada enquanto atende uma requisição; usar
+    sessões distintas permite que chamadas paralelas sejam de fato paralelas.
+    Nas renovações create_token recebe o token atual da sessão, para que o broker
+    compartilhado a renove no mesmo slot.
+    """
+    
+    def __init__(self, create_token: Callable[..., Optional[str]], kill_token: Callable[[str], bool],
+                 size: int = 4, session_timeout: float = 3600, refresh_lead: float = 0, refresh_jitter: float = 0):
+        super().__init__(size, session_timeout, refresh_lead, refresh_jitter)
+        self._create_token = create_token
+        self._kill_token = kill_token
+        self._cond = threading.Condition()
+    
+    def adopt(self, token: str, created_at: float = None) -> GLPISession:
+        """Incorpora ao pool uma sessão criada fora dele (ex.: autenticação principal)"""
+        evicted = []
+        with self._cond:
+            session = self._adopt(token, created_at, evicted)
+            self._cond.notify()
+        self._kill_all(evicted)
+        return session
+    
+    def acquire(self, timeout: float = None) -> Optional[GLPISession]:
+        """Aluga uma sessão, criando uma nova se houver espaço no pool"""
+        deadline = time.time() + timeout if timeout is not None else None
+        allow_create = True
+        
+        while True:
+            expired = []
+            session = None
+            create = False
+            
+            with self._cond:
+                while True:
+                    session = self._take_idle(expired)
+                    if session is not None:
+                        session.requests += 1
+                        break
+                    
+                    if allow_create and self._can_create():
+                        self._creating += 1
+                        create = True
+                        break
+                    
+                    if not allow_create and not self._sessions and not self._creating:
+                        break  # Nenhuma sessão disponível nem a caminho
+                    
+                    remaining = deadline - time.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        logger.warning("Tempo esgotado aguardando sessão GLPI livre no pool")
+                        break
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+            
+            self._kill_all(expired)
+            if not create:
+                return session
+            
+            # Criação da sessão fora do lock para não bloquear as demais
+            token = created_at = None
+            try:
+                token, created_at = unpack_session_token(self._create_token())
+            finally:
+                with self._cond:
+                    self._creating -= 1
+                    if token:
+                        session = self._register(token, created_at)
+                        session.requests += 1
+                    self._cond.notify()
+            
+            if token:
+                logger.info(f"Nova sessão GLPI criada no pool ({len(self._sessions)}/{self.size})")
+                return session
+            
+            # Falha ao criar: aguardar uma das sessões existentes
+            allow_create = False
+    
+    def release(self, session: GLPISession):
+        """Devolve a sessão ao pool"""
+        with self._cond:
+            must_close = self._put_back(session)
+            self._cond.notify()
+        if must_close:
+            self._kill_all([session])
+    
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """Context manager que aluga uma sessão e a devolve ao final"""
+        session = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            if session is not None:
+                self.release(session)
+    
+    def renew(self, session: GLPISession, kill_old: bool = False) -> bool:
+        """Renova apenas esta sessão (novo initSession), mantendo-a alugada"""
+        token, created_at = unpack_session_token(self._create_token(session.token))
+        if not token:
+            with self._cond:
+                self._remove(session)
+                self._cond.notify()
+            return False
+        
+        with self._cond:
+            old_token = self._swap_token(session, token, created_at)
+            self._stats["renewed"] += 1
+        
+        if kill_old:
+            self._kill_token(old_token)
+        return True
+    
+    def refresh_due(self, on_swap: Callable[[str, GLPISession], None] = None) -> int:
+        """Renova antecipadamente as sessões ociosas próximas do vencimento
+        
+        A sessão sai do pool durante a renovação, recebe o novo token de forma
+        atômica e só então o token antigo é encerrado (após on_swap).
+        """
+        now = time.time()
+        with self._cond:
+            due = self._take_due(now)
+        
+        refreshed = 0
+        for session in due:
+            token = created_at = None
+            try:
+                token, created_at = unpack_session_token(self._create_token(session.token))
+            except Exception as e:
+                logger.error(f"Erro na renovação antecipada da sessão GLPI: {e}")
+            
+            with self._cond:
+                old_token, must_close = self._finish_refresh(session, token, now, created_at)
+                self._cond.notify()
+            
+            if token and old_token != token:
+                refreshed += 1
+                if on_swap is not None:
+                    on_swap(old_token, session)
+            if old_token:
+                self._kill_token(old_token)
+            if must_close:
+                self._kill_all([session])
+        
+        if refreshed:
+            logger.info(f"{refreshed} sessão(ões) GLPI renovada(s) antes do vencimento")
+        return refreshed
+    
+    def next_refresh_at(self) -> Optional[float]:
+        """Momento da próxima renovação antecipada (None se o pool estiver vazio)"""
+        with self._cond:
+            return self._next_due()
+    
+    def drain(self) -> int:
+        """Encerra todas as sessões do pool (killSession), inclusive as alugadas"""
+        with self._cond:
+            sessions = self._drain_all()
+            self._cond.notify_all()
+        self._kill_all(sessions)
+        return len(sessions)
+    
+    def _kill_all(self, sessions: List[GLPISession]):
+        for session in sessions:
+            try:
+                if self._kill_token(session.token):
+                    self._stats["killed"] += 1
+            except Exception as e:
+                logger.error(f"Erro ao encerrar sessão GLPI do pool: {e}")
+    
+    def get_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do pool de sessões"""
+        with self._cond:
+            return self._snapshot()
+
+
+class AsyncGLPISessionPool(_SessionPoolState):
+    """Versão asyncio do pool de sessões do GLPI"""
+    
+    def __init__(self, create_token: Callable[..., Awaitable[Optional[str]]],
+                 kill_token: Callable[[str], Awaitable[bool]],
+                 size: int = 4, session_timeout: float = 3600, refresh_lead: float = 0, refresh_jitter: float = 0):
+        super().__init__(size, session_timeout, refresh_lead, refresh_jitter)
+        self._create_token = create_token
+        self._kill_token = kill_token
+        self._cond = None
+    
+    def _condition(self) -> asyncio.Condition:
+        # Criada sob demanda para ficar associada ao event loop em uso
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+    
+    async def adopt(self, token: str, created_at: float = None) -> GLPISession:
+        """Incorpora ao pool uma sessão criada fora dele (ex.: autenticação principal)"""
+        evicted = []
+        cond = self._condition()
+        async with cond:
+            session = self._adopt(token, created_at, evicted)
+            cond.notify()
+        await self._kill_all(evicted)
+        return session
+    
+    async def acquire(self) -> Optional[GLPISession]:
+        """Aluga uma sessão, criando uma nova se houver espaço no pool"""
+        cond = self._condition()
+        allow_create = True
+        
+        while True:
+            expired = []
+            session = None
+            create = False
+            
+            async with cond:
+                while True:
+                    session = self._take_idle(expired)
+                    if session is not None:
+                        session.requests += 1
+                        break
+                    if allow_create and self._can_create():
+                        self._creating += 1
+                        create = True
+                        break
+                    if not allow_create and not self._sessions and not self._creating:
+                        break
+                    self._stats["waits"] += 1
+                    await cond.wait()
+            
+            await self._kill_all(expired)
+            if not create:
+                return session
+            
+            token = created_at = None
+            try:
+                token, created_at = unpack_session_token(await self._create_token())
+            finally:
+                async with cond:
+                    self._creating -= 1
+                    if token:
+                        session = self._register(token, created_at)
+                        session.requests += 1
+                    cond.notify()
+            
+            if token:
+                return session
+            
+            allow_create = False
+    
+    async def release(self, session: GLPISession):
+        """Devolve a sessão ao pool"""
+        cond = self._condition()
+        async with cond:
+            must_close = self._put_back(session)
+            cond.notify()
+        if must_close:
+            await self._kill_all([session])
+    
+    @asynccontextmanager
+    async def lease(self):
+        """Context manager assíncrono que aluga uma sessão e a devolve ao final"""
+        session = await self.acquire()
+        try:
+            yield session
+        finally:
+            if session is not None:
+                await self.release(session)
+    
+    async def renew(self, session: GLPISession) -> bool:
+        """Renova apenas esta sessão (novo initSession), mantendo-a alugada"""
+        token, created_at = unpack_session_token(await self._create_token(session.token))
+        if not token:
+            async with self._condition():
+                self._remove(session)
+                self._condition().notify()
+            return False
+        
+        self._swap_token(session, token, created_at)
+        self._stats["renewed"] += 1
+        return True
+    
+    async def refresh_due(self, on_swap: Callable[[str, GLPISession], None] = None) -> int:
+        """Renova antecipadamente as sessões ociosas próximas do vencimento"""
+        now = time.time()
+        cond = self._condition()
+        async with cond:
+            due = self._take_due(now)
+        
+        refreshed = 0
+        for session in due:
+            token = created_at = None
+            try:
+                token, created_at = unpack_session_token(await self._create_token(session.token))
+            except Exception as e:
+                logger.error(f"Erro na renovação antecipada da sessão GLPI: {e}")
+            
+            async with cond:
+                old_token, must_close = self._finish_refresh(session, token, now, created_at)
+                cond.notify()
+            
+            if token and old_token != token:
+                refreshed += 1
+                if on_swap is not None:
+                    on_swap(old_token, session)
+            if old_token:
+                await self._kill_token(old_token)
+            if must_close:
+                await self._kill_all([session])
+        
+        if refreshed:
+            logger.info(f"{refreshed} sessão(ões) GLPI renovada(s) antes do vencimento")
+        return refreshed
+    
+    def next_refresh_at(self) -> Optional[float]:
+        """Momento da próxima renovação antecipada (None se o pool estiver vazio)"""
+        return self._next_due()
+    
+    async def drain(self) -> int:
+        """Encerra todas as sessões do pool (killSession)"""
+        async with self._condition():
+            sessions = self._drain_all()
+            self._condition().notify_all()
+        await self._kill_all(sessions)
+        return len(sessions)
+    
+    async def _kill_all(self, sessions: List[GLPISession]):
+        for session in sessions:
+            try:
+                if await self._kill_token(session.token):
+                    self._stats["killed"] += 1
+            except Exception as e:
+                logger.error(f"Erro ao encerrar sessão GLPI do pool: {e}")
+    
+    def get_stats(self) -> Dict[str, any]:
+        """Retorna estatísticas do pool de sessões"""
+        return self._snapshot()
@@ -0,0 +1,563 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.upstream_scheduler import RequestPriority, priority_scope
+
+logger = logging.getLogger('ticket_mirror')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    name,
+    status INTEGER,
+    priority,
+    requester,
+    content TEXT,
+    date_creation TEXT,
+    date_mod TEXT
+);
+CREATE TABLE IF NOT EXISTS ticket_groups (
+    ticket_id INTEGER NOT NULL,
+    group_name TEXT NOT NULL,
+    level TEXT
+);
+CREATE TABLE IF NOT EXISTS ticket_technicians (
+    ticket_id INTEGER NOT NULL,
+    tech_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS ticket_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id INTEGER NOT NULL,
+    changed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (status, date_creation);
+CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority);
+CREATE INDEX IF NOT EXISTS idx_tickets_date_creation ON tickets (date_creation);
+CREATE INDEX IF NOT EXISTS idx_tickets_date_mod ON tickets (date_mod);
+CREATE INDEX IF NOT EXISTS idx_ticket_groups_ticket ON ticket_groups (ticket_id);
+CREATE INDEX IF NOT EXISTS idx_ticket_groups_level ON ticket_groups (level, ticket_id);
+CREATE INDEX IF NOT EXISTS idx_ticket_groups_name ON ticket_groups (group_name, ticket_id);
+CREATE INDEX IF NOT EXISTS idx_ticket_technicians_ticket ON ticket_technicians (ticket_id);
+CREATE INDEX IF NOT EXISTS idx_ticket_technicians_key ON ticket_technicians (tech_key, ticket_id);
+"""
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class TicketMirror:
+    """Espelho local dos tickets do GLPI em SQLite, sincronizado de forma incremental
+    
+    Uma thread de baixa prioridade busca apenas os tickets modificados desde a última
+    sincronização (data de modificação, com uma pequena sobreposição) e, a cada
+    full_sync_interval, refaz a varredura completa para remover tickets apagados.
+    O serviço GLPI monta os registros (status, níveis e técnicos já resolvidos); o
+    espelho só responde contagens, a matriz nível × status, a carga por técnico e
+    os tickets novos com SQL local enquanto estiver dentro do atraso máximo.
+    
+    Com um ColumnarTicketStore anexado, os mesmos registros alimentam as colunas em
+    memória e as agregações passam a ser vetorizadas (o SQL fica como fallback).
+    
+    Com vários workers, apenas o que detém o writer_lock sincroniza com o GLPI; os
+    demais releem do SQLite o estado da sincronização e aplicam às suas colunas os
+    tickets registrados em ticket_changes (ou recarregam tudo após uma carga completa).
+    """
+    
+    def __init__(self, service, path: str, sync_interval: float = 60, full_sync_interval: float = 86400,
+                 max_lag: float = 900, overlap: float = 60, initial_delay: float = 5, columns=None,
+                 writer_lock=None):
+        self.service = service
+        self.columns = columns  # ColumnarTicketStore opcional (requer NumPy)
+        self._columns_loaded = False
+        self._columns_generation = None  # full_synced_at da carga refletida nas colunas
+        self._change_seq = 0  # Última alteração de ticket_changes aplicada às colunas
+        self.writer_lock = writer_lock  # WorkerLock entre workers (None = este processo sempre sincroniza)
+        self.path = path
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.max_lag = max_lag
+        self.overlap = overlap  # Segundos relidos antes da marca d'água (relógio e datas com resolução de segundos)
+        self.initial_delay = initial_delay
+        self.change_retention = max(max_lag, sync_interval * 10)  # Segundos mantidos em ticket_changes
+        
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {"syncs": 0, "full_syncs": 0, "skipped_syncs": 0, "failures": 0, "upserted": 0,
+                       "deleted": 0, "refreshes": 0, "queries": 0, "query_errors": 0}
+        self.last_error = None
+        self.last_sync_latency = None
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._state = self._load_state()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Conexão da thread atual (WAL: leituras das requisições não bloqueiam a sincronização)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _load_state(self) -> Dict[str, Any]:
+        rows = self._connect().execute("SELECT key, value FROM sync_state").fetchall()
+        state = dict(rows)
+        for key in ('synced_at', 'full_synced_at'):
+            state[key] = float(state[key]) if state.get(key) else None
+        return state
+    
+    def _save_state(self, conn: sqlite3.Connection, **values):
+        conn.executemany(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            [(key, None if value is None else str(value)) for key, value in values.items()]
+        )
+        self._state.update(values)
+    
+    # ------------------------------------------------------------------
+    # Sincronização
+    # ------------------------------------------------------------------
+    
+    def start(self):
+        """Inicia a thread de sincronização"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='glpi-ticket-mirror', daemon=True)
+        self._thread.start()
+        logger.info(f"Espelho de tickets iniciado em {self.path} (sincronização a cada {self.sync_interval}s)")
+    
+    def stop(self, timeout: float = 5):
+        """Interrompe a thread de sincronização e libera o lock de escrita"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.writer_lock is not None:
+            self.writer_lock.release()
+    
+    def _run(self):
+        # Colunas em memória carregadas do SQLite antes de qualquer chamada ao GLPI
+        self.refresh()
+        
+        if self._stop.wait(self.initial_delay):
+            return
+        
+        while not self._stop.is_set():
+            try:
+                # Estado relido do SQLite a cada ciclo: outro worker pode ter sincronizado
+                self.refresh()
+                if self.is_writer():
+                    if self._sync_due():
+                        self.sync()
+                    else:
+                        self._stats["skipped_syncs"] += 1
+            except Exception as e:
+                self._stats["failures"] += 1
+                self.last_error = str(e)
+                logger.error(f"Erro na sincronização do espelho de tickets: {e}")
+            self._stop.wait(self.sync_interval)
+    
+    def is_writer(self) -> bool:
+        """Este processo detém (ou acabou de obter) o lock de escrita do espelho"""
+        return self.writer_lock is None or self.writer_lock.try_acquire()
+    
+    def _sync_due(self) -> bool:
+        """Sem carga completa ou última sincronização gravada no SQLite há pelo menos sync_interval"""
+        synced_at = self._state.get('synced_at')
+        return not self.has_data() or synced_at is None or time.time() - synced_at >= self.sync_interval
+    
+    def _needs_full_sync(self, signature: str) -> bool:
+        """Primeira carga, configuração de níveis/status alterada ou reconciliação periódica vencida"""
+        full_synced_at = self._state.get('full_synced_at')
+        return (not self._state.get('watermark') or full_synced_at is None or
+                self._state.get('signature') != signature or
+                time.time() - full_synced_at >= self.full_sync_interval)
+    
+    def _modified_since(self) -> str:
+        watermark = datetime.strptime(self._state['watermark'], DATE_FORMAT)
+        return (watermark - timedelta(seconds=self.overlap)).strftime(DATE_FORMAT)
+    
+    def sync(self, full: bool = None) -> bool:
+        """Executa uma sincronização (completa ou incremental) e retorna se foi bem-sucedida"""
+        signature = self.service.get_mirror_signature()
+        if full is None:
+            full = self._needs_full_sync(signature)
+        
+        started = time.time()
+        with priority_scope(RequestPriority.BACKGROUND):
+            if full:
+                records = self.service.fetch_mirror_records()
+                deleted_ids = None
+            else:
+                modified_since = self._modified_since()
+                records = self.service.fetch_mirror_records(modified_since)
+                deleted = self.service.fetch_mirror_records(modified_since, deleted=True)
+                deleted_ids = [record['id'] for record in deleted] if deleted is not None else None
+        
+        if records is None or (not full and deleted_ids is None):
+            self._stats["failures"] += 1
+            self.last_error = "Falha ao buscar tickets no GLPI"
+            logger.warning("Sincronização do espelho de tickets falhou; mantendo os dados atuais")
+            return False
+        
+        with self._write_lock:
+            deleted_ids = self._apply(records, deleted_ids, full, signature, started)
+            self._feed_columns(records, deleted_ids, full)
+        
+        self.last_error = None
+        self.last_sync_latency = time.time() - started
+        self._stats["syncs"] += 1
+        if full:
+            self._stats["full_syncs"] += 1
+        logger.info(f"Espelho de tickets sincronizado ({'completa' if full else 'incremental'}): "
+                    f"{len(records)} tickets em {self.last_sync_latency:.2f}s")
+        return True
+    
+    def _apply(self, records: List[Dict[str, Any]], deleted_ids: Optional[List[int]], full: bool,
+               signature: str, started: float) -> List[int]:
+        """Grava os registros em uma única transação (leitores veem o estado anterior até o commit)
+        
+        Retorna os IDs removidos do espelho.
+        """
+        conn = self._connect()
+        with conn:
+            if full:
+                # Varredura completa: o que não veio do GLPI foi apagado ou excluído
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS synced_ids (id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM synced_ids")
+                conn.executemany("INSERT OR IGNORE INTO synced_ids (id) VALUES (?)",
+                                 [(record['id'],) for record in records])
+                deleted_ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM tickets WHERE id NOT IN (SELECT id FROM synced_ids)"
+                )]
+            
+            self._delete(conn, deleted_ids)
+            self._upsert(conn, records)
+            self._log_changes(conn, records, deleted_ids, full, started)
+            
+            watermark = max((record['date_mod'] for record in records if record.get('date_mod')),
+                            default=None)
+            if self._state.get('watermark') and not full:
+                watermark = max(watermark or '', self._state['watermark'])
+            
+            values = {"watermark": watermark or self._state.get('watermark'), "synced_at": started}
+            if full:
+                values.update(full_synced_at=started, signature=signature)
+            self._save_state(conn, **values)
+        
+        self._stats["upserted"] += len(records)
+        self._stats["deleted"] += len(deleted_ids or [])
+        return deleted_ids or []
+    
+    def _log_changes(self, conn: sqlite3.Connection, records: List[Dict[str, Any]],
+                     deleted_ids: Optional[List[int]], full: bool, started: float):
+        """Registra os tickets alterados para as colunas em memória dos outros workers
+        
+        Uma carga completa descarta o registro: os outros workers recarregam tudo ao ver
+        o novo full_synced_at. Entradas mais antigas que change_retention são podadas
+        (um worker que ficou para trás também recarrega tudo).
+        """
+        if full:
+            conn.execute("DELETE FROM ticket_changes")
+            return
+        
+        conn.execute("DELETE FROM ticket_changes WHERE changed_at < ?", (started - self.change_retention,))
+        conn.executemany(
+            "INSERT INTO ticket_changes (ticket_id, changed_at) VALUES (?, ?)",
+            [(ticket_id, started) for ticket_id in list(deleted_ids or []) + [record['id'] for record in records]]
+        )
+    
+    @staticmethod
+    def _last_change_seq(conn: sqlite3.Connection) -> int:
+        """Último seq já atribuído em ticket_changes (inclusive de entradas podadas)"""
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'ticket_changes'").fetchone()
+        return row[0] if row else 0
+    
+    def _read_records(self, ticket_ids: List[int] = None) -> List[Dict[str, Any]]:
+        """Relê do SQLite os registros no formato montado pelo serviço (todos ou apenas os IDs informados)"""
+        conn = self._connect()
+        if ticket_ids is None:
+            batches = [("", [])]
+        else:
+            ticket_ids = sorted(set(ticket_ids))
+            batches = [
+                (f" WHERE {{column}} IN ({', '.join('?' * len(batch))})", batch)
+                for batch in (ticket_ids[i:i + 500] for i in range(0, len(ticket_ids), 500))
+            ]
+        
+        records = []
+        for where, params in batches:
+            groups, technicians = {}, {}
+            for ticket_id, group_name, level in conn.execute(
+                f"SELECT ticket_id, group_name, level FROM ticket_groups{where.format(column='ticket_id')}", params
+            ):
+                groups.setdefault(ticket_id, []).append((group_name, level))
+            for ticket_id, tech_key in conn.execute(
+                f"SELECT ticket_id, tech_key FROM ticket_technicians{where.format(column='ticket_id')}", params
+            ):
+                technicians.setdefault(ticket_id, []).append(tech_key)
+            
+            records.extend(
+                {'id': ticket_id, 'status': status, 'priority': priority, 'date_creation': date_creation,
+                 'date_mod': date_mod, 'groups': groups.get(ticket_id, []), 'technicians': technicians.get(ticket_id, [])}
+                for ticket_id, status, priority, date_creation, date_mod in conn.execute(
+                    f"SELECT id, status, priority, date_creation, date_mod FROM tickets{where.format(column='id')}", params
+                )
+            )
+        return records
+    
+    def refresh(self):
+        """Relê do SQLite o estado da sincronização e atualiza as colunas em memória
+        
+        Aplica apenas os tickets registrados em ticket_changes desde a última leitura;
+        recarrega tudo na primeira vez, após uma carga completa ou quando o registro
+        já foi podado. Leituras em uma única transação (snapshot consistente do WAL).
+        """
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                self._state = self._load_state()
+                if self.columns is None or not self.has_data():
+                    return
+                
+                generation = self._state.get('full_synced_at')
+                last_seq = self._last_change_seq(conn)
+                first_seq = conn.execute("SELECT MIN(seq) FROM ticket_changes").fetchone()[0]
+                missed = first_seq > self._change_seq + 1 if first_seq is not None else last_seq > self._change_seq
+                
+                started = time.time()
+                if self._columns_loaded and generation == self._columns_generation and not missed:
+                    changed_ids = [row[0] for row in conn.execute(
+                        "SELECT DISTINCT ticket_id FROM ticket_changes WHERE seq > ?", (self._change_seq,)
+                    )]
+                    if changed_ids:
+                        records = self._read_records(changed_ids)
+                        present = {record['id'] for record in records}
+                        self.columns.delete([ticket_id for ticket_id in changed_ids if ticket_id not in present])
+                        self.columns.upsert(records)
+                else:
+                    records = self._read_records()
+                    self.columns.replace(records)
+                    self._columns_loaded = True
+                    logger.info(f"Colunas em memória carregadas com {len(records)} tickets em {time.time() - started:.2f}s")
+                
+                self._columns_generation = generation
+                self._change_seq = last_seq
+                self._stats["refreshes"] += 1
+            except Exception as e:
+                self._columns_loaded = False
+                logger.error(f"Erro ao carregar as colunas em memória do espelho: {e}")
+            finally:
+                conn.rollback()
+    
+    def _feed_columns(self, records: List[Dict[str, Any]], deleted_ids: List[int], full: bool):
+        """Aplica a sincronização às colunas em memória (em caso de erro, as consultas voltam ao SQL)"""
+        if self.columns is None:
+            return
+        
+        try:
+            if full:
+                self.columns.replace(records)
+                self._columns_loaded = True
+            elif self._columns_loaded:
+                self.columns.delete(deleted_ids)
+                self.columns.upsert(records)
+            # Alterações gravadas por este processo já estão nas colunas
+            self._columns_generation = self._state.get('full_synced_at')
+            self._change_seq = self._last_change_seq(self._connect())
+        except Exception as e:
+            self._columns_loaded = False
+            logger.error(f"Erro ao atualizar as colunas em memória do espelho: {e}")
+    
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, ticket_ids: Optional[Iterable[int]]):
+        params = [(ticket_id,) for ticket_id in ticket_ids or []]
+        if not params:
+            return
+        for table, column in (('ticket_groups', 'ticket_id'), ('ticket_technicians', 'ticket_id'), ('tickets', 'id')):
+            conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", params)
+    
+    def _upsert(self, conn: sqlite3.Connection, records: List[Dict[str, Any]]):
+        self._delete(conn, [record['id'] for record in records])
+        conn.executemany(
+            "INSERT INTO tickets (id, name, status, priority, requester, content, date_creation, date_mod) "
+            "VALUES (:id, :name, :status, :priority, :requester, :content, :date_creation, :date_mod)",
+            records
+        )
+        conn.executemany(
+            "INSERT INTO ticket_groups (ticket_id, group_name, level) VALUES (?, ?, ?)",
+            [(record['id'], group_name, level) for record in records for group_name, level in record['groups']]
+        )
+        conn.executemany(
+            "INSERT INTO ticket_technicians (ticket_id, tech_key) VALUES (?, ?)",
+            [(record['id'], tech_key) for record in records for tech_key in record['technicians']]
+        )
+    
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    
+    def has_data(self) -> bool:
+        """A carga completa inicial já foi concluída (neste processo ou em uma execução anterior)"""
+        return self._state.get('full_synced_at') is not None
+    
+    def get_lag(self) -> Optional[float]:
+        """Segundos desde a última sincronização bem-sucedida"""
+        synced_at = self._state.get('synced_at')
+        return time.time() - synced_at if synced_at is not None else None
+    
+    def is_ready(self, signature: str = None, allow_lag: bool = False) -> bool:
+        """Espelho carregado, com a configuração atual e dentro do atraso máximo (ou qualquer atraso com allow_lag)"""
+        lag = self.get_lag()
+        if not self.has_data() or lag is None or (lag > self.max_lag and not allow_lag):
+            return False
+        return signature is None or self._state.get('signature') == signature
+    
+    @staticmethod
+    def normalize_date(value: Optional[str]) -> Optional[str]:
+        """Converte o limite do filtro (data ou ISO 8601) no formato das datas do GLPI"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '').replace('T', ' '))
+        except ValueError:
+            return value.strip()
+        return parsed.strftime(DATE_FORMAT)
+    
+    def _date_filter(self, start_date: str = None, end_date: str = None) -> Tuple[List[str], List[Any]]:
+        """Mesma semântica do GLPI: morethan/lessthan estritos sobre a data de criação"""
+        clauses, params = [], []
+        if start_date:
+            clauses.append("t.date_creation > ?")
+            params.append(self.normalize_date(start_date))
+        if end_date:
+            clauses.append("t.date_creation < ?")
+            params.append(self.normalize_date(end_date))
+        return clauses, params
+    
+    def _query(self, sql: str, params: List[Any]) -> List[tuple]:
+        self._stats["queries"] += 1
+        try:
+            return self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error:
+            self._stats["query_errors"] += 1
+            raise
+    
+    def _columns_ready(self) -> bool:
+        return self.columns is not None and self._columns_loaded
+    
+    def count(self, status_id: int = None, level: str = None, start_date: str = None, end_date: str = None) -> int:
+        """Quantidade de tickets com filtros opcionais de status, nível e data de criação"""
+        if self._columns_ready():
+            return self.columns.count(status=status_id, level=level, start_date=start_date, end_date=end_date)
+        
+        clauses, params = self._date_filter(start_date, end_date)
+        if status_id is not None:
+            clauses.append("t.status = ?")
+            params.append(status_id)
+        if level is not None:
+            clauses.append("EXISTS (SELECT 1 FROM ticket_groups g WHERE g.ticket_id = t.id AND g.level = ?)")
+            params.append(level)
+        
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT COUNT(*) FROM tickets t{where}", params)[0][0]
+    
+    def count_matrix(self, start_date: str = None, end_date: str = None) -> Dict[Tuple[Optional[str], int], int]:
+        """Contagens por (nível, status) e por (None, status) em duas consultas agrupadas"""
+        if self._columns_ready():
+            counts = {
+                (None, status): total
+                for (status,), total in self.columns.group_count(('status',), start_date=start_date,
+                                                                 end_date=end_date).items()
+            }
+            counts.update(self.columns.group_count(('level', 'status'), start_date=start_date, end_date=end_date))
+            return counts
+        
+        clauses, params = self._date_filter(start_date, end_date)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        counts = {
+            (None, status): total
+            for status, total in self._query(f"SELECT t.status, COUNT(*) FROM tickets t{where} GROUP BY t.status", params)
+        }
+        level_rows = self._query(
+            "SELECT l.level, t.status, COUNT(*) FROM tickets t "
+            "JOIN (SELECT DISTINCT ticket_id, level FROM ticket_groups WHERE level IS NOT NULL) l "
+            f"ON l.ticket_id = t.id{where} GROUP BY l.level, t.status",
+            params
+        )
+        counts.update(((level, status), total) for level, status, total in level_rows)
+        return counts
+    
+    def technician_workload(self, start_date: str = None, end_date: str = None) -> Dict[str, int]:
+        """Quantidade de tickets por valor (minúsculo) da coluna de técnico"""
+        if self._columns_ready():
+            return {
+                tech_key: total
+                for (tech_key,), total in self.columns.group_count(('technician',), start_date=start_date,
+                                                                   end_date=end_date).items()
+            }
+        
+        clauses, params = self._date_filter(start_date, end_date)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return dict(self._query(
+            "SELECT a.tech_key, COUNT(*) FROM ticket_technicians a "
+            f"JOIN tickets t ON t.id = a.ticket_id{where} GROUP BY a.tech_key",
+            params
+        ))
+    
+    def breakdown(self, dimensions: Tuple[str, ...], **filters) -> Optional[Tuple[Dict[Tuple[Any, ...], int], int]]:
+        """Contagens agrupadas pelas dimensões e total de tickets filtrados (None sem as colunas em memória)"""
+        if not self._columns_ready():
+            return None
+        return self.columns.group_count(dimensions, **filters), self.columns.count(**filters)
+    
+    def latest_tickets(self, status_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Tickets do status informado, modificados mais recentemente primeiro (mesma ordem da busca do GLPI)"""
+        columns = ('id', 'name', 'priority', 'requester', 'content', 'date_creation', 'date_mod')
+        rows = self._query(
+            f"SELECT {', '.join(columns)} FROM tickets WHERE status = ? ORDER BY date_mod DESC, id DESC LIMIT ?",
+            [status_id, limit]
+        )
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o estado da sincronização, o atraso e os contadores"""
+        lag = self.get_lag()
+        try:
+            tickets = self._connect().execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+        except sqlite3.Error:
+            tickets = None
+        
+        full_synced_at = self._state.get('full_synced_at')
+        return dict(
+            self._stats,
+            path=self.path,
+            running=self._thread is not None and self._thread.is_alive(),
+            writer=self.writer_lock is None or self.writer_lock.held,
+            ready=self.is_ready(),
+            tickets=tickets,
+            watermark=self._state.get('watermark'),
+            lag=round(lag, 1) if lag is not None else None,
+            max_lag=self.max_lag,
+            last_full_sync=datetime.fromtimestamp(full_synced_at).isoformat() if full_synced_at else None,
+            last_sync_latency=round(self.last_sync_latency, 3) if self.last_sync_latency is not None else None,
+            last_error=self.last_error,
+            columns=dict(self.columns.get_stats(), loaded=self._columns_loaded) if self.columns is not None else None
+        )
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import redis
+except ImportError:  # Redis é opcional: sem o pacote, apenas o cache em memória fica disponível
+    redis = None
+
+logger = logging.getLogger('cache_backend')
+
+
+class InMemoryCacheBackend:
+    """Cache do GLPIService em um dicionário do próprio processo"""
+    
+    name = 'memory'
+    
+    def __init__(self, store: Dict[str, Any] = None):
+        self._store = store if store is not None else {}
+        self._lock = threading.Lock()
+    
+    def get_entry(self, cache_key: str, sub_key: str = None) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada {'data', 'timestamp', 'ttl', 'stale_ttl'} ou None"""
+        with self._lock:
+            if sub_key:
+                return self._store.get(cache_key, {}).get(sub_key)
+            return self._store.get(cache_key)
+    
+    def set_entry(self, cache_key: str, entry: Dict[str, Any], sub_key: str = None):
+        """Grava a entrada no cache"""
+        with self._lock:
+            if sub_key:
+                self._store.setdefault(cache_key, {})[sub_key] = entry
+            else:
+                self._store[cache_key] = entry
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o tipo do backend, o número de chaves e as estatísticas dos armazenamentos limitados"""
+        with self._lock:
+            stats = {"backend": self.name, "keys": len(self._store)}
+            for cache_key, value in self._store.items():
+                if hasattr(value, 'get_stats'):
+                    stats[cache_key] = value.get_stats()
+            return stats
+
+
+class RedisCacheBackend:
+    """Cache do GLPIService no Redis, compartilhado entre workers e nós
+    
+    As entradas são gravadas em JSON com expiração no stale TTL; a idade é
+    calculada pelo timestamp da entrada. Se o Redis falhar, a operação usa o
+    cache em memória do processo até a conexão voltar.
+    """
+    
+    name = 'redis'
+    
+    def __init__(self, client, key_prefix: str = 'glpi_dashboard:', fallback: InMemoryCacheBackend = None):
+        self._client = client
+        self._key_prefix = f"{key_prefix}service:"
+        self._fallback = fallback or InMemoryCacheBackend()
+        self._stats = {"errors": 0, "fallback_reads": 0, "fallback_writes": 0}
+    
+    def _redis_key(self, cache_key: str, sub_key: str = None) -> str:
+        return f"{self._key_prefix}{cache_key}:{sub_key}" if sub_key else f"{self._key_prefix}{cache_key}"
+    
+    def get_entry(self, cache_key: str, sub_key: str = None) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada {'data', 'timestamp', 'ttl', 'stale_ttl'} ou None"""
+        try:
+            raw = self._client.get(self._redis_key(cache_key, sub_key))
+        except redis.RedisError as e:
+            self._stats["errors"] += 1
+            self._stats["fallback_reads"] += 1
+            logger.warning(f"Falha ao ler do Redis ({e}), usando cache local")
+            return self._fallback.get_entry(cache_key, sub_key)
+        
+        if raw is None:
+            # Entradas não serializáveis em JSON ficam apenas no cache local
+            return self._fallback.get_entry(cache_key, sub_key)
+        
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            logger.error(f"Entrada inválida no Redis para {cache_key}: {e}")
+            return None
+    
+    def set_entry(self, cache_key: str, entry: Dict[str, Any], sub_key: str = None):
+        """Grava a entrada no Redis com expiração no stale TTL"""
+        try:
+            payload = json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Entrada {cache_key} não serializável em JSON ({e}), mantida apenas no cache local")
+            self._fallback.set_entry(cache_key, entry, sub_key)
+            return
+        
+        expire = int(max(entry.get('stale_ttl') or 0, entry.get('ttl') or 0)) or None
+        try:
+            self._client.set(self._redis_key(cache_key, sub_key), payload, ex=expire)
+        except redis.RedisError as e:
+            self._stats["errors"] += 1
+            self._stats["fallback_writes"] += 1
+            logger.warning(f"Falha ao gravar no Redis ({e}), usando cache local")
+            self._fallback.set_entry(cache_key, entry, sub_key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o tipo do backend e as falhas de comunicação com o Redis"""
+        return dict(self._stats, backend=self.name, local=self._fallback.get_stats())
+
+
+def create_cache_backend(config, local_store: Dict[str, Any] = None):
+    """Cria o backend de cache configurado (GLPI_CACHE_BACKEND: redis ou memory)"""
+    local_backend = InMemoryCacheBackend(local_store)
+    backend_type = getattr(config, 'GLPI_CACHE_BACKEND', 'memory')
+    
+    if backend_type != 'redis':
+        return local_backend
+    
+    if redis is None:
+        logger.warning("Pacote redis não instalado, usando cache em memória")
+        return local_backend
+    
+    try:
+        client = redis.from_url(
+            config.REDIS_URL,
+            socket_connect_timeout=config.GLPI_CACHE_REDIS_TIMEOUT,
+            socket_timeout=config.GLPI_CACHE_REDIS_TIMEOUT
+        )
+        client.ping()
+    except redis.RedisError as e:
+        logger.warning(f"Redis não disponível ({e}), usando cache em memória como fallback")
+        return local_backend
+    
+    logger.info("Cache do GLPIService compartilhado via Redis")
+    return RedisCacheBackend(client, getattr(config, 'CACHE_KEY_PREFIX', 'glpi_dashboard:'), local_backend)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar('glpi_deadline', default=None)
+
+
+class Deadline:
+    """Prazo absoluto de uma computação, propagado a todas as chamadas ao GLPI que ela dispara"""
+    
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.time() + seconds
+        self.exceeded = False  # Alguma chamada ao GLPI foi abandonada por causa do prazo
+    
+    def remaining(self) -> float:
+        """Segundos restantes até o prazo (nunca negativo)"""
+        return max(self.expires_at - time.time(), 0.0)
+    
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+    
+    def cap(self, timeout: Optional[float]) -> float:
+        """Limita o timeout de uma chamada ao tempo restante"""
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+def get_current_deadline() -> Optional[Deadline]:
+    """Retorna o prazo da computação em andamento, se houver"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Define o prazo da computação atual; escopos aninhados mantêm o prazo mais curto"""
+    current = _current_deadline.get()
+    if current is not None and current.expires_at <= time.time() + seconds:
+        yield current
+        return
+    
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger('fan_out')
+
+
+class ParallelFanOut:
+    """Executa chamadas independentes em paralelo com um pool limitado de workers
+
+    Com `lane`, cada faixa (ex.: classe de prioridade da chamada) tem seu próprio
+    pool, para que tarefas de segundo plano não ocupem os workers das interativas.
+    """
+    
+    def __init__(self, max_workers: int = 8, thread_name_prefix: str = 'glpi-fanout',
+                 lane: Optional[Callable[[], Hashable]] = None):
+        self.max_workers = max(1, max_workers)
+        self.thread_name_prefix = thread_name_prefix
+        self._lane = lane
+        self._executors: Dict[Hashable, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+        self._worker_state = threading.local()
+    
+    def _mark_worker_thread(self):
+        self._worker_state.is_worker = True
+    
+    def _in_worker_thread(self) -> bool:
+        return getattr(self._worker_state, 'is_worker', False)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Pool da faixa atual (criado na primeira utilização)"""
+        lane = self._lane() if self._lane is not None else None
+        with self._executors_lock:
+            executor = self._executors.get(lane)
+            if executor is None:
+                suffix = f"-{lane}" if lane is not None else ""
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.thread_name_prefix}{suffix}",
+                    initializer=self._mark_worker_thread
+                )
+                self._executors[lane] = executor
+            return executor
+
+    def map(self, func: Callable[..., Any], tasks: Dict[Hashable, Dict[str, Any]]) -> Dict[Hashable, Any]:
+        """Executa func(**kwargs) para cada tarefa e devolve os resultados pela mesma chave"""
+        # Chamadas aninhadas a partir de um worker rodam em série para evitar deadlock
+        if self.max_workers <= 1 or len(tasks) <= 1 or self._in_worker_thread():
+            return {key: func(**kwargs) for key, kwargs in tasks.items()}
+
+        # Cada tarefa roda numa cópia do contexto atual (ex.: memo de consultas da requisição)
+        executor = self._get_executor()
+        futures = {
+            key: executor.submit(contextvars.copy_context().run, func, **kwargs)
+            for key, kwargs in tasks.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def shutdown(self, wait: bool = True):
+        """Encerra os pools de workers"""
+        with self._executors_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from typing import Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('http_transport')
+
+
+class PooledHTTPTransport:
+    """Transporte HTTP com pool de conexões persistentes (keep-alive)"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 10,
+                 pool_block: bool = False, idle_timeout: float = 60):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._last_used_at = None
+
+        # Contadores acumulados de pools já descartados (evicção por ociosidade)
+        self._evicted_connections = 0
+        self._evicted_requests = 0
+        self._evictions = 0
+
+        self._session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Cria uma sessão requests com adapters configurados para o pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0  # Retries são tratados pelo GLPIService
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _iter_connection_pools(self):
+        """Itera sobre os pools de conexão urllib3 ativos"""
+        # O mesmo adapter atende http:// e https://, evitando contagem duplicada
+        adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}
+        for adapter in adapters.values():
+            poolmanager = getattr(adapter, 'poolmanager', None)
+            if poolmanager is None:
+                continue
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is not None:
+                    yield pool
+
+    def _evict_idle_connections(self):
+        """Fecha as conexões ociosas quando o pool ficou sem uso além do limite"""
+        with self._lock:
+            now = time.time()
+            idle = self._last_used_at is not None and (now - self._last_used_at) > self.idle_timeout
+            self._last_used_at = now
+
+            if not idle:
+                return
+
+            for pool in self._iter_connection_pools():
+                self._evicted_connections += pool.num_connections
+                self._evicted_requests += pool.num_requests
+
+            for adapter in {id(a): a for a in self._session.adapters.values()}.values():
+                adapter.poolmanager.clear()
+
+            self._evictions += 1
+            logger.info(f"Pool HTTP ocioso por mais de {self.idle_timeout}s, conexões descartadas")
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Executa uma requisição reaproveitando conexões do pool"""
+        if self.idle_timeout:
+            self._evict_idle_connections()
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Atalho para requisições GET"""
+        return self.request('GET', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de conexões novas vs. reaproveitadas"""
+        with self._lock:
+            opened = self._evicted_connections
+            requests_sent = self._evicted_requests
+            for pool in self._iter_connection_pools():
+                opened += pool.num_connections
+                requests_sent += pool.num_requests
+
+            return {
+                "requests": requests_sent,
+                "connections_opened": opened,
+                "connections_reused": max(requests_sent - opened, 0),
+                "idle_evictions": self._evictions,
+                "pool_connections": self.pool_connections,
+                "pool_maxsize": self.pool_maxsize,
+                "idle_timeout": self.idle_timeout
+            }
+
+    def close(self):
+        """Fecha todas as conexões do pool"""
+        with self._lock:
+            self._session.close()
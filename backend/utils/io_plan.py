@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Awaitable, Callable, Dict, Generator
+
+Primitives = Dict[str, Callable[..., Any]]
+
+
+class IOCall:
+    """Operação de I/O pedida por um plano de consulta: nome da primitiva e argumentos
+    
+    Um plano é um gerador que descreve a lógica de uma consulta ao GLPI sem fazer
+    I/O: a cada yield entrega um IOCall e recebe de volta o resultado. O mesmo plano
+    roda no cliente síncrono (run_plan) e no assíncrono (run_plan_async), cada um
+    com as suas primitivas, de modo que nenhuma estratégia fica restrita a um deles.
+    """
+    
+    __slots__ = ('name', 'args', 'kwargs')
+    
+    def __init__(self, name: str, *args, **kwargs):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+    
+    def __repr__(self) -> str:
+        return f"IOCall({self.name!r})"
+
+
+Plan = Generator[IOCall, Any, Any]
+
+
+def run_plan(plan: Plan, primitives: Primitives) -> Any:
+    """Executa o plano com primitivas síncronas; exceções das primitivas são lançadas dentro do plano"""
+    send, value = plan.send, None
+    while True:
+        try:
+            call = send(value)
+        except StopIteration as stop:
+            return stop.value
+        
+        try:
+            send, value = plan.send, primitives[call.name](*call.args, **call.kwargs)
+        except Exception as e:
+            send, value = plan.throw, e
+
+
+async def run_plan_async(plan: Plan, primitives: Dict[str, Callable[..., Awaitable[Any]]]) -> Any:
+    """Executa o plano aguardando primitivas assíncronas (corrotinas)"""
+    send, value = plan.send, None
+    while True:
+        try:
+            call = send(value)
+        except StopIteration as stop:
+            return stop.value
+        
+        try:
+            send, value = plan.send, await primitives[call.name](*call.args, **call.kwargs)
+        except Exception as e:
+            send, value = plan.throw, e
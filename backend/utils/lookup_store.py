@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('lookup_store')
+
+
+class LookupSnapshotStore:
+    """Snapshots versionados dos metadados do GLPI em disco (um arquivo JSON por lookup)
+    
+    Cada gravação com conteúdo diferente incrementa a versão do snapshot; gravar o
+    mesmo conteúdo apenas atualiza a data da última validação. Snapshots de outro
+    formato ou de outra instância do GLPI são ignorados no carregamento.
+    """
+    
+    FORMAT = 1
+    
+    def __init__(self, directory: str, source: str):
+        self.directory = directory
+        self.source = source  # URL do GLPI que originou os metadados
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"loaded": 0, "saved": 0, "validated": 0, "errors": 0}
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+    
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Retorna o snapshot {'data', 'version', 'updated_at', 'validated_at', ...} ou None"""
+        try:
+            with open(self._path(name), encoding='utf-8') as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Snapshot de lookup {name} inválido ({e}), ignorando")
+            return None
+        
+        if (not isinstance(snapshot, dict) or snapshot.get('format') != self.FORMAT or
+                snapshot.get('source') != self.source or 'data' not in snapshot):
+            return None
+        
+        with self._lock:
+            self._versions[name] = {key: snapshot.get(key) for key in ('version', 'checksum', 'updated_at')}
+            self._stats["loaded"] += 1
+        return snapshot
+    
+    def save(self, name: str, data: Any) -> bool:
+        """Grava o snapshot do lookup (nova versão apenas se o conteúdo mudou)"""
+        try:
+            payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Lookup {name} não serializável em JSON ({e}), snapshot não gravado")
+            return False
+        
+        checksum = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        now = time.time()
+        
+        with self._lock:
+            current = self._versions.get(name) or {"version": 0, "checksum": None, "updated_at": None}
+            changed = current["checksum"] != checksum
+            info = {
+                "version": (current["version"] or 0) + 1 if changed else current["version"],
+                "checksum": checksum,
+                "updated_at": now if changed else current["updated_at"]
+            }
+            snapshot = dict(info, format=self.FORMAT, name=name, source=self.source, validated_at=now, data=data)
+            
+            tmp_path = None
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                # Gravação atômica em arquivo temporário exclusivo: outros workers e outros stores
+                # do mesmo processo nunca leem nem escrevem um arquivo pela metade
+                descriptor, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=self.directory)
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as snapshot_file:
+                    json.dump(snapshot, snapshot_file, ensure_ascii=False)
+                os.replace(tmp_path, self._path(name))
+            except OSError as e:
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                self._stats["errors"] += 1
+                logger.warning(f"Não foi possível gravar o snapshot do lookup {name}: {e}")
+                return False
+            
+            self._versions[name] = info
+            self._stats["saved" if changed else "validated"] += 1
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o diretório, os contadores e a versão de cada snapshot conhecido"""
+        with self._lock:
+            return dict(
+                self._stats,
+                directory=self.directory,
+                versions={name: info["version"] for name, info in self._versions.items()}
+            )
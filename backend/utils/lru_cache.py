@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+logger = logging.getLogger('lru_cache')
+
+
+class LRUTTLCache:
+    """Armazenamento limitado (entradas e bytes) para entradas de cache do GLPIService
+    
+    Cada valor é uma entrada {'data', 'timestamp', 'ttl', 'stale_ttl'}; entradas
+    passam a ser descartáveis após o maior entre ttl e stale_ttl. Quando um dos
+    limites é excedido, as entradas menos usadas recentemente são removidas.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, sweep_interval: float = 60):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._last_sweep = time.time()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+    
+    @staticmethod
+    def _is_expired(entry: Dict[str, Any], now: float) -> bool:
+        timestamp = entry.get('timestamp')
+        if timestamp is None:
+            return True
+        lifetime = max(entry.get('ttl') or 0, entry.get('stale_ttl') or 0)
+        return (now - timestamp) >= lifetime
+    
+    @staticmethod
+    def _estimate_size(key: str, entry: Dict[str, Any]) -> int:
+        """Estimativa do tamanho da entrada pelo JSON serializado"""
+        try:
+            return len(key) + len(json.dumps(entry.get('data'), default=str))
+        except (TypeError, ValueError):
+            return len(key) + len(repr(entry.get('data')))
+    
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        self._total_bytes -= self._sizes.pop(key, 0)
+    
+    def _sweep_expired(self, now: float):
+        """Remove todas as entradas expiradas"""
+        expired = [key for key, entry in self._entries.items() if self._is_expired(entry, now)]
+        for key in expired:
+            self._remove(key)
+        self._stats["expirations"] += len(expired)
+        self._last_sweep = now
+    
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep_expired(now)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retorna a entrada e a marca como usada recentemente"""
+        with self._lock:
+            now = time.time()
+            self._maybe_sweep(now)
+            
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry, now):
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+    
+    def __setitem__(self, key: str, entry: Dict[str, Any]):
+        size = self._estimate_size(key, entry)
+        
+        with self._lock:
+            now = time.time()
+            self._maybe_sweep(now)
+            self._remove(key)
+            
+            if self.max_bytes and size > self.max_bytes:
+                logger.warning(f"Entrada {key} ({size} bytes) excede o limite do cache e não foi armazenada")
+                return
+            
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._total_bytes += size
+            
+            # Limites excedidos: expiradas primeiro, depois as menos usadas recentemente
+            if len(self._entries) > self.max_entries or (self.max_bytes and self._total_bytes > self.max_bytes):
+                self._sweep_expired(now)
+            
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._stats["evictions"] += 1
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna acertos, falhas, remoções e ocupação"""
+        with self._lock:
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._total_bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes
+            )
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import threading
+from datetime import date, timedelta
+from typing import Dict, Hashable, List
+
+
+class DailyPrefixIndex:
+    """Índice de somas acumuladas por dia para várias séries de contagem
+    
+    A soma de qualquer intervalo [início, fim) de uma série é cumulative[fim] - cumulative[início].
+    Dias novos são anexados em O(séries); alterar um dia já indexado recalcula apenas o sufixo.
+    Cada dia guarda até quando seu valor é válido, para que dias vencidos sejam buscados de novo.
+    """
+    
+    def __init__(self, series: List[Hashable]):
+        self.series = list(series)
+        self._lock = threading.Lock()
+        self._origin: date = None
+        self._values: Dict[Hashable, List[int]] = {key: [] for key in self.series}
+        self._cumulative: Dict[Hashable, List[int]] = {key: [0] for key in self.series}
+        self._expires_at: List[float] = []
+    
+    def _offset(self, day: date) -> int:
+        return (day - self._origin).days
+    
+    def _recompute_from(self, position: int):
+        """Recalcula as somas acumuladas a partir da posição informada"""
+        for key in self.series:
+            values = self._values[key]
+            cumulative = self._cumulative[key]
+            del cumulative[position + 1:]
+            running = cumulative[position]
+            for value in values[position:]:
+                running += value
+                cumulative.append(running)
+    
+    def _extend_to(self, day: date):
+        """Abre espaço (dias zerados e vencidos) até incluir o dia informado"""
+        if self._origin is None:
+            self._origin = day
+        
+        if day < self._origin:
+            # Dia anterior à origem: desloca o índice (reconstrução completa)
+            shift = (self._origin - day).days
+            for key in self.series:
+                self._values[key][:0] = [0] * shift
+                self._cumulative[key] = [0]
+            self._expires_at[:0] = [0.0] * shift
+            self._origin = day
+            self._recompute_from(0)
+            return
+        
+        gap = self._offset(day) + 1 - len(self._expires_at)
+        if gap > 0:
+            for key in self.series:
+                self._values[key].extend([0] * gap)
+                last = self._cumulative[key][-1]
+                self._cumulative[key].extend([last] * gap)
+            self._expires_at.extend([0.0] * gap)
+    
+    def set_day(self, day: date, counts: Dict[Hashable, int], expires_at: float):
+        """Registra as contagens de um dia (anexa ou atualiza)"""
+        with self._lock:
+            self._extend_to(day)
+            position = self._offset(day)
+            self._expires_at[position] = expires_at
+            
+            changed = False
+            for key in self.series:
+                value = int(counts.get(key, 0))
+                if self._values[key][position] != value:
+                    self._values[key][position] = value
+                    changed = True
+            
+            if changed:
+                self._recompute_from(position)
+    
+    def expire_day(self, day: date):
+        """Marca um dia como vencido (será buscado de novo); dias fora do índice são ignorados"""
+        with self._lock:
+            if self._origin is None:
+                return
+            position = self._offset(day)
+            if 0 <= position < len(self._expires_at):
+                self._expires_at[position] = 0.0
+    
+    def missing_days(self, start_day: date, end_day: date, now: float) -> List[date]:
+        """Dias de [start_day, end_day) ausentes ou vencidos no índice"""
+        with self._lock:
+            missing = []
+            day = start_day
+            while day < end_day:
+                position = self._offset(day) if self._origin is not None else -1
+                if position < 0 or position >= len(self._expires_at) or self._expires_at[position] <= now:
+                    missing.append(day)
+                day += timedelta(days=1)
+            return missing
+    
+    def range_sum(self, start_day: date, end_day: date) -> Dict[Hashable, int]:
+        """Soma de cada série em [start_day, end_day) com duas consultas às somas acumuladas"""
+        with self._lock:
+            if self._origin is None:
+                return {key: 0 for key in self.series}
+            
+            size = len(self._expires_at)
+            start = min(max(self._offset(start_day), 0), size)
+            end = min(max(self._offset(end_day), 0), size)
+            if end <= start:
+                return {key: 0 for key in self.series}
+            
+            return {key: self._cumulative[key][end] - self._cumulative[key][start] for key in self.series}
+    
+    def get_stats(self) -> Dict[str, any]:
+        """Retorna a cobertura do índice"""
+        with self._lock:
+            return {
+                "origin": self._origin.isoformat() if self._origin else None,
+                "days": len(self._expires_at),
+                "series": len(self.series)
+            }
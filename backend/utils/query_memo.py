@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger('query_memo')
+
+_current_memo: contextvars.ContextVar = contextvars.ContextVar('glpi_query_memo', default=None)
+
+
+class QueryMemo:
+    """Memoização de consultas ao GLPI válida durante uma única computação"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Future] = {}
+        self.upstream_calls = 0
+        self.saved_calls = 0
+    
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> Hashable:
+        """Normaliza os parâmetros da consulta em uma chave independente da ordem"""
+        return namespace, tuple(sorted((str(key), str(value)) for key, value in params.items()))
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retorna o resultado memorizado ou executa a consulta uma única vez"""
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                self.upstream_calls += 1
+            else:
+                self.saved_calls += 1
+        
+        if not owner:
+            # Consulta idêntica já feita (ou em andamento em outro worker)
+            return future.result()
+        
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                self._entries.pop(key, None)
+            future.set_exception(e)
+            raise
+        
+        future.set_result(result)
+        return result
+    
+    def seed(self, key: Hashable, result: Any):
+        """Registra um resultado obtido por outro caminho (ex.: varredura única)"""
+        with self._lock:
+            if key not in self._entries:
+                future = Future()
+                future.set_result(result)
+                self._entries[key] = future
+    
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Resultado já concluído da consulta, sem aguardar as que estão em andamento"""
+        with self._lock:
+            future = self._entries.get(key)
+        if future is None or not future.done() or future.exception() is not None:
+            return default
+        return future.result()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna quantas consultas foram ao GLPI e quantas foram evitadas"""
+        with self._lock:
+            return {"upstream_calls": self.upstream_calls, "saved_calls": self.saved_calls}
+
+
+def get_current_memo() -> Optional[QueryMemo]:
+    """Retorna o memo da computação em andamento, se houver"""
+    return _current_memo.get()
+
+
+@contextmanager
+def query_memo_scope(memo: QueryMemo = None):
+    """Ativa um memo (novo ou o informado) para a computação atual; escopos aninhados reutilizam o existente"""
+    current = _current_memo.get()
+    if current is not None:
+        yield current
+        return
+    
+    if memo is None:
+        memo = QueryMemo()
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+        stats = memo.get_stats()
+        if stats["saved_calls"]:
+            logger.info(f"Memo de consultas: {stats['upstream_calls']} chamadas ao GLPI, {stats['saved_calls']} evitadas")
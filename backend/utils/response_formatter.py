@@ -9,7 +9,17 @@ class ResponseFormatter:
     """Classe para formatação unificada de respostas da API"""
     
     @staticmethod
-    def format_dashboard_response(data: Dict[str, Any], filters: Optional[Dict] = None, start_time: Optional[float] = None) -> Dict[str, Any]:
+    def _sum_known(values) -> Optional[int]:
+        """Soma das células; None se alguma faltar (em respostas parciais o total ainda é desconhecido)"""
+        values = list(values)
+        if any(value is None for value in values):
+            return None
+        return sum(values)
+    
+    @staticmethod
+    def format_dashboard_response(data: Dict[str, Any], filters: Optional[Dict] = None, start_time: Optional[float] = None,
+                                  metadata: Optional[Dict[str, Any]] = None,
+                                  trends: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Formata resposta das métricas do dashboard"""
         try:
             # Extrair dados por nível e gerais
@@ -17,20 +27,12 @@ class ResponseFormatter:
             general_metrics = data.get('general', {})
             
             # Calcular totais gerais
-            total_tickets = sum(general_metrics.values())
+            total_tickets = ResponseFormatter._sum_known(general_metrics.values())
             
             # Calcular breakdown por nível
             level_totals = {}
             for level_name, level_data in level_metrics.items():
-                level_totals[level_name] = sum(level_data.values())
-            
-            # Calcular tendências básicas (placeholder)
-            trends = {
-                "new_tickets": "+5.2%",
-                "pending_tickets": "-2.1%",
-                "in_progress_tickets": "+8.7%",
-                "resolved_tickets": "+12.3%"
-            }
+                level_totals[level_name] = ResponseFormatter._sum_known(level_data.values())
             
             # Estrutura da resposta
             response = {
@@ -40,17 +42,16 @@ class ResponseFormatter:
                         "total_tickets": total_tickets,
                         "new_tickets": general_metrics.get('Novo', 0),
                         "pending_tickets": general_metrics.get('Pendente', 0),
-                        "in_progress_tickets": (
-                            general_metrics.get('Processando (atribuído)', 0) + 
+                        "in_progress_tickets": ResponseFormatter._sum_known([
+                            general_metrics.get('Processando (atribuído)', 0),
                             general_metrics.get('Processando (planejado)', 0)
-                        ),
+                        ]),
                         "resolved_tickets": general_metrics.get('Solucionado', 0),
                         "closed_tickets": general_metrics.get('Fechado', 0)
                     },
                     "by_status": general_metrics,
                     "by_level": level_metrics,
-                    "level_totals": level_totals,
-                    "trends": trends
+                    "level_totals": level_totals
                 },
                 "metadata": {
                     "timestamp": time.time(),
@@ -59,6 +60,14 @@ class ResponseFormatter:
                 }
             }
             
+            # Tendências só são incluídas quando calculadas (include=trends)
+            if trends is not None:
+                response["data"]["trends"] = trends
+            
+            # Metadados adicionais da computação (ex.: consultas evitadas pelo memo)
+            if metadata:
+                response["metadata"].update(metadata)
+            
             return response
             
         except Exception as e:
@@ -143,6 +152,35 @@ class ResponseFormatter:
             logger.error(f"Erro ao formatar resposta de tickets: {e}")
             return ResponseFormatter.format_error_response(f"Erro na formatação: {str(e)}", [str(e)])
     
+    @staticmethod
+    def format_breakdown_response(breakdown: Dict[str, Any], filters: Optional[Dict] = None,
+                                  start_time: Optional[float] = None) -> Dict[str, Any]:
+        """Formata resposta das contagens de tickets agrupadas por dimensão"""
+        try:
+            response = {
+                "success": True,
+                "data": {
+                    "dimensions": breakdown['dimensions'],
+                    "rows": breakdown['rows'],
+                    "statistics": {
+                        "total_tickets": breakdown['total_tickets'],
+                        "total_groups": breakdown['total_groups'],
+                        "returned_groups": len(breakdown['rows'])
+                    }
+                },
+                "metadata": {
+                    "timestamp": time.time(),
+                    "filters_applied": filters or {},
+                    "response_time": time.time() - start_time if start_time else None
+                }
+            }
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"Erro ao formatar resposta de contagens agrupadas: {e}")
+            return ResponseFormatter.format_error_response(f"Erro na formatação: {str(e)}", [str(e)])
+    
     @staticmethod
     def format_error_response(message: str, errors: List[str], status_code: int = 500) -> Dict[str, Any]:
         """Formata resposta de erro padronizada"""
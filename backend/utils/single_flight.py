@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger('single_flight')
+
+
+class SingleFlight:
+    """Agrupa chamadas simultâneas com a mesma chave em uma única execução"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._stats = {"executions": 0, "shared": 0}
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Executa func() uma única vez por chave; chamadas concorrentes aguardam o mesmo resultado"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._stats["executions"] += 1
+            else:
+                self._stats["shared"] += 1
+        
+        if not leader:
+            logger.info(f"Aguardando computação em andamento: {key}")
+            return future.result()
+        
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna execuções reais e chamadas atendidas por computações em andamento"""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._in_flight))
+
+
+class AsyncSingleFlight:
+    """Versão asyncio do SingleFlight (todas as chamadas no mesmo event loop)"""
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {"executions": 0, "shared": 0}
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Aguarda func() uma única vez por chave; chamadas concorrentes compartilham o resultado"""
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._stats["shared"] += 1
+            logger.info(f"Aguardando computação em andamento: {key}")
+            # shield: o cancelamento de um chamador não cancela a computação compartilhada
+            return await asyncio.shield(future)
+        
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+        self._stats["executions"] += 1
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna execuções reais e chamadas atendidas por computações em andamento"""
+        return dict(self._stats, in_flight=len(self._in_flight))
@@ -0,0 +1,546 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem o pacote, o espelho de tickets responde apenas por SQL
+    np = None
+
+MISSING_TIMESTAMP = -(2 ** 63)  # NaT do NumPy: ticket sem data
+
+
+class ValueDictionary:
+    """Codificação por dicionário: cada valor distinto recebe um código inteiro pequeno (0 = ausente)"""
+    
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {}
+    
+    def encode(self, value) -> int:
+        if value is None or value == '':
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+    
+    def lookup(self, value) -> Optional[int]:
+        """Código de um valor já visto (None se o valor nunca apareceu)"""
+        return self._codes.get(value)
+    
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _ColumnBuffer:
+    """Array com folga no fim: anexar não copia as linhas existentes, e versões anteriores continuam vendo só o seu prefixo"""
+    
+    def __init__(self, array):
+        self._data = array
+        self.view = array
+    
+    def append(self, values):
+        size = len(self.view)
+        needed = size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, size + size // 4, 1024), self._data.dtype)
+            grown[:size] = self.view
+            self._data = grown
+        self._data[size:needed] = values
+        self.view = self._data[:needed]
+        return self.view
+
+
+class _Snapshot:
+    """Versão imutável das colunas: consultas trabalham sobre a versão vigente enquanto a próxima é montada
+    
+    As primeiras sorted_rows linhas estão ordenadas pela data de criação (id_index
+    guarda os IDs dessas linhas ordenados e a linha de cada um); as demais foram
+    anexadas desde a última compactação. As colunas multivaloradas ficam ordenadas
+    pela linha.
+    """
+    
+    COLUMNS = ('ids', 'status', 'priority', 'created', 'day', 'alive')
+    
+    def __init__(self, columns: Dict[str, Any], edges: Dict[str, Tuple[Any, Any]], sorted_rows: int,
+                 id_index: Tuple[Any, Any]):
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.edges = edges  # dimensão multivalorada -> (linhas, códigos)
+        self.sorted_rows = sorted_rows
+        self.id_index = id_index
+        self.rows = len(self.ids)
+        self.dead = self.rows - int(np.count_nonzero(self.alive))
+        self.status_size = int(self.status.max()) + 1 if self.rows else 1
+        self.edge_columns: Dict[Tuple[str, str], Any] = {}
+        self._dead_positions: Dict[Optional[str], Any] = {}
+    
+    def columns(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.COLUMNS}
+    
+    def edge_column(self, edge: str, name: str):
+        """Coluna escalar alinhada aos pares (linha, código) da dimensão multivalorada, calculada uma vez por versão"""
+        column = self.edge_columns.get((edge, name))
+        if column is None:
+            column = self.edge_columns[(edge, name)] = getattr(self, name)[self.edges[edge][0]]
+        return column
+    
+    def dead_positions(self, edge: Optional[str] = None):
+        """Linhas mortas (ou pares mortos da dimensão multivalorada), em ordem, calculadas uma vez por versão"""
+        positions = self._dead_positions.get(edge)
+        if positions is None:
+            alive = self.alive if edge is None else self.edge_column(edge, 'alive')
+            positions = self._dead_positions[edge] = np.flatnonzero(~alive)
+        return positions
+    
+    def find_rows(self, ticket_ids):
+        """Linhas (vivas ou não) que guardam os IDs informados"""
+        sorted_ids, id_rows = self.id_index
+        found = []
+        if len(sorted_ids):
+            positions = np.minimum(np.searchsorted(sorted_ids, ticket_ids), len(sorted_ids) - 1)
+            found = id_rows[positions[sorted_ids[positions] == ticket_ids]]
+        appended = self.sorted_rows + np.flatnonzero(np.isin(self.ids[self.sorted_rows:], ticket_ids))
+        return np.concatenate((np.asarray(found, np.int64), appended))
+
+
+class ColumnarTicketStore:
+    """Tickets em colunas NumPy para filtros e agrupamentos vetorizados
+    
+    Colunas escalares guardam o status, a prioridade (código de dicionário), a data
+    de criação em segundos desde a época e o dia correspondente. Níveis, grupos e
+    técnicos são multivalorados e ficam em pares (linha, código): um ticket conta
+    uma vez em cada valor, como nas contagens do GLPI.
+    
+    As linhas ficam ordenadas pela data de criação, então filtros de data viram uma
+    fatia (busca binária) em vez de uma máscara. Atualizações anexam a nova versão
+    do ticket e marcam a anterior como morta; quando linhas anexadas e mortas passam
+    de compact_ratio, as colunas são compactadas e reordenadas.
+    """
+    
+    SCALAR_DIMENSIONS = ('status', 'priority', 'day')
+    MULTI_DIMENSIONS = ('level', 'group', 'technician')
+    DIMENSIONS = SCALAR_DIMENSIONS + MULTI_DIMENSIONS
+    
+    def __init__(self, compact_ratio: float = 0.1):
+        if np is None:
+            raise RuntimeError("NumPy não instalado: store colunar indisponível")
+        
+        self.compact_ratio = compact_ratio
+        self.dictionaries = {name: ValueDictionary() for name in ('priority',) + self.MULTI_DIMENSIONS}
+        self._lock = threading.Lock()
+        self._buffers: Dict[Tuple[str, ...], _ColumnBuffer] = {}
+        self._snapshot = self._sorted(self._encode([], 0))
+        self._stats = {"loads": 0, "upserts": 0, "deletes": 0, "compactions": 0,
+                       "queries": 0, "last_query_ms": None, "max_query_ms": 0.0}
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """NumPy está instalado"""
+        return np is not None
+    
+    @staticmethod
+    def _parse_timestamps(values: Sequence[Optional[str]]):
+        """Converte datas do GLPI ('YYYY-MM-DD HH:MM:SS') em segundos desde a época, de uma vez"""
+        cleaned = [value if value else 'NaT' for value in values]
+        try:
+            return np.array(cleaned, dtype='datetime64[s]').astype(np.int64)
+        except ValueError:
+            # Formato inesperado em alguma linha: converte uma a uma, tratando a inválida como ausente
+            parsed = []
+            for value in cleaned:
+                try:
+                    parsed.append(np.datetime64(value, 's'))
+                except ValueError:
+                    parsed.append(np.datetime64('NaT'))
+            return np.array(parsed, dtype='datetime64[s]').astype(np.int64)
+    
+    @staticmethod
+    def to_timestamp(value: Optional[str]) -> Optional[int]:
+        """Limite de filtro (data ou ISO 8601) em segundos desde a época, na mesma base das colunas"""
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '').replace('T', ' '))
+        return int((parsed.replace(tzinfo=None) - datetime(1970, 1, 1)).total_seconds())
+    
+    @staticmethod
+    def _priority_key(value) -> Optional[str]:
+        """Prioridades como texto: o GLPI pode devolver o ID ou o nome, e o filtro chega como texto"""
+        return None if value is None else str(value)
+    
+    def _encode(self, records: List[Dict[str, Any]], row_offset: int) -> Tuple[Dict[str, Any], Dict[str, Tuple]]:
+        """Codifica os registros (mesmo formato do espelho de tickets) em colunas, na ordem recebida"""
+        priority_dictionary = self.dictionaries['priority']
+        edges = {name: ([], []) for name in self.MULTI_DIMENSIONS}
+        
+        for position, record in enumerate(records):
+            row = row_offset + position
+            # Cada valor aparece uma vez por ticket (o mesmo grupo pode vir com níveis diferentes)
+            values = {
+                'level': dict.fromkeys(level for _, level in record['groups'] if level),
+                'group': dict.fromkeys(group for group, _ in record['groups']),
+                'technician': dict.fromkeys(record['technicians'])
+            }
+            for name, items in values.items():
+                dictionary = self.dictionaries[name]
+                rows, codes = edges[name]
+                for item in items:
+                    rows.append(row)
+                    codes.append(dictionary.encode(item))
+        
+        created = self._parse_timestamps([record['date_creation'] for record in records])
+        columns = {
+            'ids': np.fromiter((record['id'] for record in records), np.int64, len(records)),
+            'status': np.fromiter((record['status'] or 0 for record in records), np.int8, len(records)),
+            'priority': np.fromiter((priority_dictionary.encode(self._priority_key(record['priority']))
+                                     for record in records), np.int16, len(records)),
+            'created': created,
+            'day': np.where(created == MISSING_TIMESTAMP, 0, created // 86400).astype(np.int32),
+            'alive': np.ones(len(records), bool)
+        }
+        return columns, {
+            name: (np.array(rows, np.int32), np.array(codes, np.int32)) for name, (rows, codes) in edges.items()
+        }
+    
+    @staticmethod
+    def _sorted(encoded: Tuple[Dict[str, Any], Dict[str, Tuple]], keep=None) -> _Snapshot:
+        """Ordena as linhas (só as marcadas em keep, se informado) pela data de criação e renumera as arestas"""
+        columns, edges = encoded
+        rows = len(columns['ids'])
+        selected = np.flatnonzero(keep) if keep is not None else np.arange(rows)
+        order = selected[np.argsort(columns['created'][selected], kind='stable')]
+        
+        new_rows = np.full(rows, -1, np.int64)
+        new_rows[order] = np.arange(len(order))
+        sorted_edges = {}
+        for name, (edge_rows, codes) in edges.items():
+            positions = new_rows[edge_rows]
+            kept = positions >= 0
+            positions, codes = positions[kept], codes[kept]
+            edge_order = np.argsort(positions, kind='stable')
+            sorted_edges[name] = (positions[edge_order].astype(np.int32), codes[edge_order])
+        
+        sorted_columns = {name: column[order] for name, column in columns.items()}
+        sorted_columns['alive'] = np.ones(len(order), bool)
+        id_rows = np.argsort(sorted_columns['ids'])
+        return _Snapshot(sorted_columns, sorted_edges, len(order), (sorted_columns['ids'][id_rows], id_rows))
+    
+    def replace(self, records: List[Dict[str, Any]]):
+        """Substitui todo o conteúdo (carga inicial ou reconciliação completa)"""
+        # Os dicionários só crescem: consultas em andamento continuam decodificando a versão anterior
+        with self._lock:
+            self._snapshot = self._sorted(self._encode(records, 0))
+            self._buffers.clear()
+            self._stats["loads"] += 1
+    
+    def upsert(self, records: List[Dict[str, Any]]):
+        """Anexa a versão nova dos tickets e marca as anteriores como mortas"""
+        if not records:
+            return
+        with self._lock:
+            current = self._snapshot
+            columns, edges = self._encode(records, current.rows)
+            alive = current.alive.copy()
+            alive[current.find_rows(columns['ids'])] = False
+            
+            merged = {
+                name: self._append((name,), column, columns[name])
+                for name, column in current.columns().items() if name != 'alive'
+            }
+            merged['alive'] = np.concatenate((alive, columns['alive']))
+            merged_edges = {
+                name: tuple(self._append(('edges', name, str(index)), current.edges[name][index], edges[name][index])
+                            for index in (0, 1))
+                for name in self.MULTI_DIMENSIONS
+            }
+            snapshot = _Snapshot(merged, merged_edges, current.sorted_rows, current.id_index)
+            # Valores escalares de linhas existentes não mudam: as colunas por aresta só ganham a parte nova
+            for (edge, name), column in list(current.edge_columns.items()):
+                if name != 'alive':
+                    added = columns[name][edges[edge][0] - current.rows]
+                    snapshot.edge_columns[(edge, name)] = self._append(('edge_column', edge, name), column, added)
+            self._publish(snapshot)
+            self._stats["upserts"] += len(records)
+    
+    def delete(self, ticket_ids: Iterable[int]):
+        """Marca os tickets como removidos"""
+        ticket_ids = np.fromiter(ticket_ids, np.int64)
+        if not len(ticket_ids):
+            return
+        with self._lock:
+            current = self._snapshot
+            alive = current.alive.copy()
+            alive[current.find_rows(ticket_ids)] = False
+            snapshot = _Snapshot(dict(current.columns(), alive=alive), current.edges,
+                                 current.sorted_rows, current.id_index)
+            snapshot.edge_columns.update(
+                (key, column) for key, column in list(current.edge_columns.items()) if key[1] != 'alive'
+            )
+            self._publish(snapshot)
+            self._stats["deletes"] += len(ticket_ids)
+    
+    def _append(self, key: Tuple[str, ...], current, values):
+        """Anexa valores à coluna da versão vigente reaproveitando a folga do buffer"""
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.view is not current:
+            buffer = self._buffers[key] = _ColumnBuffer(current)
+        return buffer.append(values)
+    
+    def _publish(self, snapshot: _Snapshot):
+        """Publica a nova versão das colunas (compactando e reordenando se houver linhas anexadas ou mortas demais)"""
+        pending = snapshot.rows - snapshot.sorted_rows + snapshot.dead
+        if pending > self.compact_ratio * snapshot.rows:
+            snapshot = self._sorted((snapshot.columns(), snapshot.edges), keep=snapshot.alive)
+            self._buffers.clear()
+            self._stats["compactions"] += 1
+        self._snapshot = snapshot
+    
+    @staticmethod
+    def _segments(snapshot: _Snapshot, start: Optional[int], end: Optional[int],
+                  dated: bool) -> List[Tuple[int, int, bool]]:
+        """Faixas [lo, hi) a examinar: a fatia da parte ordenada dentro do período e a parte anexada"""
+        ordered = snapshot.created[:snapshot.sorted_rows]
+        lo, hi = 0, snapshot.sorted_rows
+        if dated:
+            # Tickets sem data ficam no início da parte ordenada
+            lo = int(np.searchsorted(ordered, MISSING_TIMESTAMP, 'right'))
+        if start is not None:
+            lo = max(lo, int(np.searchsorted(ordered, start, 'right')))
+        if end is not None:
+            hi = int(np.searchsorted(ordered, end, 'left'))
+        
+        segments = [(lo, hi, False)] if hi > lo else []
+        if snapshot.rows > snapshot.sorted_rows:
+            segments.append((snapshot.sorted_rows, snapshot.rows, True))
+        return segments
+    
+    @staticmethod
+    def _edge_range(snapshot: _Snapshot, name: str, lo: int, hi: int) -> slice:
+        """Fatia dos pares (linha, código) que pertencem às linhas [lo, hi)"""
+        rows = snapshot.edges[name][0]
+        # Limites no mesmo dtype da coluna: evita converter o array inteiro na busca
+        first, last = np.searchsorted(rows, np.array((lo, hi), rows.dtype))
+        return slice(int(first), int(last))
+    
+    @staticmethod
+    def _dead_within(snapshot: _Snapshot, edge: Optional[str], start: int, stop: int, rows=None):
+        """Posições mortas de [start, stop), relativas ao início da faixa (ou aos índices rows, se informados)"""
+        dead = snapshot.dead_positions(edge)
+        dead = dead[np.searchsorted(dead, start):np.searchsorted(dead, stop)]
+        if rows is None:
+            return dead - start
+        positions = np.searchsorted(rows, dead)
+        inside = positions < len(rows)
+        positions, dead = positions[inside], dead[inside]
+        return positions[rows[positions] == dead]
+    
+    @staticmethod
+    def _combine(mask, condition):
+        # Nunca altera a máscara no lugar: ela pode ser uma fatia da coluna alive
+        return condition if mask is None else mask & condition
+    
+    def _segment_selection(self, snapshot: _Snapshot, lo: int, hi: int, unsorted: bool, start: Optional[int],
+                           end: Optional[int], dated: bool, status=None, priority=None, level=None, group=None,
+                           technician=None, alive: bool = True):
+        """Linhas de [lo, hi) que atendem aos filtros, como (índices, máscara)
+        
+        Sem filtro multivalorado os índices são None (a fatia inteira); com ele, só as
+        linhas que têm o valor entram, em ordem. A máscara se alinha às linhas
+        escolhidas (None = todas).
+        """
+        rows = None
+        for name, value in (('level', level), ('group', group), ('technician', technician)):
+            if value is None:
+                continue
+            edges = self._edge_range(snapshot, name, lo, hi)
+            codes = snapshot.edges[name][1][edges]
+            matched = snapshot.edges[name][0][edges][np.flatnonzero(codes == (self.dictionaries[name].lookup(value) or -1))]
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        
+        pick = (lambda column: column[lo:hi]) if rows is None else (lambda column: column[rows])
+        mask = pick(snapshot.alive) if alive and snapshot.dead else None
+        
+        if unsorted and dated:
+            created = pick(snapshot.created)
+            condition = created != MISSING_TIMESTAMP
+            if start is not None:
+                condition &= created > start
+            if end is not None:
+                condition &= created < end
+            mask = self._combine(mask, condition)
+        
+        if status is not None:
+            statuses = np.atleast_1d(status)
+            column = pick(snapshot.status)
+            mask = self._combine(mask, column == statuses[0] if len(statuses) == 1 else np.isin(column, statuses))
+        if priority is not None:
+            code = self.dictionaries['priority'].lookup(self._priority_key(priority)) or -1
+            mask = self._combine(mask, pick(snapshot.priority) == code)
+        
+        return rows, mask
+    
+    @staticmethod
+    def _count_codes(flat, size: int, offset: int):
+        """Contagem dos códigos offset..offset + size - 1"""
+        if size <= 8:
+            # Poucos grupos: comparações vetorizadas saem mais baratas que o bincount
+            return np.array([np.count_nonzero(flat == code) for code in range(offset, offset + size)], np.int64)
+        return np.bincount(flat, minlength=offset + size)[offset:]
+    
+    def _record_query(self, started: float):
+        elapsed = (time.perf_counter() - started) * 1000
+        self._stats["queries"] += 1
+        self._stats["last_query_ms"] = round(elapsed, 3)
+        self._stats["max_query_ms"] = round(max(self._stats["max_query_ms"], elapsed), 3)
+    
+    def count(self, start_date: str = None, end_date: str = None, **filters) -> int:
+        """Quantidade de tickets que atendem aos filtros (datas com a semântica morethan/lessthan do GLPI)"""
+        started = time.perf_counter()
+        snapshot = self._snapshot
+        start, end = self.to_timestamp(start_date), self.to_timestamp(end_date)
+        dated = start is not None or end is not None
+        
+        total = 0
+        for lo, hi, unsorted in self._segments(snapshot, start, end, dated):
+            # Na parte ordenada as linhas mortas (poucas) são descontadas em vez de mascaradas
+            rows, mask = self._segment_selection(snapshot, lo, hi, unsorted, start, end, dated,
+                                                 alive=unsorted, **filters)
+            if mask is not None:
+                total += int(np.count_nonzero(mask))
+            else:
+                total += hi - lo if rows is None else len(rows)
+            
+            if snapshot.dead and not unsorted:
+                dead = self._dead_within(snapshot, None, lo, hi, rows)
+                total -= len(dead) if mask is None else int(np.count_nonzero(mask[dead]))
+        
+        self._record_query(started)
+        return total
+    
+    def group_count(self, dimensions: Sequence[str], start_date: str = None, end_date: str = None,
+                    **filters) -> Dict[Tuple[Any, ...], int]:
+        """Contagens por combinação das dimensões (status, priority, day, level, group, technician)
+        
+        No máximo uma dimensão multivalorada por consulta; as chaves vêm decodificadas
+        (status como ID, dia como data ISO, demais dimensões pelo valor original).
+        """
+        dimensions = tuple(dimensions)
+        unknown = [name for name in dimensions if name not in self.DIMENSIONS]
+        if unknown or not dimensions:
+            raise ValueError(f"Dimensões inválidas: {', '.join(unknown) or 'nenhuma informada'}")
+        multi = [name for name in dimensions if name in self.MULTI_DIMENSIONS]
+        if len(multi) > 1:
+            raise ValueError("Apenas uma dimensão multivalorada (level, group, technician) por consulta")
+        
+        started = time.perf_counter()
+        snapshot = self._snapshot
+        start, end = self.to_timestamp(start_date), self.to_timestamp(end_date)
+        dated = start is not None or end is not None or 'day' in dimensions
+        segments = self._segments(snapshot, start, end, dated)
+        
+        sizes = {'status': snapshot.status_size}
+        sizes.update((name, len(dictionary)) for name, dictionary in self.dictionaries.items())
+        day_origin = 0
+        if 'day' in dimensions:
+            day_origin, day_last = self._day_range(snapshot, segments)
+            sizes['day'] = day_last - day_origin + 1
+        shape = tuple(sizes[name] for name in dimensions)
+        size = int(np.prod(shape, dtype=np.int64))
+        code_type = np.int32 if size < 2 ** 31 - 1 else np.int64
+        
+        totals = np.zeros(size, np.int64)
+        for lo, hi, unsorted in segments:
+            # Na parte ordenada as linhas mortas (poucas) são descontadas em vez de mascaradas
+            subtract_dead = snapshot.dead and not unsorted
+            dead = None
+            if multi:
+                # Agrupamento por aresta: a máscara das linhas é levada para os pares (linha, código)
+                edge = multi[0]
+                edges = self._edge_range(snapshot, edge, lo, hi)
+                rows, mask = self._segment_selection(snapshot, lo, hi, unsorted, start, end, dated,
+                                                     alive=False, **filters)
+                if rows is not None:
+                    selected = np.zeros(hi - lo, bool)
+                    selected[rows - lo] = True if mask is None else mask
+                    mask = selected
+                if mask is not None:
+                    mask = mask[snapshot.edges[edge][0][edges] - lo]
+                if subtract_dead:
+                    dead = self._dead_within(snapshot, edge, edges.start, edges.stop)
+                elif snapshot.dead:
+                    mask = self._combine(mask, snapshot.edge_column(edge, 'alive')[edges])
+                columns = {name: snapshot.edge_column(edge, name)[edges] for name in dimensions if name != edge}
+                columns[edge] = snapshot.edges[edge][1][edges]
+            else:
+                rows, mask = self._segment_selection(snapshot, lo, hi, unsorted, start, end, dated,
+                                                     alive=unsorted, **filters)
+                if subtract_dead:
+                    dead = self._dead_within(snapshot, None, lo, hi, rows)
+                columns = {name: getattr(snapshot, name)[lo:hi] if rows is None else getattr(snapshot, name)[rows]
+                           for name in dimensions}
+            if 'day' in columns:
+                columns['day'] = columns['day'] - day_origin
+            
+            flat = None
+            for name, dimension_size in zip(dimensions, shape):
+                flat = columns[name] if flat is None else flat * dimension_size + columns[name]
+                if len(dimensions) > 1 and flat.dtype != code_type:
+                    flat = flat.astype(code_type)
+            
+            offset = 0
+            if mask is not None:
+                # Códigos deslocados em 1: as linhas fora do filtro vão para o código 0, que não é contado
+                if size >= np.iinfo(flat.dtype).max:
+                    flat = flat.astype(code_type)
+                flat, offset = (flat + 1) * mask, 1
+            totals += self._count_codes(flat, size, offset)
+            if dead is not None and len(dead):
+                totals -= np.bincount(flat[dead], minlength=offset + size)[offset:]
+        
+        keys = np.flatnonzero(totals)
+        decoded = [self._decode(name, column, day_origin)
+                   for name, column in zip(dimensions, np.unravel_index(keys, shape))]
+        result = dict(zip(zip(*decoded), totals[keys].tolist()))
+        
+        self._record_query(started)
+        return result
+    
+    @staticmethod
+    def _day_range(snapshot: _Snapshot, segments: List[Tuple[int, int, bool]]) -> Tuple[int, int]:
+        """Primeiro e último dia das linhas examinadas (na parte ordenada, os extremos da fatia)"""
+        days = []
+        for lo, hi, unsorted in segments:
+            if unsorted:
+                dated_days = snapshot.day[lo:hi][snapshot.created[lo:hi] != MISSING_TIMESTAMP]
+                if len(dated_days):
+                    days += [int(dated_days.min()), int(dated_days.max())]
+            else:
+                days += [int(snapshot.day[lo]), int(snapshot.day[hi - 1])]
+        return (min(days), max(days)) if days else (0, 0)
+    
+    def _decode(self, name: str, codes, day_origin: int) -> List[Any]:
+        if name == 'status':
+            return [code or None for code in codes.tolist()]
+        if name == 'day':
+            return np.datetime_as_string((codes + day_origin).astype('datetime64[D]')).tolist()
+        values = self.dictionaries[name].values
+        return [values[code] for code in codes.tolist()]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o volume das colunas, a memória ocupada e o tempo das agregações"""
+        snapshot = self._snapshot
+        arrays = list(snapshot.columns().values()) + list(snapshot.id_index)
+        arrays += [array for edge in snapshot.edges.values() for array in edge]
+        return dict(
+            self._stats,
+            rows=snapshot.rows,
+            tickets=snapshot.rows - snapshot.dead,
+            pending_rows=snapshot.rows - snapshot.sorted_rows + snapshot.dead,
+            memory_bytes=sum(array.nbytes for array in arrays),
+            dictionaries={name: len(dictionary) - 1 for name, dictionary in self.dictionaries.items()}
+        )
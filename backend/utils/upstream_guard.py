@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('upstream_guard')
+
+_current_failures: contextvars.ContextVar = contextvars.ContextVar('glpi_upstream_failures', default=None)
+
+
+class UpstreamUnavailableError(Exception):
+    """Chamada ao GLPI recusada sem ir à rede (circuito aberto ou limite de concorrência esgotado)"""
+
+
+class FailureCounter:
+    """Falhas e recusas das chamadas ao GLPI disparadas por uma única computação"""
+    
+    def __init__(self, parent: 'FailureCounter' = None):
+        self._lock = threading.Lock()
+        self._parent = parent  # Escopo externo, que também conta as falhas deste
+        self.total = 0
+    
+    def add(self):
+        with self._lock:
+            self.total += 1
+        if self._parent is not None:
+            self._parent.add()
+
+
+def get_current_failures() -> Optional[FailureCounter]:
+    """Retorna o contador de falhas da computação em andamento, se houver"""
+    return _current_failures.get()
+
+
+def record_upstream_failure():
+    """Conta uma falha ou recusa na computação em andamento (chamado no contexto da própria chamada)"""
+    failures = _current_failures.get()
+    if failures is not None:
+        failures.add()
+
+
+@contextmanager
+def failure_scope():
+    """Conta as falhas das chamadas ao GLPI da computação atual, sem as de outras requisições concorrentes"""
+    failures = FailureCounter(_current_failures.get())
+    token = _current_failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _current_failures.reset(token)
+
+
+class UpstreamGuard:
+    """Limitador adaptativo de requisições em voo (AIMD) e circuit breaker para o GLPI
+    
+    Respostas rápidas e bem-sucedidas aumentam o limite aos poucos (+1 a cada
+    `limit` sucessos); erros ou latência acima do alvo o reduzem pela metade.
+    Quando a taxa de falhas da janela recente passa do limiar, o circuito abre
+    e as chamadas falham imediatamente; após `open_seconds` o circuito fica
+    meio-aberto e libera uma sonda: sucesso fecha o circuito, falha reabre.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 32,
+                 latency_target: float = 2.0, window: int = 20, failure_threshold: float = 0.5,
+                 min_calls: int = 5, open_seconds: float = 30, decrease_factor: float = 0.5):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.decrease_factor = decrease_factor
+        
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probing = False
+        self._last_decrease = 0.0
+        self._latency_ewma = None
+        self._stats = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+    
+    def _admit(self, now: float) -> bool:
+        """Tenta ocupar uma vaga (sob o lock); levanta UpstreamUnavailableError com o circuito aberto"""
+        if self._state == self.OPEN:
+            if now - self._opened_at < self.open_seconds:
+                self._stats["rejected"] += 1
+                record_upstream_failure()
+                raise UpstreamUnavailableError("GLPI indisponível (circuito aberto)")
+            self._state = self.HALF_OPEN
+            self._probing = False
+            logger.info("Circuito do GLPI meio-aberto: enviando requisição de sonda")
+        
+        if self._state == self.HALF_OPEN:
+            # Apenas uma sonda por vez; as demais chamadas falham rápido até o resultado
+            if self._probing:
+                self._stats["rejected"] += 1
+                record_upstream_failure()
+                raise UpstreamUnavailableError("GLPI em recuperação (sonda em andamento)")
+            self._probing = True
+            self._in_flight += 1
+            return True
+        
+        if self._in_flight < int(self.limit):
+            self._in_flight += 1
+            return True
+        return False
+    
+    def acquire(self, timeout: float = None):
+        """Aguarda uma vaga para enviar a requisição ao GLPI"""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            while not self._admit(time.time()):
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    self._stats["rejected"] += 1
+                    record_upstream_failure()
+                    raise UpstreamUnavailableError("Tempo esgotado aguardando vaga para requisição ao GLPI")
+                self._cond.wait(remaining)
+    
+    def try_acquire(self) -> bool:
+        """Ocupa uma vaga se houver, sem aguardar (usado pelo UpstreamScheduler)"""
+        with self._cond:
+            return self._admit(time.time())
+    
+    async def acquire_async(self, timeout: float = None, poll_interval: float = 0.01):
+        """Versão para o event loop: aguarda a vaga sem bloquear o loop"""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            with self._cond:
+                if self._admit(time.time()):
+                    return
+                if deadline is not None and time.time() >= deadline:
+                    self._stats["rejected"] += 1
+                    record_upstream_failure()
+                    raise UpstreamUnavailableError("Tempo esgotado aguardando vaga para requisição ao GLPI")
+            await asyncio.sleep(poll_interval)
+    
+    def release(self, latency: float, success: Optional[bool]):
+        """Registra o resultado da requisição e ajusta o limite e o estado do circuito
+        
+        success=None libera a vaga sem resultado (a requisição não chegou a ir ao
+        GLPI, ex.: nenhuma sessão livre no pool): não conta como falha nem sucesso.
+        """
+        now = time.time()
+        slow = latency > self.latency_target
+        
+        with self._cond:
+            self._in_flight -= 1
+            if success is None:
+                if self._state == self.HALF_OPEN:
+                    self._probing = False  # A sonda não foi enviada: a próxima chamada a envia
+                self._cond.notify_all()
+                return
+            
+            self._stats["calls"] += 1
+            if not success:
+                self._stats["failures"] += 1
+                record_upstream_failure()
+            if slow:
+                self._stats["slow"] += 1
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+            
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+                if success and not slow:
+                    self._close()
+                else:
+                    self._open(now)
+            else:
+                self._outcomes.append(success)
+                self._adjust_limit(success and not slow, now)
+                
+                failures = self._outcomes.count(False)
+                if (self._state == self.CLOSED and len(self._outcomes) >= self.min_calls and
+                        failures / len(self._outcomes) >= self.failure_threshold):
+                    self._open(now)
+            
+            self._cond.notify_all()
+    
+    def _adjust_limit(self, healthy: bool, now: float):
+        if healthy:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif now - self._last_decrease >= self.latency_target:
+            # Uma redução por intervalo: várias respostas lentas do mesmo pico contam uma vez
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            self._last_decrease = now
+    
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._stats["opened"] += 1
+        self.limit = float(self.min_limit)
+        logger.warning(f"Circuito do GLPI aberto por {self.open_seconds}s (falhas ou lentidão)")
+    
+    def _close(self):
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._outcomes.clear()
+        logger.info("Circuito do GLPI fechado: sonda bem-sucedida")
+    
+    def is_open(self) -> bool:
+        """Circuito aberto e ainda dentro do período de espera (chamadas falhariam imediatamente)"""
+        with self._cond:
+            return self._state == self.OPEN and time.time() - self._opened_at < self.open_seconds
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o estado do circuito, o limite atual e os contadores"""
+        with self._cond:
+            return dict(
+                self._stats,
+                state=self._state,
+                limit=int(self.limit),
+                in_flight=self._in_flight,
+                latency_ewma=round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+                recent_failure_rate=round(self._outcomes.count(False) / len(self._outcomes), 2) if self._outcomes else 0.0
+            )
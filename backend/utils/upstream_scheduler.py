@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from backend.utils.upstream_guard import UpstreamGuard, UpstreamUnavailableError, record_upstream_failure
+
+logger = logging.getLogger('upstream_scheduler')
+
+
+class RequestPriority:
+    """Classes de prioridade das chamadas ao GLPI (menor valor é atendido primeiro)"""
+    
+    INTERACTIVE = 0  # Contagens do dashboard aguardadas por um usuário
+    RANKING = 1  # Reconstrução do ranking de técnicos (centenas de chamadas)
+    BACKGROUND = 2  # Pré-aquecimento e atualizações em segundo plano
+    
+    NAMES = {INTERACTIVE: 'interactive', RANKING: 'ranking', BACKGROUND: 'background'}
+
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar('glpi_request_priority',
+                                                                   default=RequestPriority.INTERACTIVE)
+
+
+def get_current_priority() -> int:
+    """Prioridade das chamadas ao GLPI feitas no contexto atual"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: int):
+    """Define a prioridade das chamadas do bloco; escopos aninhados nunca elevam a prioridade"""
+    token = _current_priority.set(max(_current_priority.get(), priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class UpstreamScheduler:
+    """Fila de prioridade e limite global de taxa (token bucket) para as chamadas ao GLPI
+    
+    As chamadas aguardam em uma fila ordenada por (prioridade, chegada); apenas a
+    primeira da fila pode ser despachada, quando há um token disponível no bucket
+    e uma vaga no limite adaptativo do UpstreamGuard. Assim uma reconstrução do
+    ranking ou um pré-aquecimento nunca passam à frente das contagens interativas.
+    """
+    
+    def __init__(self, guard: UpstreamGuard, rate: float = 0, burst: int = 0):
+        self.guard = guard
+        self.rate = max(rate, 0.0)  # Requisições por segundo ao GLPI (0 = sem limite)
+        self.burst = max(burst or int(self.rate) or 1, 1)
+        
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._stats = {
+            name: {"dispatched": 0, "rejected": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for name in RequestPriority.NAMES.values()
+        }
+    
+    def _refill(self, now: float):
+        if self.rate:
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    def _try_dispatch(self, ticket: Tuple[int, int]) -> Optional[float]:
+        """Despacha a chamada se for a primeira da fila (sob o lock); senão retorna quanto aguardar
+        
+        Retorna 0 quando despachada, os segundos até o próximo token ou None para
+        aguardar uma notificação (outra chamada à frente ou limite do guard atingido).
+        """
+        if self._queue[0] != ticket:
+            return None
+        
+        now = time.monotonic()
+        self._refill(now)
+        if self.rate and self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        
+        if not self.guard.try_acquire():
+            return None
+        
+        if self.rate:
+            self._tokens -= 1
+        heapq.heappop(self._queue)
+        self._cond.notify_all()
+        return 0
+    
+    def _enqueue(self, priority: Optional[int]) -> Tuple[int, int]:
+        if priority is None:
+            priority = get_current_priority()
+        ticket = (priority, next(self._sequence))
+        heapq.heappush(self._queue, ticket)
+        return ticket
+    
+    def _leave(self, ticket: Tuple[int, int]):
+        """Retira da fila uma chamada que desistiu (tempo esgotado ou circuito aberto)"""
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+            self._cond.notify_all()
+    
+    def _record(self, ticket: Tuple[int, int], waited: float, dispatched: bool):
+        stats = self._stats[RequestPriority.NAMES.get(ticket[0], 'background')]
+        if dispatched:
+            stats["dispatched"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+        else:
+            stats["rejected"] += 1
+            record_upstream_failure()
+    
+    def acquire(self, timeout: float = None, priority: int = None):
+        """Aguarda a vez da chamada; levanta UpstreamUnavailableError se o tempo esgotar ou o circuito abrir"""
+        started = time.time()
+        deadline = started + timeout if timeout is not None else None
+        
+        with self._cond:
+            ticket = self._enqueue(priority)
+            try:
+                while True:
+                    wait = self._try_dispatch(ticket)
+                    if wait == 0:
+                        self._record(ticket, time.time() - started, True)
+                        return
+                    
+                    remaining = deadline - time.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise UpstreamUnavailableError("Tempo esgotado na fila de requisições ao GLPI")
+                    
+                    if wait is None:
+                        wait = remaining
+                    elif remaining is not None:
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            except UpstreamUnavailableError:
+                self._record(ticket, time.time() - started, False)
+                self._leave(ticket)
+                raise
+    
+    async def acquire_async(self, timeout: float = None, priority: int = None, poll_interval: float = 0.01):
+        """Versão para o event loop: aguarda a vez sem bloquear o loop"""
+        started = time.time()
+        deadline = started + timeout if timeout is not None else None
+        
+        with self._cond:
+            ticket = self._enqueue(priority)
+        
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_dispatch(ticket)
+                    if wait == 0:
+                        self._record(ticket, time.time() - started, True)
+                        return
+                    if deadline is not None and time.time() >= deadline:
+                        raise UpstreamUnavailableError("Tempo esgotado na fila de requisições ao GLPI")
+                await asyncio.sleep(min(wait, 1.0) if wait else poll_interval)
+        except (UpstreamUnavailableError, asyncio.CancelledError):
+            with self._cond:
+                self._record(ticket, time.time() - started, False)
+                self._leave(ticket)
+            raise
+    
+    def release(self, latency: float, success: Optional[bool]):
+        """Registra o resultado no guard e libera a vez da próxima chamada da fila (None: sem resultado)"""
+        self.guard.release(latency, success)
+        with self._cond:
+            self._cond.notify_all()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna a fila por prioridade, o limite de taxa e os tempos de espera"""
+        with self._cond:
+            self._refill(time.monotonic())
+            queued = {name: 0 for name in RequestPriority.NAMES.values()}
+            for priority, _ in self._queue:
+                queued[RequestPriority.NAMES.get(priority, 'background')] += 1
+            
+            return {
+                "rate_limit": self.rate or None,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2) if self.rate else None,
+                "queued": queued,
+                "classes": {
+                    name: dict(
+                        stats,
+                        wait_total=round(stats["wait_total"], 3),
+                        wait_max=round(stats["wait_max"], 3),
+                        wait_avg=round(stats["wait_total"] / stats["dispatched"], 3) if stats["dispatched"] else 0.0
+                    )
+                    for name, stats in self._stats.items()
+                }
+            }
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # fcntl só existe em sistemas POSIX
+    fcntl = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger('worker_lock')
+
+
+class WorkerLock(ABC):
+    """Lock exclusivo entre os workers para tarefas que apenas um deles deve executar
+    
+    Não bloqueia: try_acquire() devolve se este processo detém o lock e, quando já o
+    detém, apenas o renova. O lock fica com o processo até release() ou até o processo
+    terminar (flock liberado pelo sistema, chave do Redis expirada pelo TTL).
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._held = False
+    
+    @property
+    def held(self) -> bool:
+        return self._held
+    
+    def try_acquire(self) -> bool:
+        with self._lock:
+            try:
+                self._held = self._renew() if self._held else self._acquire()
+            except Exception as e:
+                logger.warning(f"Falha no lock '{self.name}' entre workers: {e}")
+                self._held = False
+            return self._held
+    
+    def release(self):
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+            try:
+                self._release()
+            except Exception as e:
+                logger.debug(f"Falha ao liberar o lock '{self.name}': {e}")
+    
+    @abstractmethod
+    def _acquire(self) -> bool:
+        """Tenta obter o lock sem bloquear"""
+    
+    @abstractmethod
+    def _renew(self) -> bool:
+        """Confirma (e renova) o lock já obtido; False se ele foi perdido"""
+    
+    @abstractmethod
+    def _release(self):
+        """Libera o lock"""
+
+
+class FileWorkerLock(WorkerLock):
+    """Lock por flock em um arquivo mantido aberto (workers de uma mesma máquina)"""
+    
+    def __init__(self, name: str, path: str):
+        super().__init__(name)
+        self._path = path
+        self._file = None
+    
+    def _acquire(self) -> bool:
+        lock_file = open(self._path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+    
+    def _renew(self) -> bool:
+        return True
+    
+    def _release(self):
+        lock_file, self._file = self._file, None
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+
+class RedisWorkerLock(WorkerLock):
+    """Lock distribuído no Redis (redis-py Lock) com TTL renovado a cada try_acquire()"""
+    
+    def __init__(self, name: str, client, key: str, ttl: float):
+        super().__init__(name)
+        # thread_local=False: obtido na thread da tarefa e liberado por outra no encerramento
+        self._redis_lock = client.lock(key, timeout=ttl, thread_local=False)
+    
+    def _acquire(self) -> bool:
+        return bool(self._redis_lock.acquire(blocking=False))
+    
+    def _renew(self) -> bool:
+        try:
+            self._redis_lock.reacquire()
+            return True
+        except redis.exceptions.LockError:
+            # Expirou (ex.: processo suspenso além do TTL): disputa de novo com os demais workers
+            return self._acquire()
+    
+    def _release(self):
+        try:
+            self._redis_lock.release()
+        except redis.exceptions.LockError:
+            pass
+
+
+def create_worker_lock(config, name: str) -> Optional[WorkerLock]:
+    """Cria o lock entre workers: Redis quando GLPI_SESSION_BROKER=redis, senão flock
+    
+    Retorna None quando nenhum mecanismo está disponível; nesse caso cada processo
+    executa a tarefa como se fosse o único worker.
+    """
+    if getattr(config, 'GLPI_SESSION_BROKER', 'none') == 'redis' and redis is not None:
+        try:
+            client = redis.from_url(
+                config.REDIS_URL,
+                socket_connect_timeout=config.GLPI_CACHE_REDIS_TIMEOUT,
+                socket_timeout=config.GLPI_CACHE_REDIS_TIMEOUT
+            )
+            client.ping()
+            key = f"{getattr(config, 'CACHE_KEY_PREFIX', 'glpi_dashboard:')}{name}:leader"
+            return RedisWorkerLock(name, client, key, config.GLPI_WORKER_LOCK_TTL)
+        except redis.RedisError as e:
+            logger.warning(f"Redis não disponível ({e}), lock '{name}' por arquivo")
+    
+    if fcntl is None:
+        logger.warning(f"flock indisponível nesta plataforma, lock '{name}' entre workers desabilitado")
+        return None
+    
+    os.makedirs(config.GLPI_WORKER_LOCK_DIR, exist_ok=True)
+    return FileWorkerLock(name, os.path.join(config.GLPI_WORKER_LOCK_DIR, f"glpi_dashboard_{name}.lock"))
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+# Raiz do repositório no path para importar o pacote backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Testes do prazo das computações do dashboard (Deadline) e das respostas parciais"""
+import threading
+import time
+
+import pytest
+
+from backend.services.glpi_service import GLPIService
+from backend.utils.deadline import Deadline, deadline_scope, get_current_deadline
+from backend.utils.fan_out import ParallelFanOut
+
+
+def test_remaining_and_cap():
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert deadline.cap(30) == pytest.approx(deadline.remaining(), abs=0.1)
+    assert deadline.cap(1) == 1
+    assert not deadline.expired()
+    
+    past = Deadline(-1)
+    assert past.remaining() == 0.0
+    assert past.expired()
+
+
+def test_nested_scope_keeps_the_shortest_deadline():
+    assert get_current_deadline() is None
+    with deadline_scope(5) as outer:
+        with deadline_scope(60) as longer:
+            assert longer is outer
+        with deadline_scope(1) as shorter:
+            assert shorter is not outer
+            assert get_current_deadline() is shorter
+        assert get_current_deadline() is outer
+    assert get_current_deadline() is None
+
+
+def test_deadline_reaches_fan_out_workers():
+    fan_out = ParallelFanOut(max_workers=4)
+    try:
+        with deadline_scope(5) as deadline:
+            seen = fan_out.map(get_current_deadline, {index: {} for index in range(4)})
+        assert all(value is deadline for value in seen.values())
+    finally:
+        fan_out.shutdown()
+
+
+class _RecordingTransport:
+    def __init__(self):
+        self.requests = []
+    
+    def request(self, method, url, **kwargs):
+        self.requests.append(url)
+        raise AssertionError("requisição feita após o prazo")
+
+
+def test_expired_deadline_abandons_request_before_calling_glpi():
+    service = GLPIService()
+    service.transport = _RecordingTransport()
+    
+    with deadline_scope(0) as deadline:
+        assert service._make_authenticated_request('GET', 'http://glpi/search/Ticket') is None
+    
+    assert deadline.exceeded
+    assert service.transport.requests == []
+
+
+def test_slow_computation_answers_partially_and_keeps_running():
+    service = GLPIService()
+    service.request_deadline = 0.05
+    release = threading.Event()
+    finished = threading.Event()
+    
+    def compute(memo):
+        memo.seed('celula', 1)
+        release.wait(1)
+        finished.set()
+        return 'completo'
+    
+    partial = lambda memo: ('parcial', memo.peek('celula'))
+    assert service._compute_within_deadline('chave', time.time(), compute, partial) == ('parcial', 1)
+    
+    # A computação segue em segundo plano e, ao terminar, sai da lista de computações em andamento
+    release.set()
+    assert finished.wait(1)
+    for _ in range(100):
+        if 'chave' not in service._deadline_computations:
+            break
+        time.sleep(0.01)
+    assert 'chave' not in service._deadline_computations
+    assert service._compute_within_deadline('chave', time.time(), lambda memo: 'rápido', partial) == 'rápido'
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Testes do broker de sessões GLPI compartilhadas entre workers (FileSessionBroker)"""
+import itertools
+import json
+import types
+
+import pytest
+
+from backend.services import glpi_session_broker
+from backend.services.glpi_session_broker import FileSessionBroker, create_session_broker
+
+pytestmark = pytest.mark.skipif(glpi_session_broker.fcntl is None, reason="flock indisponível")
+
+
+class _Tokens:
+    """initSession/killSession falsos compartilhados pelos workers do teste"""
+    
+    def __init__(self):
+        self.killed = []
+        self._sequence = itertools.count(1)
+    
+    def create(self):
+        return f"token-{next(self._sequence)}"
+    
+    def kill(self, token: str) -> bool:
+        self.killed.append(token)
+        return True
+
+
+def _broker(path, tokens, **kwargs):
+    options = dict(size=2, session_timeout=3600, refresh_before=3000, grace=0, poll_interval=0.01)
+    options.update(kwargs)
+    broker = FileSessionBroker(str(path), create_token=tokens.create, kill_token=tokens.kill, **options)
+    broker.register()
+    return broker
+
+
+def test_workers_share_the_sessions_of_each_slot(tmp_path):
+    tokens = _Tokens()
+    first = _broker(tmp_path / 'sessions.json', tokens)
+    second = _broker(tmp_path / 'sessions.json', tokens)
+    
+    leased = {first.lease()[0], first.lease()[0]}
+    assert leased == {'token-1', 'token-2'}
+    assert {second.lease()[0], second.lease()[0]} == leased
+    assert second.get_stats()['reused'] == 2
+    
+    state = json.loads((tmp_path / 'sessions.json').read_text())
+    assert sorted(current['token'] for current in state['slots'].values()) == sorted(leased)
+
+
+def test_renewal_replaces_the_same_slot_and_retires_the_old_token(tmp_path):
+    tokens = _Tokens()
+    broker = _broker(tmp_path / 'sessions.json', tokens)
+    old_token, _ = broker.lease()
+    other_token, _ = broker.lease()
+    
+    new_token, _ = broker.lease(previous_token=old_token)
+    assert new_token not in (old_token, other_token)
+    
+    # Carência zero: o token substituído é encerrado na próxima operação
+    broker.lease(previous_token=other_token)
+    assert old_token in tokens.killed
+
+
+def test_invalidated_token_is_not_handed_out_again(tmp_path):
+    tokens = _Tokens()
+    first = _broker(tmp_path / 'sessions.json', tokens, size=1)
+    second = _broker(tmp_path / 'sessions.json', tokens, size=1)
+    
+    token, _ = first.lease()
+    first.invalidate(token)
+    assert second.lease()[0] != token
+
+
+def test_last_worker_to_leave_kills_shared_sessions(tmp_path):
+    tokens = _Tokens()
+    first = _broker(tmp_path / 'sessions.json', tokens)
+    second = _broker(tmp_path / 'sessions.json', tokens)
+    token, _ = first.lease()
+    
+    first.unregister()
+    assert tokens.killed == []
+    second.unregister()
+    assert tokens.killed == [token]
+
+
+def test_unavailable_broker_falls_back_to_local_sessions(tmp_path):
+    tokens = _Tokens()
+    broker = _broker(tmp_path / 'sessions.json', tokens)
+    
+    def broken_lock():
+        raise OSError("sem acesso")
+    
+    broker._backend_lock = broken_lock
+    token, _ = broker.lease()
+    assert broker.get_stats()['fallbacks'] == 1
+    
+    # Sessões locais são encerradas pelo próprio worker
+    assert broker.release(token)
+    assert tokens.killed == [token]
+
+
+def test_factory_builds_only_the_configured_broker(tmp_path):
+    tokens = _Tokens()
+    config = types.SimpleNamespace(
+        GLPI_SESSION_BROKER='none',
+        GLPI_SESSION_BROKER_FILE=str(tmp_path / 'sessions.json'),
+        GLPI_SESSION_REFRESH_LEAD=300,
+        GLPI_SESSION_REFRESH_JITTER=60
+    )
+    assert create_session_broker(config, tokens.create, tokens.kill, 2, 3600) is None
+    
+    config.GLPI_SESSION_BROKER = 'file'
+    broker = create_session_broker(config, tokens.create, tokens.kill, 2, 3600)
+    assert isinstance(broker, FileSessionBroker)
+    assert broker.refresh_before == 3600 - 300 - 60
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Testes do pool de sessões do GLPI (GLPISessionPool e AsyncGLPISessionPool)"""
+import asyncio
+import itertools
+import threading
+import time
+
+from backend.services.glpi_session_pool import AsyncGLPISessionPool, GLPISessionPool
+
+
+class _Tokens:
+    """initSession/killSession falsos: registra os tokens criados e encerrados"""
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created = []
+        self.killed = []
+        self.renewed_from = []
+        self._sequence = itertools.count(1)
+    
+    def create(self, previous_token: str = None):
+        if self.fail:
+            return None
+        token = f"token-{next(self._sequence)}"
+        self.created.append(token)
+        if previous_token is not None:
+            self.renewed_from.append(previous_token)
+        return token
+    
+    def kill(self, token: str) -> bool:
+        self.killed.append(token)
+        return True
+
+
+def _pool(tokens, **kwargs):
+    return GLPISessionPool(tokens.create, tokens.kill, **kwargs)
+
+
+def test_idle_session_is_reused():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=2)
+    
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    
+    assert first is second
+    assert tokens.created == ['token-1']
+    assert pool.get_stats()['idle'] == 1
+
+
+def test_pool_never_exceeds_size_and_waiters_time_out():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=2)
+    a, b = pool.acquire(), pool.acquire()
+    
+    assert a.token != b.token
+    assert pool.acquire(timeout=0.05) is None
+    assert pool.get_stats()['leased'] == 2
+    
+    # Uma devolução libera quem aguarda
+    threading.Timer(0.02, pool.release, args=(a,)).start()
+    assert pool.acquire(timeout=1) is a
+    assert len(tokens.created) == 2
+
+
+def test_expired_idle_session_is_killed_and_replaced():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=1, session_timeout=3600)
+    with pool.lease() as session:
+        pass
+    session.created_at = time.time() - 7200
+    
+    with pool.lease() as replacement:
+        assert replacement.token == 'token-2'
+    assert tokens.killed == ['token-1']
+    assert pool.get_stats()['expired'] == 1
+
+
+def test_creation_failure_without_sessions_returns_none():
+    pool = _pool(_Tokens(fail=True), size=2)
+    assert pool.acquire(timeout=1) is None
+    assert pool.get_stats()['open'] == 0
+
+
+def test_adopt_replaces_oldest_idle_session_when_full():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=1)
+    with pool.lease():
+        pass
+    
+    adopted = pool.adopt('principal')
+    assert pool.adopt('principal') is adopted
+    assert tokens.killed == ['token-1']
+    assert pool.get_stats()['open'] == 1
+    with pool.lease() as session:
+        assert session is adopted
+
+
+def test_refresh_due_swaps_token_before_killing_the_old_one():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=1, session_timeout=3600, refresh_lead=600)
+    with pool.lease() as session:
+        pass
+    session.refresh_at = time.time() - 1
+    
+    swaps = []
+    # on_swap roda com o token antigo ainda aberto
+    on_swap = lambda old_token, swapped: swaps.append((old_token, swapped.token, list(tokens.killed)))
+    assert pool.refresh_due(on_swap) == 1
+    assert swaps == [('token-1', 'token-2', [])]
+    assert tokens.renewed_from == ['token-1']
+    assert tokens.killed == ['token-1']
+    assert session.refresh_at > time.time()
+
+
+def test_failed_refresh_keeps_session_and_retries_later():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=1, refresh_lead=600)
+    with pool.lease() as session:
+        pass
+    session.refresh_at = time.time() - 1
+    tokens.fail = True
+    
+    assert pool.refresh_due() == 0
+    assert session.token == 'token-1'
+    assert session.refresh_at > time.time()
+    assert pool.get_stats()['refresh_failures'] == 1
+    with pool.lease() as again:
+        assert again is session
+
+
+def test_renew_and_drain():
+    tokens = _Tokens()
+    pool = _pool(tokens, size=2)
+    with pool.lease() as session:
+        assert pool.renew(session, kill_old=True)
+        assert session.token == 'token-2'
+    assert tokens.killed == ['token-1']
+    
+    assert pool.drain() == 1
+    assert tokens.killed == ['token-1', 'token-2']
+    assert pool.get_stats()['open'] == 0
+
+
+def test_async_pool_limits_concurrent_leases():
+    tokens = _Tokens()
+    
+    async def create(previous_token=None):
+        await asyncio.sleep(0)
+        return tokens.create(previous_token)
+    
+    async def kill(token):
+        return tokens.kill(token)
+    
+    pool = AsyncGLPISessionPool(create, kill, size=2)
+    in_use = []
+    peak = []
+    
+    async def work():
+        async with pool.lease() as session:
+            in_use.append(session)
+            peak.append(len(in_use))
+            await asyncio.sleep(0.01)
+            in_use.remove(session)
+    
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+        return await pool.drain()
+    
+    assert asyncio.run(run()) == 2
+    assert max(peak) == 2
+    assert len(tokens.created) == 2
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Testes da execução dos planos de consulta pelos clientes síncrono e assíncrono"""
+import asyncio
+
+import pytest
+
+from backend.utils.io_plan import IOCall, run_plan, run_plan_async
+
+
+def _plan_sum(values):
+    total = 0
+    for value in values:
+        total += yield IOCall('double', value)
+    try:
+        yield IOCall('fail')
+    except ValueError:
+        total += 1
+    return total
+
+
+def _sync_primitives(calls):
+    def double(value):
+        calls.append(value)
+        return value * 2
+    
+    def fail():
+        raise ValueError("falha")
+    
+    return {'double': double, 'fail': fail}
+
+
+def _async_primitives(calls):
+    sync = _sync_primitives(calls)
+    
+    async def double(value):
+        await asyncio.sleep(0)
+        return sync['double'](value)
+    
+    async def fail():
+        sync['fail']()
+    
+    return {'double': double, 'fail': fail}
+
+
+def test_sync_and_async_runners_agree():
+    sync_calls, async_calls = [], []
+    assert run_plan(_plan_sum([1, 2, 3]), _sync_primitives(sync_calls)) == 13
+    assert asyncio.run(run_plan_async(_plan_sum([1, 2, 3]), _async_primitives(async_calls))) == 13
+    assert sync_calls == async_calls == [1, 2, 3]
+
+
+def test_plan_without_io_returns_immediately():
+    def plan():
+        return 'pronto'
+        yield
+    
+    assert run_plan(plan(), {}) == 'pronto'
+    assert asyncio.run(run_plan_async(plan(), {})) == 'pronto'
+
+
+def test_unhandled_primitive_error_propagates():
+    def plan():
+        yield IOCall('fail')
+    
+    with pytest.raises(ValueError):
+        run_plan(plan(), _sync_primitives([]))
+
+
+class _FakePage:
+    """Resposta de /search com linhas limitadas a 3 por página (como o list_limit_max do GLPI)"""
+    
+    def __init__(self, params, total):
+        start, end = (int(value) for value in params['range'].split('-'))
+        end = min(end, start + 2, total - 1)
+        self.ok = True
+        self.headers = {'Content-Range': f"{start}-{end}/{total}"}
+        self._rows = [{'2': row_id} for row_id in range(start, end + 1)]
+    
+    def json(self):
+        return {'data': self._rows}
+
+
+def test_search_plan_returns_same_pages_on_both_clients():
+    from backend.services.glpi_service import GLPIService
+    
+    service = GLPIService()
+    service.scan_page_size = 4
+    total = 10
+    
+    def request(method, url, params=None):
+        return _FakePage(params, total)
+    
+    async def request_async(method, url, params=None):
+        return request(method, url, params)
+    
+    async def request_many_async(tasks):
+        return {key: await request_async(**kwargs) for key, kwargs in tasks.items()}
+    
+    sync_rows = run_plan(service._plan_search_all_pages('Ticket', {}), {
+        'request': request,
+        'request_many': lambda tasks: {key: request(**kwargs) for key, kwargs in tasks.items()},
+    })
+    async_rows = asyncio.run(run_plan_async(service._plan_search_all_pages('Ticket', {}), {
+        'request': request_async,
+        'request_many': request_many_async,
+    }))
+    
+    assert sync_rows == async_rows == [{'2': row_id} for row_id in range(total)]
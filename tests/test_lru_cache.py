@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Testes do armazenamento limitado por entradas e bytes (LRUTTLCache)"""
+import time
+
+from backend.utils.lru_cache import LRUTTLCache
+
+
+def _entry(data, ttl=300, stale_ttl=None, age=0.0):
+    return {'data': data, 'timestamp': time.time() - age, 'ttl': ttl, 'stale_ttl': stale_ttl}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUTTLCache(max_entries=2, max_bytes=0)
+    cache['a'] = _entry(1)
+    cache['b'] = _entry(2)
+    cache.get('a')
+    cache['c'] = _entry(3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a')['data'] == 1
+    assert cache.get('c')['data'] == 3
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_byte_limit_evicts_and_rejects_oversized_entries():
+    cache = LRUTTLCache(max_entries=100, max_bytes=40)
+    cache['a'] = _entry('x' * 20)
+    cache['b'] = _entry('y' * 20)
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    
+    cache['grande'] = _entry('z' * 100)
+    assert cache.get('grande') is None
+    assert cache.get('b') is not None
+    assert cache.get_stats()['bytes'] <= 40
+
+
+def test_entry_lives_until_the_longest_of_ttl_and_stale_ttl():
+    cache = LRUTTLCache()
+    cache['fresca'] = _entry(1, ttl=60, age=30)
+    cache['obsoleta'] = _entry(2, ttl=60, stale_ttl=600, age=120)
+    cache['vencida'] = _entry(3, ttl=60, stale_ttl=100, age=120)
+    
+    assert cache.get('fresca')['data'] == 1
+    assert cache.get('obsoleta')['data'] == 2
+    assert cache.get('vencida') is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_expired_entries_go_before_recent_ones_when_full():
+    cache = LRUTTLCache(max_entries=2, max_bytes=0)
+    cache['recente'] = _entry(1)
+    cache['vencida'] = _entry(2, ttl=10, age=60)
+    cache['nova'] = _entry(3)
+    
+    assert cache.get('recente') is not None
+    assert cache.get('nova') is not None
+    assert cache.get_stats()['evictions'] == 0
+
+
+def test_overwrite_updates_size_accounting():
+    cache = LRUTTLCache(max_bytes=0)
+    cache['a'] = _entry('x' * 50)
+    cache['a'] = _entry('x')
+    assert len(cache) == 1
+    assert cache.get_stats()['bytes'] == len('a') + len('"x"')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Testes do índice de somas acumuladas por dia (DailyPrefixIndex)"""
+import random
+from datetime import date, timedelta
+
+from backend.utils.prefix_index import DailyPrefixIndex
+
+SERIES = [('N1', 'Novo'), ('N2', 'Novo'), (None, 'Novo')]
+DAY = date(2026, 9, 1)
+FUTURE = 10 ** 12
+
+
+def _brute_sum(values, start_day, end_day):
+    totals = {key: 0 for key in SERIES}
+    for day, counts in values.items():
+        if start_day <= day < end_day:
+            for key in SERIES:
+                totals[key] += counts.get(key, 0)
+    return totals
+
+
+def test_empty_index_sums_to_zero():
+    index = DailyPrefixIndex(SERIES)
+    assert index.range_sum(DAY, DAY + timedelta(days=7)) == {key: 0 for key in SERIES}
+    assert len(index.missing_days(DAY, DAY + timedelta(days=3), now=0)) == 3
+
+
+def test_range_sum_matches_brute_force_with_updates():
+    random.seed(3)
+    index = DailyPrefixIndex(SERIES)
+    values = {}
+    
+    # Dias fora de ordem, inclusive anteriores à origem, e regravações de dias já indexados
+    for _ in range(300):
+        day = DAY + timedelta(days=random.randint(-30, 60))
+        counts = {key: random.randint(0, 20) for key in SERIES}
+        values[day] = counts
+        index.set_day(day, counts, FUTURE)
+    
+    for _ in range(200):
+        start_day = DAY + timedelta(days=random.randint(-40, 70))
+        end_day = start_day + timedelta(days=random.randint(0, 60))
+        assert index.range_sum(start_day, end_day) == _brute_sum(values, start_day, end_day)
+
+
+def test_gap_days_count_as_zero_and_missing():
+    index = DailyPrefixIndex(SERIES)
+    index.set_day(DAY, {SERIES[0]: 5}, FUTURE)
+    index.set_day(DAY + timedelta(days=3), {SERIES[0]: 7}, FUTURE)
+    
+    assert index.range_sum(DAY, DAY + timedelta(days=4))[SERIES[0]] == 12
+    assert index.missing_days(DAY, DAY + timedelta(days=4), now=0) == [DAY + timedelta(days=1),
+                                                                          DAY + timedelta(days=2)]
+
+
+def test_expired_days_are_missing():
+    index = DailyPrefixIndex(SERIES)
+    index.set_day(DAY, {}, expires_at=100)
+    index.set_day(DAY + timedelta(days=1), {}, expires_at=300)
+    
+    assert index.missing_days(DAY, DAY + timedelta(days=2), now=200) == [DAY]
+    assert index.missing_days(DAY, DAY + timedelta(days=2), now=50) == []
+
+
+def test_expire_day_marks_only_that_day_missing():
+    index = DailyPrefixIndex(SERIES)
+    index.set_day(DAY, {SERIES[0]: 5}, FUTURE)
+    index.set_day(DAY + timedelta(days=1), {SERIES[0]: 7}, FUTURE)
+    
+    index.expire_day(DAY + timedelta(days=1))
+    index.expire_day(DAY + timedelta(days=10))  # Fora do índice: ignorado
+    index.expire_day(DAY - timedelta(days=10))
+    
+    assert index.missing_days(DAY, DAY + timedelta(days=2), now=0) == [DAY + timedelta(days=1)]
+    assert index.range_sum(DAY, DAY + timedelta(days=2))[SERIES[0]] == 12
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Testes da memoização de consultas por computação (QueryMemo)"""
+import threading
+import time
+
+import pytest
+
+from backend.utils.query_memo import QueryMemo, get_current_memo, query_memo_scope
+
+
+def test_key_ignores_parameter_order():
+    assert QueryMemo.make_key('Ticket', {'a': 1, 'b': '2'}) == QueryMemo.make_key('Ticket', {'b': 2, 'a': '1'})
+    assert QueryMemo.make_key('Ticket', {'a': 1}) != QueryMemo.make_key('User', {'a': 1})
+
+
+def test_identical_queries_run_once():
+    memo = QueryMemo()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return 42
+    
+    assert memo.get_or_compute('k', compute) == 42
+    assert memo.get_or_compute('k', compute) == 42
+    assert calls == [1]
+    assert memo.get_stats() == {"upstream_calls": 1, "saved_calls": 1}
+
+
+def test_concurrent_callers_wait_for_the_running_query():
+    memo = QueryMemo()
+    started = threading.Event()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return 'valor'
+    
+    results = []
+    owner = threading.Thread(target=lambda: results.append(memo.get_or_compute('k', compute)))
+    owner.start()
+    started.wait(1)
+    results.append(memo.get_or_compute('k', compute))
+    owner.join()
+    
+    assert results == ['valor', 'valor']
+    assert calls == [1]
+
+
+def test_failed_query_is_not_memoized():
+    memo = QueryMemo()
+    
+    def fail():
+        raise ValueError("falha")
+    
+    with pytest.raises(ValueError):
+        memo.get_or_compute('k', fail)
+    
+    assert memo.peek('k') is None
+    assert memo.get_or_compute('k', lambda: 7) == 7
+
+
+def test_seed_keeps_existing_result_and_peek_skips_running_queries():
+    memo = QueryMemo()
+    memo.seed('k', 1)
+    memo.seed('k', 2)
+    assert memo.peek('k') == 1
+    assert memo.get_or_compute('k', lambda: 3) == 1
+    
+    release = threading.Event()
+    running = threading.Thread(target=lambda: memo.get_or_compute('lento', release.wait))
+    running.start()
+    time.sleep(0.01)
+    assert memo.peek('lento', 'padrão') == 'padrão'
+    release.set()
+    running.join()
+
+
+def test_nested_scopes_reuse_the_outer_memo():
+    assert get_current_memo() is None
+    with query_memo_scope() as outer:
+        with query_memo_scope(QueryMemo()) as inner:
+            assert inner is outer
+            assert get_current_memo() is outer
+    assert get_current_memo() is None
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Testes do agrupamento de computações simultâneas (SingleFlight e AsyncSingleFlight)"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'resultado'
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == ['resultado'] * 5
+    assert calls == [1]
+    assert flight.get_stats() == {"executions": 1, "shared": 4, "in_flight": 0}
+
+
+def test_sequential_calls_execute_again():
+    flight = SingleFlight()
+    assert flight.do('k', lambda: 1) == 1
+    assert flight.do('k', lambda: 2) == 2
+    assert flight.do('outra', lambda: 3) == 3
+
+
+def test_error_reaches_every_waiter_and_is_not_kept():
+    flight = SingleFlight()
+    started = threading.Event()
+    
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("falha")
+    
+    errors = []
+    
+    def wait():
+        started.wait(1)
+        try:
+            flight.do('k', fail)
+        except ValueError as e:
+            errors.append(e)
+    
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    with pytest.raises(ValueError):
+        flight.do('k', fail)
+    waiter.join()
+    
+    assert len(errors) == 1
+    assert flight.do('k', lambda: 'ok') == 'ok'
+
+
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+    
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'resultado'
+    
+    async def run():
+        return await asyncio.gather(*(flight.do('k', compute) for _ in range(5)))
+    
+    assert asyncio.run(run()) == ['resultado'] * 5
+    assert calls == [1]
+    assert flight.get_stats() == {"executions": 1, "shared": 4, "in_flight": 0}
+
+
+def test_async_cancelled_caller_does_not_cancel_shared_computation():
+    flight = AsyncSingleFlight()
+    
+    async def compute():
+        await asyncio.sleep(0.05)
+        return 'resultado'
+    
+    async def run():
+        impatient = asyncio.ensure_future(flight.do('k', compute))
+        patient = asyncio.ensure_future(flight.do('k', compute))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+    
+    assert asyncio.run(run()) == 'resultado'
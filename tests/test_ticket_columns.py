@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Testes do ColumnarTicketStore: agregações vetorizadas contra o SQL do espelho de tickets"""
+import itertools
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from backend.services.ticket_mirror import TicketMirror
+from backend.utils.ticket_columns import ColumnarTicketStore
+
+BASE = datetime(2026, 1, 1)
+LEVELS = ['N1', 'N2', 'N3', None]
+GROUPS = ['G1', 'G2', 'G3', 'G4']
+TECHNICIANS = ['ana', 'bruno', 'carla', 'diego']
+PRIORITIES = ['1', '2', '3', 'Alta']
+
+FILTERS = [
+    {},
+    {'start_date': '2026-01-10', 'end_date': '2026-02-01'},
+    {'start_date': '2026-01-20T12:30:00'},
+    {'end_date': '2026-02-15 08:00:00'},
+    {'status_id': 2},
+    {'level': 'N1'},
+    {'level': 'N2', 'status_id': 3, 'end_date': '2026-02-15'},
+    {'level': 'inexistente'},
+]
+
+
+def _record(ticket_id, rng):
+    created = None if rng.random() < 0.05 else BASE + timedelta(seconds=rng.randint(0, 60 * 86400))
+    return {
+        'id': ticket_id,
+        'name': f"Ticket {ticket_id}",
+        'status': rng.randint(1, 6),
+        'priority': rng.choice(PRIORITIES),
+        'requester': None,
+        'content': None,
+        'date_creation': created.strftime('%Y-%m-%d %H:%M:%S') if created else None,
+        'date_mod': (created or BASE).strftime('%Y-%m-%d %H:%M:%S'),
+        'groups': [(group, rng.choice(LEVELS)) for group in rng.sample(GROUPS, rng.randint(0, 2))],
+        'technicians': sorted(rng.sample(TECHNICIANS, rng.randint(0, 2)))
+    }
+
+
+class _RecordSource:
+    """Serviço mínimo para o TicketMirror: entrega registros já montados"""
+    
+    def __init__(self):
+        self.records = []
+        self.deleted = []
+    
+    def get_mirror_signature(self):
+        return 'teste'
+    
+    def fetch_mirror_records(self, modified_since=None, deleted=False):
+        return [{'id': ticket_id} for ticket_id in self.deleted] if deleted else self.records
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = TicketMirror(_RecordSource(), str(tmp_path / 'mirror.sqlite3'), columns=ColumnarTicketStore())
+    yield mirror
+    mirror.stop()
+
+
+def _columnar_and_sql(mirror, query):
+    """Resultado da consulta pelas colunas em memória e pelo SQL do espelho"""
+    assert mirror._columns_ready()
+    columnar = query()
+    mirror._columns_loaded = False
+    try:
+        sql = query()
+    finally:
+        mirror._columns_loaded = True
+    return columnar, sql
+
+
+def _assert_matches_sql(mirror):
+    for filters in FILTERS:
+        columnar, sql = _columnar_and_sql(mirror, lambda: mirror.count(**filters))
+        assert columnar == sql, filters
+    
+    for filters in FILTERS[:4]:
+        columnar, sql = _columnar_and_sql(mirror, lambda: mirror.count_matrix(**filters))
+        assert columnar == sql, filters
+        columnar, sql = _columnar_and_sql(mirror, lambda: mirror.technician_workload(**filters))
+        assert columnar == sql, filters
+
+
+def test_random_data_matches_sqlite(mirror):
+    rng = random.Random(11)
+    mirror.service.records = [_record(ticket_id, rng) for ticket_id in range(1, 2001)]
+    assert mirror.sync(full=True)
+    _assert_matches_sql(mirror)
+
+
+def test_incremental_syncs_match_sqlite(mirror):
+    rng = random.Random(5)
+    mirror.service.records = [_record(ticket_id, rng) for ticket_id in range(1, 1001)]
+    assert mirror.sync(full=True)
+    
+    known = {record['id'] for record in mirror.service.records}
+    next_id = 1001
+    for _ in range(10):
+        # Alterações de tickets existentes, tickets novos e exclusões na mesma sincronização
+        changed = rng.sample(sorted(known), 40) + list(range(next_id, next_id + 10))
+        next_id += 10
+        mirror.service.records = [_record(ticket_id, rng) for ticket_id in changed]
+        known.update(changed)
+        mirror.service.deleted = rng.sample(sorted(known - set(changed)), 5)
+        known.difference_update(mirror.service.deleted)
+        
+        assert mirror.sync(full=False)
+        _assert_matches_sql(mirror)
+    
+    assert mirror.columns.count() == len(known)
+
+
+def _reference_group_count(records, dimensions):
+    """Agrupamento por força bruta: um ticket conta uma vez em cada valor multivalorado"""
+    def values(record, dimension):
+        if dimension == 'status':
+            return [record['status']]
+        if dimension == 'priority':
+            return [str(record['priority'])]
+        if dimension == 'day':
+            return [record['date_creation'][:10]] if record['date_creation'] else []
+        if dimension == 'level':
+            return sorted({level for _, level in record['groups'] if level})
+        if dimension == 'group':
+            return sorted({group for group, _ in record['groups']})
+        return sorted(set(record['technicians']))
+    
+    counts = Counter()
+    for record in records:
+        for key in itertools.product(*(values(record, dimension) for dimension in dimensions)):
+            counts[key] += 1
+    return dict(counts)
+
+
+@pytest.mark.parametrize('dimensions', [
+    ('status',), ('priority', 'status'), ('day',), ('level', 'status'), ('group',), ('technician', 'priority'),
+    ('status', 'day', 'level')
+])
+def test_group_count_matches_reference(dimensions):
+    rng = random.Random(7)
+    records = {ticket_id: _record(ticket_id, rng) for ticket_id in range(1, 1501)}
+    store = ColumnarTicketStore()
+    store.replace(list(records.values()))
+    
+    # Atualizações e exclusões passam pelo buffer de anexação e pelas linhas mortas
+    updates = [_record(ticket_id, rng) for ticket_id in rng.sample(sorted(records), 100) + [2000, 2001]]
+    store.upsert(updates)
+    records.update((record['id'], record) for record in updates)
+    removed = rng.sample(sorted(records), 30)
+    store.delete(removed)
+    for ticket_id in removed:
+        records.pop(ticket_id)
+    
+    assert store.group_count(dimensions) == _reference_group_count(records.values(), dimensions)
+    assert store.count() == len(records)
+
+
+def test_group_count_rejects_invalid_dimensions():
+    store = ColumnarTicketStore()
+    with pytest.raises(ValueError):
+        store.group_count(('level', 'group'))
+    with pytest.raises(ValueError):
+        store.group_count(('foo',))
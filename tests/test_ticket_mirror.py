@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Testes do espelho de tickets (TicketMirror): sincronização completa, incremental e releitura entre workers"""
+import time
+
+import pytest
+
+from backend.services.ticket_mirror import TicketMirror
+
+
+def _record(ticket_id, status=1, date_mod='2026-09-01 10:00:00', groups=(('G1', 'N1'),), technicians=('ana',)):
+    return {
+        'id': ticket_id,
+        'name': f"Ticket {ticket_id}",
+        'status': status,
+        'priority': '3',
+        'requester': None,
+        'content': '',
+        'date_creation': '2026-09-01 08:00:00',
+        'date_mod': date_mod,
+        'groups': list(groups),
+        'technicians': list(technicians),
+    }
+
+
+class _RecordSource:
+    """Serviço mínimo para o TicketMirror: registra as buscas e entrega registros já montados"""
+    
+    def __init__(self, records=None):
+        self.records = list(records or [])
+        self.deleted = []
+        self.signature = 'v1'
+        self.calls = []
+    
+    def get_mirror_signature(self):
+        return self.signature
+    
+    def fetch_mirror_records(self, modified_since=None, deleted=False):
+        self.calls.append((modified_since, deleted))
+        if deleted:
+            return [{'id': ticket_id} for ticket_id in self.deleted]
+        return self.records
+
+
+class _FakeLock:
+    def __init__(self, held):
+        self.held = held
+    
+    def try_acquire(self):
+        return self.held
+    
+    def release(self):
+        self.held = False
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'mirror.sqlite3')
+
+
+def test_first_sync_is_full_and_marks_ready(path):
+    service = _RecordSource([_record(1), _record(2, status=2, date_mod='2026-09-01 11:00:00')])
+    mirror = TicketMirror(service, path)
+    
+    assert not mirror.has_data() and not mirror.is_ready()
+    assert mirror.sync()
+    
+    assert service.calls == [(None, False)]
+    assert mirror.has_data() and mirror.is_ready() and mirror.is_ready(signature='v1')
+    assert not mirror.is_ready(signature='v2')
+    assert mirror._state['watermark'] == '2026-09-01 11:00:00'
+    assert mirror.count() == 2 and mirror.count(status_id=2) == 1
+    assert mirror.count_matrix() == {(None, 1): 1, (None, 2): 1, ('N1', 1): 1, ('N1', 2): 1}
+    assert mirror.technician_workload() == {'ana': 2}
+
+
+def test_incremental_sync_upserts_and_deletes(path):
+    service = _RecordSource([_record(1), _record(2), _record(3, date_mod='2026-09-01 12:00:00')])
+    mirror = TicketMirror(service, path, overlap=60)
+    assert mirror.sync()
+    
+    service.records = [_record(2, status=5, date_mod='2026-09-01 12:30:00', groups=(('G2', 'N2'),),
+                               technicians=('bruno',))]
+    service.deleted = [3]
+    service.calls.clear()
+    assert mirror.sync()
+    
+    # Marca d'água menos a sobreposição, nas buscas de modificados e de excluídos
+    assert service.calls == [('2026-09-01 11:59:00', False), ('2026-09-01 11:59:00', True)]
+    assert mirror.get_stats()["full_syncs"] == 1 and mirror.get_stats()["syncs"] == 2
+    assert mirror.count() == 2
+    assert mirror.count(status_id=5, level='N2') == 1 and mirror.count(level='N1') == 1
+    assert mirror.technician_workload() == {'ana': 1, 'bruno': 1}
+    assert mirror._state['watermark'] == '2026-09-01 12:30:00'
+
+
+def test_incremental_sync_keeps_watermark_without_changes(path):
+    service = _RecordSource([_record(1, date_mod='2026-09-01 12:00:00')])
+    mirror = TicketMirror(service, path)
+    assert mirror.sync()
+    
+    service.records = []
+    assert mirror.sync(full=False)
+    assert mirror._state['watermark'] == '2026-09-01 12:00:00'
+    assert mirror.count() == 1
+
+
+def test_full_sync_removes_tickets_missing_from_glpi(path):
+    service = _RecordSource([_record(1), _record(2), _record(3)])
+    mirror = TicketMirror(service, path)
+    assert mirror.sync()
+    
+    service.records = [_record(1), _record(3, status=4)]
+    assert mirror.sync(full=True)
+    
+    assert mirror.count() == 2 and mirror.count(status_id=4) == 1
+    assert mirror.get_stats()["deleted"] == 1
+
+
+def test_signature_change_forces_full_sync(path):
+    service = _RecordSource([_record(1)])
+    mirror = TicketMirror(service, path)
+    assert mirror.sync()
+    
+    service.calls.clear()
+    assert mirror.sync()
+    assert [deleted for _, deleted in service.calls] == [False, True]  # Incremental
+    
+    service.signature = 'v2'
+    service.calls.clear()
+    assert mirror.sync()
+    assert service.calls == [(None, False)]
+    assert mirror.is_ready(signature='v2')
+
+
+def test_failed_fetch_keeps_current_data(path):
+    service = _RecordSource([_record(1), _record(2)])
+    mirror = TicketMirror(service, path)
+    assert mirror.sync()
+    synced_at = mirror._state['synced_at']
+    
+    service.fetch_mirror_records = lambda modified_since=None, deleted=False: None if deleted else []
+    assert not mirror.sync()
+    
+    assert mirror.count() == 2
+    assert mirror._state['synced_at'] == synced_at
+    assert mirror.get_stats()["failures"] == 1 and mirror.last_error
+
+
+def test_lag_beyond_max_lag_is_not_ready(path):
+    mirror = TicketMirror(_RecordSource([_record(1)]), path, max_lag=60)
+    assert mirror.sync()
+    
+    mirror._state['synced_at'] = time.time() - 120
+    assert mirror.get_lag() >= 120
+    assert not mirror.is_ready()
+    assert mirror.is_ready(allow_lag=True)
+
+
+def test_state_persists_across_instances(path):
+    mirror = TicketMirror(_RecordSource([_record(1)]), path)
+    assert mirror.sync()
+    
+    reopened = TicketMirror(_RecordSource(), path)
+    assert reopened.has_data() and reopened.is_ready()
+    assert reopened._state['watermark'] == '2026-09-01 10:00:00'
+    assert not reopened._needs_full_sync('v1') and reopened._needs_full_sync('v2')
+    assert reopened.count() == 1
+
+
+def test_only_lock_holder_is_writer(path):
+    assert TicketMirror(_RecordSource(), path).is_writer()
+    assert TicketMirror(_RecordSource(), path, writer_lock=_FakeLock(True)).is_writer()
+    assert not TicketMirror(_RecordSource(), path, writer_lock=_FakeLock(False)).is_writer()
+
+
+def test_follower_refresh_applies_writer_changes(path):
+    pytest.importorskip('numpy')
+    from backend.utils.ticket_columns import ColumnarTicketStore
+    
+    service = _RecordSource([_record(1), _record(2), _record(3)])
+    writer = TicketMirror(service, path, columns=ColumnarTicketStore(), writer_lock=_FakeLock(True))
+    follower = TicketMirror(_RecordSource(), path, columns=ColumnarTicketStore(), writer_lock=_FakeLock(False))
+    
+    assert writer.sync()
+    follower.refresh()
+    assert follower._columns_ready() and follower.columns.count() == 3
+    
+    # Incremental: o seguidor aplica apenas os tickets de ticket_changes
+    service.records = [_record(2, status=5, date_mod='2026-09-01 12:00:00'), _record(4)]
+    service.deleted = [1]
+    assert writer.sync()
+    follower.refresh()
+    assert follower.columns.count() == 3 and follower.columns.count(status=5) == 1
+    assert follower._change_seq == writer._change_seq
+    assert follower.columns.get_stats()["loads"] == 1
+    
+    # Carga completa: o seguidor recarrega tudo ao ver o novo full_synced_at
+    service.records = [_record(4)]
+    assert writer.sync(full=True)
+    follower.refresh()
+    assert follower.columns.count() == 1
+    assert follower._columns_generation == writer._state['full_synced_at']
+    assert follower.get_stats()["refreshes"] == 3
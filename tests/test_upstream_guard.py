@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Testes do limitador adaptativo (AIMD) e do circuit breaker do UpstreamGuard"""
+import time
+
+import pytest
+
+from backend.utils.upstream_guard import UpstreamGuard, UpstreamUnavailableError, failure_scope
+
+
+def _call(guard, latency=0.01, success=True):
+    guard.acquire(timeout=1)
+    guard.release(latency, success)
+
+
+def test_additive_increase_on_fast_successes():
+    guard = UpstreamGuard(initial_limit=4, max_limit=8, latency_target=1.0)
+    _call(guard)
+    assert guard.limit == pytest.approx(4.25)
+    for _ in range(100):
+        _call(guard)
+    assert guard.limit == 8
+
+
+def test_multiplicative_decrease_once_per_interval():
+    guard = UpstreamGuard(initial_limit=8, latency_target=1.0, min_calls=100)
+    _call(guard, success=False)
+    assert guard.limit == pytest.approx(4.0)
+    
+    # Falhas do mesmo pico contam uma única redução
+    _call(guard, success=False)
+    assert guard.limit == pytest.approx(4.0)
+
+
+def test_slow_response_decreases_limit():
+    guard = UpstreamGuard(initial_limit=8, latency_target=0.5, min_calls=100)
+    _call(guard, latency=2.0)
+    assert guard.limit == pytest.approx(4.0)
+
+
+def test_limit_never_below_minimum():
+    guard = UpstreamGuard(initial_limit=2, min_limit=2, latency_target=0.0, min_calls=100)
+    for _ in range(5):
+        _call(guard, success=False)
+    assert guard.limit == 2
+
+
+def test_acquire_times_out_when_limit_is_reached():
+    guard = UpstreamGuard(initial_limit=1, max_limit=1)
+    guard.acquire(timeout=1)
+    with pytest.raises(UpstreamUnavailableError):
+        guard.acquire(timeout=0.05)
+    assert guard.get_stats()["rejected"] == 1
+
+
+def test_release_without_outcome_only_frees_the_slot():
+    guard = UpstreamGuard(initial_limit=1, max_limit=1, window=10, min_calls=1)
+    for _ in range(5):
+        _call(guard, latency=10.0, success=None)
+    
+    stats = guard.get_stats()
+    assert stats["in_flight"] == 0
+    assert stats["calls"] == 0
+    assert stats["state"] == UpstreamGuard.CLOSED
+    assert guard.limit == 1
+    with failure_scope() as failures:
+        _call(guard, success=None)
+    assert failures.total == 0
+
+
+def test_circuit_opens_after_failure_threshold():
+    guard = UpstreamGuard(window=10, min_calls=4, failure_threshold=0.5, open_seconds=60)
+    for _ in range(4):
+        _call(guard, success=False)
+    
+    assert guard.get_stats()["state"] == UpstreamGuard.OPEN
+    assert guard.is_open()
+    with pytest.raises(UpstreamUnavailableError):
+        guard.acquire(timeout=1)
+
+
+def test_half_open_probe_success_closes_circuit():
+    guard = UpstreamGuard(min_calls=2, failure_threshold=0.5, open_seconds=0.05, latency_target=1.0)
+    for _ in range(2):
+        _call(guard, success=False)
+    time.sleep(0.06)
+    assert not guard.is_open()
+    
+    # Meio-aberto: uma única sonda por vez
+    guard.acquire(timeout=1)
+    assert guard.get_stats()["state"] == UpstreamGuard.HALF_OPEN
+    with pytest.raises(UpstreamUnavailableError):
+        guard.acquire(timeout=1)
+    
+    guard.release(0.01, True)
+    assert guard.get_stats()["state"] == UpstreamGuard.CLOSED
+    _call(guard)
+
+
+def test_half_open_probe_failure_reopens_circuit():
+    guard = UpstreamGuard(min_calls=2, failure_threshold=0.5, open_seconds=0.05)
+    for _ in range(2):
+        _call(guard, success=False)
+    time.sleep(0.06)
+    
+    _call(guard, success=False)
+    assert guard.get_stats()["state"] == UpstreamGuard.OPEN
+    assert guard.get_stats()["opened"] == 2
+
+
+def test_failure_scope_counts_only_its_own_calls():
+    guard = UpstreamGuard(min_calls=100)
+    _call(guard, success=False)
+    
+    with failure_scope() as outer:
+        _call(guard)
+        with failure_scope() as inner:
+            _call(guard, success=False)
+    
+    assert inner.total == 1
+    assert outer.total == 1
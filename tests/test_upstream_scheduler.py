@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Testes da fila de prioridade e do token bucket do UpstreamScheduler"""
+import threading
+import time
+
+import pytest
+
+from backend.utils.upstream_guard import UpstreamGuard, UpstreamUnavailableError
+from backend.utils.upstream_scheduler import (RequestPriority, UpstreamScheduler, get_current_priority,
+                                              priority_scope)
+
+
+def _wait_for_queue(scheduler, size, timeout=2.0):
+    deadline = time.time() + timeout
+    while len(scheduler._queue) < size:
+        assert time.time() < deadline, "chamadas não entraram na fila"
+        time.sleep(0.005)
+
+
+def test_dispatches_by_priority_then_arrival():
+    scheduler = UpstreamScheduler(UpstreamGuard(initial_limit=1, max_limit=1))
+    scheduler.acquire(timeout=1)  # Ocupa a única vaga do guard
+    
+    order = []
+    
+    def call(name, priority):
+        scheduler.acquire(timeout=5, priority=priority)
+        order.append(name)
+        scheduler.release(0.001, True)
+    
+    arrivals = [('background', RequestPriority.BACKGROUND), ('ranking', RequestPriority.RANKING),
+                ('interactive-1', RequestPriority.INTERACTIVE), ('interactive-2', RequestPriority.INTERACTIVE)]
+    threads = []
+    for index, (name, priority) in enumerate(arrivals):
+        thread = threading.Thread(target=call, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        _wait_for_queue(scheduler, index + 1)
+    
+    scheduler.release(0.001, True)
+    for thread in threads:
+        thread.join(5)
+    
+    assert order == ['interactive-1', 'interactive-2', 'ranking', 'background']
+    classes = scheduler.get_stats()['classes']
+    assert classes['interactive']['dispatched'] == 3
+    assert classes['ranking']['dispatched'] == 1
+    assert classes['background']['dispatched'] == 1
+
+
+def test_token_bucket_limits_rate_after_burst():
+    scheduler = UpstreamScheduler(UpstreamGuard(initial_limit=32), rate=20, burst=2)
+    
+    started = time.monotonic()
+    dispatched_at = []
+    for _ in range(5):
+        scheduler.acquire(timeout=5)
+        dispatched_at.append(time.monotonic() - started)
+        scheduler.release(0.001, True)
+    
+    # Rajada de 2 imediata; as 3 seguintes a cada 1/20 s
+    assert dispatched_at[1] < 0.04
+    assert dispatched_at[4] >= 0.14
+    assert dispatched_at[4] < 1.0
+
+
+def test_unlimited_rate_dispatches_immediately():
+    scheduler = UpstreamScheduler(UpstreamGuard(initial_limit=32))
+    started = time.monotonic()
+    for _ in range(50):
+        scheduler.acquire(timeout=1)
+        scheduler.release(0.001, True)
+    assert time.monotonic() - started < 0.5
+
+
+def test_queue_timeout_is_rejected_and_leaves_queue():
+    scheduler = UpstreamScheduler(UpstreamGuard(initial_limit=1, max_limit=1))
+    scheduler.acquire(timeout=1)
+    
+    with pytest.raises(UpstreamUnavailableError):
+        scheduler.acquire(timeout=0.05, priority=RequestPriority.RANKING)
+    
+    stats = scheduler.get_stats()
+    assert stats['classes']['ranking']['rejected'] == 1
+    assert sum(stats['queued'].values()) == 0
+
+
+def test_priority_scope_never_raises_priority():
+    assert get_current_priority() == RequestPriority.INTERACTIVE
+    with priority_scope(RequestPriority.BACKGROUND):
+        with priority_scope(RequestPriority.INTERACTIVE):
+            assert get_current_priority() == RequestPriority.BACKGROUND
+    assert get_current_priority() == RequestPriority.INTERACTIVE